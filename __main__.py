@@ -2,29 +2,54 @@ import sys
 
 from argparse import Namespace
 
-from utils.api_utils import get_ordered_api_calls, reset_imd_to_factory_defaults, set_imd_creds, apply_all_api_calls
+from utils.api_utils import get_ordered_api_calls, reset_imd_to_factory_defaults, set_imd_creds, apply_all_api_calls, forget_imd_state
 from utils.argument_utils import parse_args
-from utils.config_utils import get_config, update_prompts_file_with_defaults, write_current_imd_config_to_file, get_previous_imd_config, remove_previous_imd_config
+from utils.config_utils import get_config, get_prompts_file_contents, update_prompts_file_with_defaults, write_current_imd_config_to_file, get_previous_imd_config, remove_previous_imd_config
+from utils.discovery_utils import discover_imds
 from utils.encryption_utils import decrypt_prompts
 from utils.firmware_utils import get_firmware_version, prompt_to_upgrade_imd_firmware
+from utils.fleet_utils import configure_fleet, get_fleet, get_fleet_concurrency
 from utils.format_utils import format_blue, format_yellow
-from utils.network_utils import wait_for_ping
-from utils.prompt_utils import get_unique_config_items, confirm, confirm_imd_config
-from utils.sys_utils import exit_with_code, remove_customized_files
+from utils.metrics_utils import increment_counter, metrics_export_is_running, start_metrics_export, stop_metrics_export
+from utils.network_utils import wait_for_imd
+from utils.profile_utils import profiling_is_enabled, start_profiling, stop_profiling
+from utils.prompt_utils import get_unique_config_items, confirm, confirm_imd_config, get_credentials
+from utils.reconcile_utils import reconcile_api_calls
+from utils.snapshot_utils import snapshot_imds
+from utils.sys_utils import exit_with_code, register_exit_handler, remove_customized_files
+from utils.trace_utils import start_tracing, stop_tracing, trace_span, tracing_is_enabled
 
 def main(config: dict = {}) -> int:
     args: Namespace = parse_args(sys.argv)
     quiet_flags: list[str] = ['get_firmware_version', 'reset_imd', 'set_password', 'upgrade', 'reset_script']
     quiet: bool = any(vars(args)[quiet_flag] is not False for quiet_flag in quiet_flags)
     skip_firmware_check = args.skip_firmware_check
+    if bool(args.profile) and not profiling_is_enabled():
+        start_profiling(args.profile)
+        register_exit_handler(stop_profiling)
+    if bool(args.trace) and not tracing_is_enabled():
+        start_tracing(args.trace)
+        register_exit_handler(stop_tracing)
 
     try:
         config = get_config(main_file = __file__, args = args, quiet = quiet) if not bool(config) else config
+        config['reconcile'] = args.reconcile
+        if (args.metrics_port is not None or bool(args.metrics_file)) and not metrics_export_is_running():
+            start_metrics_export(config, args.metrics_port, args.metrics_file)
+            register_exit_handler(stop_metrics_export)
         if   args.get_firmware_version: get_firmware_version(config = config, quiet = False)
         elif args.reset_imd:            reset_imd_to_factory_defaults(config = config, quiet = False)
         elif args.set_password:         set_imd_creds(config = config, quiet = False)
         elif args.upgrade:              prompt_to_upgrade_imd_firmware(config = config, quiet = False)
         elif args.reset_script:         remove_customized_files(config, quiet = False)    
+        elif args.discover:             discover_imds(config, args.discover, args.inventory_file or '', quiet = False)
+        elif args.snapshot:
+            get_credentials(config)
+            imd_ips: list[str] = [ imd['imd_ip'] for imd in get_fleet(config, args) ] or [ config['current_imd_ip'] ]
+            snapshot_imds(config, get_prompts_file_contents(config)[2], imd_ips, get_fleet_concurrency(config, args), quiet = False)
+        elif args.fleet or args.fleet_file:
+            update_prompts_file_with_defaults(config)
+            configure_fleet(config, args, decrypt_prompts(config), quiet = False)
 
         else:
             update_prompts_file_with_defaults(config)
@@ -35,16 +60,21 @@ def main(config: dict = {}) -> int:
                 unique_config_items: list[dict] = get_unique_config_items(config, prompts)
                 ordered_api_calls = get_ordered_api_calls(config, prompts, unique_config_items)
                 write_current_imd_config_to_file(config, ordered_api_calls, quiet = False)
-            if confirm_imd_config(config, ordered_api_calls) and wait_for_ping(config):
+            if confirm_imd_config(config, ordered_api_calls) and wait_for_imd(config):
                 if not skip_firmware_check and not prompt_to_upgrade_imd_firmware(config = config, quiet = False):
                     if not confirm(config, 'Do you want to continue with the configuration? (y or n): '):
                         print(format_blue('Exiting Script'))
                         exit_with_code(0)
-                if wait_for_ping(config) and apply_all_api_calls(config, ordered_api_calls):
+                api_calls_to_apply: list[dict] = reconcile_api_calls(config, ordered_api_calls) if args.reconcile else ordered_api_calls
+                with trace_span(config, 'configure_imd', 'imd') as imd_span:
+                    imd_span['succeeded'] = wait_for_imd(config) and apply_all_api_calls(config, api_calls_to_apply)
+                increment_counter('vg_imd_configurations_total', {'outcome': 'succeeded' if imd_span['succeeded'] else 'failed'})
+                if imd_span['succeeded']:
                     remove_previous_imd_config(config)
                     previous_imd_config = False 
                     print('\nIMD configuration successful!')
             if bool(previous_imd_config) and confirm(config, 'Would you like to delete this configuration? (y or n): '): remove_previous_imd_config(config)
+            forget_imd_state(config)
             if confirm(config, 'Would you like to configure another IMD? (y or n): '): main(config)
             
         print(format_blue('Exiting Script'))
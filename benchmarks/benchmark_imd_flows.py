@@ -0,0 +1,197 @@
+import argparse, json, os, subprocess, sys, tempfile, threading, time
+
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from unittest import mock
+
+from tests.mock_imd_server import get_mock_imd_config, start_mock_imds, stop_mock_imd
+from utils.api_utils import apply_all_api_calls, forget_imd_state, get_ordered_api_calls, reset_imd_to_factory_defaults, set_imd_creds
+from utils.config_utils import get_credentials_from_imd_config
+from utils.firmware_utils import prompt_to_upgrade_imd_firmware
+from utils.prompt_utils import get_unique_config_items_from_values
+from utils.retry_utils import clear_attempt_history, get_attempt_history
+
+benchmarks_path: str = os.path.dirname(os.path.abspath(__file__))
+repo_path: str = os.path.dirname(benchmarks_path)
+flows: list[str] = ['configure', 'upgrade', 'reset']
+
+benchmark_values: dict = {
+    'row': '7',
+    'rack': '5',
+    'pdu_letter': 'b',
+    'imd_hostname': 'ab-0123456-ps-b1',
+    'primary_ntp': 'time.primary.net',
+    'secondary_ntp': 'time.secondary.net',
+    'username': 'admin',
+    'password': 'password'
+}
+
+def parse_benchmark_args(argv: list[str]) -> Namespace:
+    parser = argparse.ArgumentParser(description = 'Benchmark the configure, upgrade and reset flows against mock IMDs.')
+    parser.add_argument('--flows',          nargs = '+', choices = flows, default = flows, help = 'Flows to benchmark.')
+    parser.add_argument('--max_imds',       type = int, default = 8, help = 'Largest number of concurrent IMDs; runs 1, 2, 4 ... up to this number.')
+    parser.add_argument('--latency',        type = float, default = 0.005, help = 'Mock IMD response latency in seconds.')
+    parser.add_argument('--error_rate',     nargs = '*', default = ['5002=0.02'], metavar = 'CODE=RATE', help = 'Mock IMD retCodes to inject and how often.')
+    parser.add_argument('--reboot_seconds', type = float, default = 0.5, help = 'Mock IMD downtime after a firmware upload or reset.')
+    parser.add_argument('--sleep_scale',    type = float, default = 0.01, help = 'Scale applied to the fixed sleeps in the firmware upgrade flow.')
+    parser.add_argument('--output',         default = '', help = 'Results .json file (defaults to benchmarks/results/<commit>_<time>.json).')
+    parser.add_argument('--compare',        default = '', help = 'Earlier results .json file to compare against.')
+    return parser.parse_args(argv)
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd = repo_path, capture_output = True, text = True).stdout.strip() or 'unknown'
+    except OSError:
+        return 'unknown'
+
+def get_imd_counts(max_imds: int) -> list[int]:
+    imd_counts: list[int] = []
+    imd_count: int = 1
+    while imd_count < max_imds:
+        imd_counts.append(imd_count)
+        imd_count *= 2
+    return imd_counts + [max_imds]
+
+def load_json_file(file_path: str) -> dict:
+    with open(file_path, 'r') as json_file:
+        return json.load(json_file)
+
+def get_benchmark_config(args: Namespace) -> dict:
+    default_config: dict = load_json_file(os.path.join(repo_path, 'config', 'default_config.json'))
+    return {**default_config, 'api_attempts': default_config['default_api_attempts'], 'spinner': default_config['default_spinner'], 'firmware_target': '6.3.0'}
+
+def get_benchmark_ordered_api_calls(config: dict) -> list[dict]:
+    prompts: dict = load_json_file(os.path.join(repo_path, 'config', 'default_prompts.json'))
+    unique_config_items: list[dict] = get_unique_config_items_from_values(config, prompts, benchmark_values, quiet = True) #type: ignore[assignment]
+    return get_ordered_api_calls(config, prompts, unique_config_items)
+
+def configure_flow(imd_config: dict, ordered_api_calls: list[dict]) -> bool:
+    imd_config['username'], imd_config['password'] = get_credentials_from_imd_config(imd_config, ordered_api_calls)
+    return apply_all_api_calls(imd_config, ordered_api_calls, quiet = True)
+
+def upgrade_flow(imd_config: dict, ordered_api_calls: list[dict]) -> bool:
+    return prompt_to_upgrade_imd_firmware(imd_config, quiet = True)
+
+def reset_flow(imd_config: dict, ordered_api_calls: list[dict]) -> bool:
+    set_imd_creds(imd_config)
+    return bool(reset_imd_to_factory_defaults(imd_config, quiet = True))
+
+flow_functions: dict[str, Callable[[dict, list[dict]], bool]] = {'configure': configure_flow, 'upgrade': upgrade_flow, 'reset': reset_flow}
+
+def create_scaled_sleep(sleep_scale: float, slept_seconds: dict) -> Callable[[float], None]:
+    slept_seconds_lock: threading.Lock = threading.Lock()
+    def scaled_sleep(seconds: float) -> None:
+        with slept_seconds_lock:
+            slept_seconds['requested'] += seconds
+            slept_seconds['actual'] += seconds * sleep_scale
+        time.sleep(seconds * sleep_scale)
+    return scaled_sleep
+
+def get_in_flight_seconds(attempts: list[dict]) -> float:
+    in_flight_seconds: float = 0
+    in_flight_until: float = float('-inf')
+    for started_at, finished_at in sorted((attempt['started_at'], attempt['started_at'] + attempt['network_seconds']) for attempt in attempts):
+        in_flight_seconds += max(0, finished_at - max(started_at, in_flight_until))
+        in_flight_until = max(in_flight_until, finished_at)
+    return in_flight_seconds
+
+def run_flow_on_imd(flow: str, config: dict, mock_imd: dict, ordered_api_calls: list[dict]) -> dict:
+    imd_config: dict = get_mock_imd_config(mock_imd, **{ key: value for key, value in config.items() if key not in ['rate_limits', 'readiness_probe', 'reboot_wait'] })
+    start_time: float = time.monotonic()
+    try:
+        succeeded: bool = flow_functions[flow](imd_config, ordered_api_calls)
+    except Exception as flow_error:
+        succeeded = False
+        print(f'{flow} on {mock_imd['address']} failed: {flow_error}', file = sys.stderr)
+    finally:
+        forget_imd_state(imd_config)
+    attempts: list[dict] = get_attempt_history(imd_config)
+
+    return {
+        'imd_ip': mock_imd['address'],
+        'succeeded': succeeded,
+        'wall_seconds': time.monotonic() - start_time,
+        'network_seconds': get_in_flight_seconds(attempts),
+        'cumulative_request_seconds': sum(attempt['network_seconds'] for attempt in attempts),
+        'retry_sleep_seconds': sum(attempt['sleep_seconds'] for attempt in attempts),
+        'attempts': attempts
+    }
+
+def run_benchmark(args: Namespace, flow: str, imd_count: int, config: dict, ordered_api_calls: list[dict]) -> dict:
+    error_rates: dict = { error_rate.split('=')[0]: float(error_rate.split('=')[1]) for error_rate in args.error_rate }
+    mock_imds: list[dict] = start_mock_imds(imd_count, latency = args.latency, error_rates = error_rates, reboot_seconds = args.reboot_seconds)
+    slept_seconds: dict = {'requested': 0, 'actual': 0}
+    try:
+        with tempfile.NamedTemporaryFile(suffix = '-6_3_0.firmware') as firmware_file, \
+            mock.patch('utils.firmware_utils.confirm', return_value = True), \
+            mock.patch('utils.firmware_utils.get_firmware_file_path', return_value = (firmware_file.name, os.path.basename(firmware_file.name))), \
+            mock.patch('utils.firmware_utils.time', mock.Mock(sleep = create_scaled_sleep(args.sleep_scale, slept_seconds))):
+            firmware_file.write(bytes(256 * 1024))
+            firmware_file.flush()
+            start_time: float = time.monotonic()
+            with ThreadPoolExecutor(max_workers = imd_count) as executor:
+                imd_results: list[dict] = list(executor.map(lambda mock_imd: run_flow_on_imd(flow, config, mock_imd, ordered_api_calls), mock_imds))
+            wall_seconds: float = time.monotonic() - start_time
+        calls: int = sum(len(mock_imd['state']['requests']) for mock_imd in mock_imds)
+    finally:
+        for mock_imd in mock_imds:
+            stop_mock_imd(mock_imd)
+            clear_attempt_history({'current_imd_ip': mock_imd['address']})
+
+    return {
+        'flow': flow,
+        'imds': imd_count,
+        'succeeded': all(imd_result['succeeded'] for imd_result in imd_results),
+        'wall_seconds': round(wall_seconds, 4),
+        'calls': calls,
+        'calls_per_second': round(calls / wall_seconds, 2) if wall_seconds > 0 else 0,
+        'mean_imd_seconds': round(sum(imd_result['wall_seconds'] for imd_result in imd_results) / imd_count, 4),
+        'max_imd_seconds': round(max(imd_result['wall_seconds'] for imd_result in imd_results), 4),
+        'network_seconds': round(get_in_flight_seconds([ attempt for imd_result in imd_results for attempt in imd_result['attempts'] ]), 4),
+        'cumulative_request_seconds': round(sum(imd_result['cumulative_request_seconds'] for imd_result in imd_results), 4),
+        'retry_sleep_seconds': round(sum(imd_result['retry_sleep_seconds'] for imd_result in imd_results), 4),
+        'fixed_sleep_seconds': round(slept_seconds['actual'], 4),
+        'unscaled_fixed_sleep_seconds': round(slept_seconds['requested'], 4),
+        'per_imd': [ {
+            **{ key: value for key, value in imd_result.items() if key != 'attempts' },
+            **{ key: round(imd_result[key], 4) for key in ['wall_seconds', 'network_seconds', 'cumulative_request_seconds', 'retry_sleep_seconds'] }
+        } for imd_result in imd_results ]
+    }
+
+def print_benchmark_result(benchmark_result: dict, previous_results: dict) -> None:
+    previous_result: dict | None = previous_results.get((benchmark_result['flow'], benchmark_result['imds']))
+    change: str = f' ({(benchmark_result['wall_seconds'] / previous_result['wall_seconds'] - 1) * 100:+.1f}%)' if previous_result else ''
+    print(f'{benchmark_result['flow']:<10} {benchmark_result['imds']:>3} IMDs  {benchmark_result['wall_seconds']:>8.3f} s{change:<10}  '
+          f'{benchmark_result['calls_per_second']:>8.1f} calls/s  network {benchmark_result['network_seconds']:.3f} s (requests {benchmark_result['cumulative_request_seconds']:.3f} s)  '
+          f'sleep {benchmark_result['retry_sleep_seconds'] + benchmark_result['fixed_sleep_seconds']:.3f} s'
+          f'{'' if benchmark_result['succeeded'] else '  FAILED'}')
+
+def main(argv: list[str]) -> int:
+    args: Namespace = parse_benchmark_args(argv)
+    config: dict = get_benchmark_config(args)
+    ordered_api_calls: list[dict] = get_benchmark_ordered_api_calls(config)
+    previous_results: dict = { (result['flow'], result['imds']): result for result in load_json_file(args.compare)['results'] } if bool(args.compare) else {}
+    commit: str = get_commit()
+    benchmark_results: list[dict] = []
+    for flow in args.flows:
+        for imd_count in get_imd_counts(args.max_imds):
+            benchmark_result: dict = run_benchmark(args, flow, imd_count, config, ordered_api_calls)
+            print_benchmark_result(benchmark_result, previous_results)
+            benchmark_results.append(benchmark_result)
+
+    output_path: str = args.output or os.path.join(benchmarks_path, 'results', f'{commit}_{time.strftime('%Y%m%d-%H%M%S')}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok = True)
+    with open(output_path, 'w') as output_file:
+        json.dump({
+            'commit': commit,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'settings': {key: value for key, value in vars(args).items() if key not in ['output', 'compare']},
+            'results': benchmark_results
+        }, output_file, indent = 4)
+    print(f'Results written to \'{output_path}\'.')
+
+    return 0 if all(benchmark_result['succeeded'] for benchmark_result in benchmark_results) else 1
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
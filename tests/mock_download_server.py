@@ -0,0 +1,89 @@
+import hashlib, re, threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def create_mock_download_state(content: bytes, **overrides) -> dict:
+    return {
+        'content': content,
+        'path': '/geist-i03-6_3_0-12122024.zip',
+        'etag': f'"{hashlib.sha256(content).hexdigest()[:16]}"',
+        'last_modified': 'Thu, 12 Dec 2024 00:00:00 GMT',
+        'supports_ranges': True,
+        'drop_after_bytes': [],
+        'requests': [],
+        'lock': threading.Lock(),
+        **overrides
+    }
+
+def get_requested_range(range_header: str, content_length: int) -> tuple[int, int] | None:
+    range_match = re.fullmatch(r'bytes=(\d+)-(\d*)', range_header.strip())
+    if range_match is None: return None
+    range_start: int = int(range_match.group(1))
+    range_end: int = min(int(range_match.group(2)), content_length - 1) if bool(range_match.group(2)) else content_length - 1
+    return (range_start, range_end) if range_start <= range_end else None
+
+class MockDownloadRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def range_is_allowed(self, state: dict) -> bool:
+        if not state['supports_ranges'] or 'Range' not in self.headers: return False
+        if_range: str | None = self.headers.get('If-Range')
+        return if_range is None or if_range in [state['etag'], state['last_modified']]
+
+    def send_content(self, body: bytes, drop_after_bytes: int | None) -> None:
+        self.wfile.write(body if drop_after_bytes is None else body[:drop_after_bytes])
+        self.wfile.flush()
+        if drop_after_bytes is not None: self.close_connection = True
+
+    def do_HEAD(self) -> None:
+        self.handle_download(send_body = False)
+
+    def do_GET(self) -> None:
+        self.handle_download(send_body = True)
+
+    def handle_download(self, send_body: bool) -> None:
+        state: dict = self.server.mock_download #type: ignore[attr-defined]
+        content: bytes = state['content']
+        with state['lock']:
+            state['requests'].append({'method': self.command, 'path': self.path, 'range': self.headers.get('Range'), 'if_range': self.headers.get('If-Range')})
+        if self.path != state['path']:
+            self.send_error(404)
+            return
+        with state['lock']:
+            drop_after_bytes: int | None = state['drop_after_bytes'].pop(0) if bool(state['drop_after_bytes']) and send_body else None
+        requested_range: tuple[int, int] | None = get_requested_range(self.headers.get('Range', ''), len(content)) if self.range_is_allowed(state) else None
+        if self.range_is_allowed(state) and requested_range is None:
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{len(content)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body: bytes = content[requested_range[0]:requested_range[1] + 1] if requested_range is not None else content
+        self.send_response(206 if requested_range is not None else 200)
+        if requested_range is not None: self.send_header('Content-Range', f'bytes {requested_range[0]}-{requested_range[1]}/{len(content)}')
+        if state['supports_ranges']: self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', state['etag'])
+        self.send_header('Last-Modified', state['last_modified'])
+        self.end_headers()
+        if send_body: self.send_content(body, drop_after_bytes)
+
+class MockDownloadServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address) -> None:
+        pass
+
+def start_mock_download_server(content: bytes, **state_overrides) -> dict:
+    mock_download: dict = create_mock_download_state(content, **state_overrides)
+    server: MockDownloadServer = MockDownloadServer(('127.0.0.1', 0), MockDownloadRequestHandler)
+    server.daemon_threads = True
+    server.mock_download = mock_download #type: ignore[attr-defined]
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+    mock_download.update({'server': server, 'url': f'http://127.0.0.1:{server.server_address[1]}{mock_download['path']}'})
+    return mock_download
+
+def stop_mock_download_server(mock_download: dict) -> None:
+    mock_download['server'].shutdown()
+    mock_download['server'].server_close()
@@ -0,0 +1,265 @@
+import datetime, json, os, random, re, secrets, socket, ssl, tempfile, threading, time
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+mock_imd_certificate_paths: dict[str, str] = {}
+mock_imd_certificate_lock: threading.Lock = threading.Lock()
+
+default_mock_imd_conf: dict = {
+    'conf/system': {'label': 'imd', 'hostname': 'imd', 'ip6Enabled': 'true'},
+    'conf/time': {'ntpServer1': '', 'ntpServer2': ''},
+    'conf/contact': {'location': '', 'description': ''},
+    'conf/snmp': {'v1v2cEnabled': 'true', 'v3Enabled': 'true'},
+    'conf/ssh': {'enabled': 'true'},
+    'conf/usb': {'enabled': 'true'},
+    'conf/http': {'httpEnabled': 'false'},
+    'conf/network/ethernet': {'label': 'Bridge 0', 'dhcpOn': 'false', 'enabled': 'true'},
+    'conf/network/ethernet/stp': {'enabled': 'true'},
+    'conf/network/ethernet/dns/0': {'address': '192.168.123.1'},
+    'conf/network/ethernet/dns/1': {'address': '192.168.123.2'},
+    'conf/network/ethernet/address/0': {'address': '192.168.123.123', 'prefix': 24}
+}
+
+def create_mock_imd_state(**overrides) -> dict:
+    return {
+        'firmware_version': '6.1.0',
+        'next_firmware_version': '6.3.0',
+        'users': {},
+        'tokens': {},
+        'conf': json.loads(json.dumps(default_mock_imd_conf)),
+        'latency': 0,
+        'error_rates': {},
+        'injected_codes': [],
+        'reboot_seconds': 0.5,
+        'requests': [],
+        'lock': threading.RLock(),
+        **overrides
+    }
+
+def get_mock_imd_certificate_paths() -> dict[str, str]:
+    with mock_imd_certificate_lock:
+        if bool(mock_imd_certificate_paths):
+            return mock_imd_certificate_paths
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'mock-imd.local')])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        certificate = (x509.CertificateBuilder()
+            .subject_name(subject)
+            .issuer_name(subject)
+            .public_key(private_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days = 1))
+            .not_valid_after(now + datetime.timedelta(days = 30))
+            .sign(private_key, hashes.SHA256()))
+        certificate_directory: str = tempfile.mkdtemp(prefix = 'mock_imd_')
+        mock_imd_certificate_paths.update(
+            certfile = os.path.join(certificate_directory, 'mock_imd.crt'),
+            keyfile = os.path.join(certificate_directory, 'mock_imd.key'))
+        with open(mock_imd_certificate_paths['certfile'], 'wb') as certificate_file:
+            certificate_file.write(certificate.public_bytes(serialization.Encoding.PEM))
+        with open(mock_imd_certificate_paths['keyfile'], 'wb') as key_file:
+            key_file.write(private_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+        return mock_imd_certificate_paths
+
+def get_response(ret_code: int, ret_msg: str = '', data = None) -> dict:
+    return {'retCode': ret_code, 'retMsg': ret_msg, **({'data': data} if data is not None else {})}
+
+def is_authorized(state: dict, payload: dict) -> bool:
+    if not bool(state['users']):
+        return True
+    token: str = payload.get('token') or ''
+    if bool(token):
+        return token in state['tokens'].keys()
+    return state['users'].get(payload.get('username')) == payload.get('password')
+
+def get_injected_code(state: dict) -> int | None:
+    if bool(state['injected_codes']):
+        return state['injected_codes'].pop(0)
+    for ret_code, error_rate in state['error_rates'].items():
+        if random.random() < error_rate:
+            return int(ret_code)
+    return None
+
+def handle_auth(state: dict, api_path: str, payload: dict) -> dict:
+    username: str = api_path.removeprefix('auth').strip('/')
+    match payload.get('cmd'):
+        case 'add':
+            if bool(state['users']) and not is_authorized(state, payload):
+                return get_response(1003, 'Not enough permissions')
+            user: dict = payload.get('data') or {}
+            state['users'][user['username']] = user['password']
+            return get_response(0)
+        case 'login':
+            if state['users'].get(username) != (payload.get('data') or {}).get('password'):
+                return get_response(1002, 'Invalid username or password')
+            token: str = secrets.token_hex(16)
+            state['tokens'][token] = username
+            return get_response(0, data = {'token': token})
+    return get_response(2001, 'Unknown command')
+
+def handle_conf(state: dict, method: str, api_path: str, payload: dict) -> dict:
+    if not is_authorized(state, payload):
+        return get_response(1001, 'Authorization failure')
+    if method == 'GET':
+        return get_response(0, data = state['conf'][api_path]) if api_path in state['conf'].keys() else get_response(3001, 'Not found')
+    match payload.get('cmd'):
+        case 'set':
+            state['conf'][api_path] = {**state['conf'].get(api_path, {}), **(payload.get('data') or {})}
+            return get_response(0)
+        case 'delete':
+            return get_response(0) if state['conf'].pop(api_path, None) is not None else get_response(3001, 'Not found')
+    return get_response(2001, 'Unknown command')
+
+class MockImdRequestHandler(BaseHTTPRequestHandler):
+    protocol_version: str = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.mock_imd['connections'].add(self.connection) #type: ignore[attr-defined]
+
+    def finish(self):
+        self.server.mock_imd['connections'].discard(self.connection) #type: ignore[attr-defined]
+        super().finish()
+
+    def send_json(self, response: dict, status: int = 200) -> None:
+        response_body: bytes = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response_body)))
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    def read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def handle_request(self, method: str) -> None:
+        mock_imd: dict = self.server.mock_imd #type: ignore[attr-defined]
+        state: dict = mock_imd['state']
+        url = urlsplit(self.path)
+        body: bytes = self.read_body()
+        latency: float | list[float] = state['latency']
+        time.sleep(random.uniform(*latency) if type(latency) == list else latency) #type: ignore[arg-type, misc]
+        with state['lock']:
+            state['requests'].append({'method': method, 'path': url.path, 'at': time.monotonic()})
+            if url.path == '/transfer/firmware':
+                response: dict = self.handle_firmware_upload(mock_imd, parse_qs(url.query), body)
+            else:
+                api_path: str = url.path.removeprefix('/api/').rstrip('/')
+                payload: dict = json.loads(body) if bool(body) else {}
+                injected_code: int | None = get_injected_code(state)
+                response = get_response(injected_code, f'Injected {injected_code}') if injected_code is not None else self.route(mock_imd, method, api_path, payload)
+        self.send_json(response)
+
+    def route(self, mock_imd: dict, method: str, api_path: str, payload: dict) -> dict:
+        state: dict = mock_imd['state']
+        if api_path == 'sys/version':
+            return get_response(0, data = state['firmware_version'])
+        if api_path == 'sys/state/adminExists':
+            return get_response(0, data = bool(state['users']))
+        if api_path.startswith('auth'):
+            return handle_auth(state, api_path, payload)
+        if api_path == 'sys' and payload.get('cmd') == 'reset':
+            if not is_authorized(state, payload):
+                return get_response(1001, 'Authorization failure')
+            state.update(users = {}, tokens = {}, conf = json.loads(json.dumps(default_mock_imd_conf)))
+            reboot_mock_imd(mock_imd)
+            return get_response(0)
+        if api_path.startswith('conf/'):
+            return handle_conf(state, method, api_path, payload)
+        return get_response(3001, 'Not found')
+
+    def handle_firmware_upload(self, mock_imd: dict, query: dict, body: bytes) -> dict:
+        state: dict = mock_imd['state']
+        if (query.get('token') or [''])[0] not in state['tokens'].keys():
+            return get_response(1001, 'Authorization failure')
+        firmware_version_match = re.search(rb'filename="[^"]*?(\d+)_(\d+)_(\d+)[^"]*"', body)
+        state['pending_firmware_version'] = '.'.join(part.decode() for part in firmware_version_match.groups()) if firmware_version_match else state['next_firmware_version']
+        state['tokens'] = {}
+        reboot_mock_imd(mock_imd)
+        return get_response(0)
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+def create_mock_imd_server(mock_imd: dict) -> ThreadingHTTPServer:
+    server: ThreadingHTTPServer = ThreadingHTTPServer((mock_imd['host'], mock_imd['port']), MockImdRequestHandler)
+    server.daemon_threads = True
+    server.mock_imd = mock_imd #type: ignore[attr-defined]
+    ssl_context: ssl.SSLContext = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ssl_context.load_cert_chain(**get_mock_imd_certificate_paths())
+    server.socket = ssl_context.wrap_socket(server.socket, server_side = True)
+    return server
+
+def serve_mock_imd(mock_imd: dict) -> None:
+    server: ThreadingHTTPServer = create_mock_imd_server(mock_imd)
+    mock_imd['port'] = server.server_address[1]
+    mock_imd['address'] = f'{mock_imd['host']}:{mock_imd['port']}'
+    mock_imd['server'] = server
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+
+def start_mock_imd(host: str = '127.0.0.1', port: int = 0, **state_overrides) -> dict:
+    mock_imd: dict = {'host': host, 'port': port, 'state': create_mock_imd_state(**state_overrides), 'connections': set(), 'stopped': False}
+    serve_mock_imd(mock_imd)
+    return mock_imd
+
+def start_mock_imds(count: int, **state_overrides) -> list[dict]:
+    return [ start_mock_imd(**state_overrides) for _ in range(count) ]
+
+def shut_down_mock_imd(mock_imd: dict) -> None:
+    server: ThreadingHTTPServer | None = mock_imd.pop('server', None)
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+    for connection in list(mock_imd['connections']):
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+def stop_mock_imd(mock_imd: dict) -> None:
+    mock_imd['stopped'] = True
+    shut_down_mock_imd(mock_imd)
+
+def reboot_mock_imd(mock_imd: dict) -> None:
+    def go_down_and_come_back() -> None:
+        time.sleep(0.05)
+        shut_down_mock_imd(mock_imd)
+        time.sleep(mock_imd['state']['reboot_seconds'])
+        with mock_imd['state']['lock']:
+            pending_firmware_version: str | None = mock_imd['state'].pop('pending_firmware_version', None)
+            if pending_firmware_version is not None: mock_imd['state']['firmware_version'] = pending_firmware_version
+        if not mock_imd['stopped']: serve_mock_imd(mock_imd)
+
+    threading.Thread(target = go_down_and_come_back, daemon = True).start()
+
+def get_mock_imd_config(mock_imd: dict, **config_overrides) -> dict:
+    return {
+        'current_imd_ip': mock_imd['address'],
+        'imd_base_url': f'https://{mock_imd['address']}',
+        'api_base_url': f'https://{mock_imd['address']}/api/',
+        'headers': {'Content_Type': 'application/json'},
+        'username': 'admin',
+        'password': 'password',
+        'api_attempts': 3,
+        'use_token_auth': True,
+        'unattended': True,
+        'readiness_probe': {'method': 'tcp', 'port': mock_imd['port'], 'timeout': 0.2, 'intervals': [0.05, 0.1, 0.2], 'concurrency': 64},
+        'reboot_wait': {'expected_seconds': 0.5, 'timeout': 10, 'went_down_timeout': 2, 'version_timeout': 1, 'min_interval': 0.02, 'max_interval': 0.2},
+        'rate_limits': {'groups': [], 'default': {'prefix_length': 32, 'requests_per_second': 0}},
+        'retry_policies': {
+            'transport': {'retry': True, 'base_delay': 0.01, 'multiplier': 2, 'max_delay': 0.1, 'jitter': 0},
+            '5002':      {'retry': True, 'base_delay': 0.01, 'multiplier': 2, 'max_delay': 0.1, 'jitter': 0}
+        },
+        **config_overrides
+    }
@@ -1,5 +1,7 @@
-from unittest import TestCase
-from utils.api_utils import get_ordered_api_calls
+import time
+
+from unittest import mock, TestCase
+from utils.api_utils import apply_all_api_calls, forget_imd_state, get_admin_status, get_imd_token, get_ordered_api_calls
 
 class TestGetOrderedApiCalls(TestCase):
 
@@ -82,12 +84,90 @@ class TestGetOrderedApiCalls(TestCase):
     ]
 
     expected_ordered_api_calls: list[dict] = [
-        {'config_item': 'label', 'config_item_name': 'Hostname Label', 'display_to_user': True, 'value_to_display': 'test_hostname', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'system', 'data': "{'label': 'test_hostname', 'hostname': 'test_hostname' }"}]}, 
+        {'config_item': 'label', 'config_item_name': 'Hostname Label', 'display_to_user': True, 'value_to_display': 'test_hostname', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'system', 'data': {'label': 'test_hostname', 'hostname': 'test_hostname'}}]}, 
         {'config_item': 'ipv6', 'config_item_name': 'IPv6', 'api_calls': [{'method': 'post', 'api_path': 'system', 'cmd': 'set', 'data': {'ip6Enabled': 'false'}}]}, 
-        {'config_item': 'ntp', 'config_item_name': 'NTP Servers', 'display_to_user': False, 'value_to_display': None, 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/contact', 'data': "{'ntpServer1': 'test.primary_ntp.net', 'ntpServer2': 'test.secondary_ntp.net'}"}]}
+        {'config_item': 'ntp', 'config_item_name': 'NTP Servers', 'display_to_user': False, 'value_to_display': None, 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/contact', 'data': {'ntpServer1': 'test.primary_ntp.net', 'ntpServer2': 'test.secondary_ntp.net'}}]}
     ]
 
     def test_get_ordered_api_calls(self):
         returned_ordered_api_calls: list[dict] = get_ordered_api_calls(self.test_config, self.test_prompts, self.test_config_items)
         for index, api_call in enumerate(self.expected_ordered_api_calls):
-            self.assertDictEqual(api_call, returned_ordered_api_calls[index])
\ No newline at end of file
+            self.assertDictEqual(api_call, returned_ordered_api_calls[index])
+
+class TestApplyAllApiCalls(TestCase):
+
+    test_config: dict = {'api_attempts': 1, 'imd_concurrency': 4, 'unattended': True}
+
+    test_ordered_api_calls: list[dict] = [
+        {'config_item': 'credentials', 'config_item_name': 'Credentials', 'barrier': True, 'api_calls': [{'cmd': 'add', 'method': 'post', 'api_path': 'auth'}]},
+        {'config_item': 'snmp', 'config_item_name': 'SNMP', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/snmp'}]},
+        {'config_item': 'ssh', 'config_item_name': 'SSH', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/ssh'}]},
+        {'config_item': 'usb', 'config_item_name': 'USB', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/usb'}]}
+    ]
+
+    test_addressing_api_calls: list[dict] = [
+        {'config_item': 'static_ip', 'config_item_name': 'Static IP', 'barrier': True, 'api_calls': [{'cmd': 'delete', 'method': 'post', 'api_path': 'conf/network/ethernet/address/0'}]}
+    ]
+
+    @staticmethod
+    def slow_apply_api_call(config, config_item_name, api_call, retry_attempts, quiet = False, on_response_code = None, deadline = None) -> bool:
+        time.sleep(0.2)
+        return True
+
+    @mock.patch('utils.api_utils.apply_api_call', side_effect = slow_apply_api_call)
+    def test_apply_all_api_calls_runs_independent_calls_concurrently(self, mock_apply_api_call):
+        start_time: float = time.monotonic()
+        self.assertTrue(apply_all_api_calls(self.test_config, self.test_ordered_api_calls, quiet = True))
+        self.assertLess(time.monotonic() - start_time, 0.6)
+        self.assertEqual(mock_apply_api_call.call_args_list[0].args[2]['api_path'], 'auth')
+
+    @mock.patch('utils.api_utils.apply_api_call', side_effect = slow_apply_api_call)
+    def test_apply_all_api_calls_runs_sequentially_without_declared_dependencies(self, mock_apply_api_call):
+        legacy_ordered_api_calls: list[dict] = [ { key: value for key, value in ordered_api_call.items() if key != 'barrier' } for ordered_api_call in self.test_ordered_api_calls ]
+        start_time: float = time.monotonic()
+        self.assertTrue(apply_all_api_calls(self.test_config, legacy_ordered_api_calls, quiet = True))
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.8)
+
+    def get_failing_apply_api_call(self, failing_api_path: str, failure_count: int) -> tuple[list[str], mock.Mock]:
+        applied_api_paths: list[str] = []
+        remaining_failures: dict = {'count': failure_count}
+        def apply_api_call(config, config_item_name, api_call, retry_attempts, quiet = False, on_response_code = None, deadline = None) -> bool:
+            applied_api_paths.append(api_call['api_path'])
+            if api_call['api_path'] != failing_api_path or remaining_failures['count'] == 0: return True
+            remaining_failures['count'] -= 1
+            return False
+        return applied_api_paths, mock.Mock(side_effect = apply_api_call)
+
+    def test_apply_all_api_calls_does_not_run_a_barrier_after_a_failure(self):
+        applied_api_paths, mock_apply_api_call = self.get_failing_apply_api_call('conf/ssh', 1)
+        with mock.patch('utils.api_utils.apply_api_call', mock_apply_api_call):
+            self.assertFalse(apply_all_api_calls(self.test_config, self.test_ordered_api_calls + self.test_addressing_api_calls, quiet = True))
+        self.assertNotIn('conf/network/ethernet/address/0', applied_api_paths)
+
+    def test_apply_all_api_calls_retries_failures_before_the_next_barrier(self):
+        applied_api_paths, mock_apply_api_call = self.get_failing_apply_api_call('conf/ssh', 1)
+        with mock.patch('utils.api_utils.apply_api_call', mock_apply_api_call):
+            self.assertTrue(apply_all_api_calls({**self.test_config, 'unattended': False}, self.test_ordered_api_calls + self.test_addressing_api_calls, quiet = True))
+        self.assertEqual(applied_api_paths.count('conf/ssh'), 2)
+        self.assertEqual(applied_api_paths[-1], 'conf/network/ethernet/address/0')
+        self.assertEqual(applied_api_paths.count('conf/network/ethernet/address/0'), 1)
+
+
+class TestGetImdToken(TestCase):
+
+    test_config: dict = {'current_imd_ip': 'token.test', 'username': 'test_username', 'password': 'test_password', 'token_ttl': 300}
+
+    def tearDown(self):
+        forget_imd_state(self.test_config)
+
+    @mock.patch('utils.api_utils.interact_with_imd', side_effect = [{'retCode': 0, 'data': True}, {'retCode': 0, 'data': {'token': 'test_token'}}])
+    def test_get_imd_token_logs_in_once(self, mock_interact_with_imd):
+        self.assertEqual(get_imd_token(self.test_config), 'test_token')
+        self.assertEqual(get_imd_token(self.test_config), 'test_token')
+        self.assertEqual(mock_interact_with_imd.call_count, 2)
+
+    @mock.patch('utils.api_utils.interact_with_imd', return_value = {'retCode': 0, 'data': True})
+    def test_get_admin_status_is_cached(self, mock_interact_with_imd):
+        self.assertTrue(get_admin_status(self.test_config))
+        self.assertTrue(get_admin_status(self.test_config))
+        mock_interact_with_imd.assert_called_once()
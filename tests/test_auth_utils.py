@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from utils.auth_utils import cache_admin_status, cache_token, clear_auth_context, get_cached_admin_status, get_cached_token, invalidate_token
+
+class TestCachedToken(TestCase):
+    test_config: dict = { 'current_imd_ip': 'auth.test', 'username': 'test_username', 'password': 'test_password', 'token_ttl': 300 }
+
+    def tearDown(self):
+        clear_auth_context(self.test_config)
+
+    def test_get_cached_token_returns_cached_token(self):
+        cache_token(self.test_config, 'test_token')
+        self.assertEqual(get_cached_token(self.test_config), 'test_token')
+
+    def test_get_cached_token_returns_false_when_expired(self):
+        cache_token({ **self.test_config, 'token_ttl': -1 }, 'test_token')
+        self.assertFalse(get_cached_token(self.test_config))
+
+    def test_get_cached_token_returns_false_after_credential_change(self):
+        cache_token(self.test_config, 'test_token')
+        self.assertFalse(get_cached_token({ **self.test_config, 'password': 'new_password' }))
+
+    def test_get_cached_token_returns_false_after_invalidation(self):
+        cache_token(self.test_config, 'test_token')
+        invalidate_token(self.test_config)
+        self.assertFalse(get_cached_token(self.test_config))
+
+    def test_invalidate_token_keeps_a_newer_token(self):
+        cache_token(self.test_config, 'new_token')
+        invalidate_token(self.test_config, 'old_token')
+        self.assertEqual(get_cached_token(self.test_config), 'new_token')
+        invalidate_token(self.test_config, 'new_token')
+        self.assertFalse(get_cached_token(self.test_config))
+
+class TestCachedAdminStatus(TestCase):
+    test_config: dict = { 'current_imd_ip': 'auth.test' }
+
+    def test_get_cached_admin_status_returns_none_until_cached(self):
+        self.assertIsNone(get_cached_admin_status(self.test_config))
+        cache_admin_status(self.test_config, True)
+        self.assertTrue(get_cached_admin_status(self.test_config))
+        clear_auth_context(self.test_config)
+        self.assertIsNone(get_cached_admin_status(self.test_config))
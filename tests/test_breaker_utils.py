@@ -0,0 +1,53 @@
+import requests, time
+
+from unittest import mock, TestCase
+
+from utils.breaker_utils import circuit_allows_request, get_circuit_open_reason, get_circuit_state, record_transport_failure, record_transport_success, reset_circuit_breaker
+from utils.retry_utils import send_with_retries
+
+test_config: dict = {
+    'current_imd_ip': 'breaker.test',
+    'unattended': True,
+    'circuit_breaker': {'failure_threshold': 2, 'cooldown': 0.05},
+    'retry_policies': {'transport': {'retry': True, 'base_delay': 0.001, 'multiplier': 1, 'max_delay': 0.001, 'jitter': 0}}
+}
+
+class TestCircuitBreaker(TestCase):
+
+    def setUp(self):
+        reset_circuit_breaker(test_config)
+
+    def test_circuit_opens_after_consecutive_transport_failures(self):
+        record_transport_failure(test_config, requests.exceptions.ConnectionError('down'))
+        self.assertEqual(get_circuit_state(test_config), 'closed')
+        record_transport_failure(test_config, requests.exceptions.ConnectionError('down'))
+        self.assertEqual(get_circuit_state(test_config), 'open')
+        self.assertFalse(circuit_allows_request(test_config))
+        self.assertIn('2 consecutive transport failures', get_circuit_open_reason(test_config))
+
+    def test_circuit_success_resets_failure_count(self):
+        record_transport_failure(test_config, requests.exceptions.ConnectionError('down'))
+        record_transport_success(test_config)
+        record_transport_failure(test_config, requests.exceptions.ConnectionError('down'))
+        self.assertEqual(get_circuit_state(test_config), 'closed')
+
+    def test_circuit_half_opens_after_cooldown_and_allows_one_trial(self):
+        for _ in range(2): record_transport_failure(test_config, requests.exceptions.ConnectionError('down'))
+        time.sleep(0.06)
+        self.assertEqual(get_circuit_state(test_config), 'half_open')
+        self.assertTrue(circuit_allows_request(test_config))
+        self.assertFalse(circuit_allows_request(test_config))
+        record_transport_failure(test_config, requests.exceptions.ConnectionError('still down'))
+        self.assertEqual(get_circuit_state(test_config), 'open')
+
+    def test_circuit_is_ignored_when_not_unattended(self):
+        for _ in range(2): record_transport_failure(test_config, requests.exceptions.ConnectionError('down'))
+        self.assertTrue(circuit_allows_request({**test_config, 'unattended': False}))
+
+    def test_send_with_retries_fails_fast_once_circuit_is_open(self):
+        send_request = mock.Mock(side_effect = requests.exceptions.ConnectionError('down'))
+        retry_result: dict = send_with_retries(test_config, send_request, max_attempts = 10)
+        self.assertEqual(send_request.call_count, 2)
+        retry_result = send_with_retries(test_config, send_request, max_attempts = 10)
+        self.assertTrue(retry_result['circuit_open'])
+        self.assertEqual(send_request.call_count, 2)
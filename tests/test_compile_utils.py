@@ -0,0 +1,71 @@
+import json
+
+from unittest import TestCase
+
+from utils.compile_utils import compile_prompts, get_compiled_format_functions, get_compiled_verify_functions
+
+test_prompts: dict = {
+    'prompts': [
+        {'config_item': 'row', 'verify_functions': [['is_int']], 'format_functions': [['zfill', 2]]},
+        {'config_item': 'pdu_letter', 'verify_functions': [['is_one_of', ['a', 'b']]], 'format_functions': [['upper']]}
+    ],
+    'formatters': [
+        {'config_item': 'location', 'format_functions': [['apply_string_template', 'R{row}/{pdu_letter}'], ['replace', '/', '-'], ['lower']]}
+    ]
+}
+
+class TestGetCompiledFunctions(TestCase):
+
+    def test_get_compiled_format_functions_composes_functions_in_order(self):
+        format_callable = get_compiled_format_functions(test_prompts['formatters'][0]['format_functions'])
+        self.assertEqual(format_callable('', {'row': '07', 'pdu_letter': 'B'}), 'r07-b')
+
+    def test_get_compiled_format_functions_applies_single_functions(self):
+        self.assertEqual(get_compiled_format_functions([['zfill', 6]])('abc', {}), '000abc')
+        self.assertEqual(get_compiled_format_functions([['upper']])('test string', {}), 'TEST STRING')
+        self.assertEqual(get_compiled_format_functions([['lower']])('TEST STRING', {}), 'test string')
+
+    def test_get_compiled_format_functions_applies_string_templates(self):
+        format_callable = get_compiled_format_functions([['apply_string_template', 'R{row}-{rack}/{pdu_letter}'], ['upper']])
+        self.assertEqual(format_callable('', {'row': '07', 'rack': '09', 'pdu_letter': 'b'}), 'R07-09/B')
+
+    def test_get_compiled_format_functions_applies_json_string_templates(self):
+        format_callable = get_compiled_format_functions([['apply_string_template', "{{'ntpServer1': '{primary_ntp}', 'ntpServer2': '{secondary_ntp}'}}"]])
+        self.assertEqual(format_callable('', {'primary_ntp': 'test.primary_ntp.net', 'secondary_ntp': 'test.secondary_ntp.net'}),
+            "{'ntpServer1': 'test.primary_ntp.net', 'ntpServer2': 'test.secondary_ntp.net'}")
+
+    def test_get_compiled_verify_functions_requires_every_function(self):
+        verify_callable = get_compiled_verify_functions([['is_int'], ['is_between', 1, 2]])
+        self.assertTrue(verify_callable('42'))
+        self.assertFalse(verify_callable('420'))
+        self.assertFalse(verify_callable('ab'))
+
+    def test_get_compiled_functions_skips_empty_functions(self):
+        self.assertEqual(get_compiled_format_functions([[]])('unchanged', {}), 'unchanged')
+        self.assertTrue(get_compiled_verify_functions([[]])('anything'))
+
+    def test_get_compiled_functions_reuses_compiled_callables(self):
+        self.assertIs(get_compiled_format_functions([['zfill', 3]]), get_compiled_format_functions([['zfill', 3]]))
+
+    def test_get_compiled_functions_rejects_unknown_function_names(self):
+        with self.assertRaises(ValueError):
+            get_compiled_format_functions([['titlecase']])
+        with self.assertRaises(ValueError):
+            get_compiled_verify_functions([['is_palindrome']])
+
+class TestCompilePrompts(TestCase):
+
+    def test_compile_prompts_compiles_each_config_item(self):
+        compiled_config_items: dict = compile_prompts(test_prompts)
+        self.assertEqual(compiled_config_items['row']['format']('7', {}), '07')
+        self.assertFalse(compiled_config_items['pdu_letter']['verify']('c'))
+
+    def test_compile_prompts_is_cached_by_content(self):
+        prompts: dict = json.loads(json.dumps(test_prompts))
+        prompts['prompts'][0]['format_functions'] = [['zfill', 4]]
+        self.assertIs(compile_prompts(prompts), compile_prompts(json.loads(json.dumps(prompts))))
+
+    def test_compile_prompts_names_config_item_with_unknown_function(self):
+        invalid_prompts: dict = {'prompts': [{'config_item': 'rack', 'format_functions': [['titlecase']]}]}
+        with self.assertRaisesRegex(ValueError, 'titlecase.*rack'):
+            compile_prompts(invalid_prompts)
@@ -0,0 +1,74 @@
+import json, os, socket, tempfile
+
+from argparse import Namespace
+from unittest import mock, TestCase
+
+from tests.mock_imd_server import get_mock_imd_config, start_mock_imd, stop_mock_imd
+from utils.discovery_utils import discover_imds, get_discovery_addresses
+from utils.fleet_utils import get_fleet
+
+class TestGetDiscoveryAddresses(TestCase):
+
+    def test_get_discovery_addresses_expands_and_deduplicates_cidrs(self):
+        addresses: list[str] = get_discovery_addresses({}, ['10.0.0.0/30', '10.0.0.2/32', '10.0.1.7'])
+        self.assertEqual(addresses, ['10.0.0.1', '10.0.0.2', '10.0.1.7'])
+
+    def test_get_discovery_addresses_adds_non_default_ports(self):
+        self.assertEqual(get_discovery_addresses({'discovery': {'port': 8443}}, ['10.0.0.1', 'fd00::1/128']), ['10.0.0.1:8443', '[fd00::1]:8443'])
+
+    def test_get_discovery_addresses_sweeps_a_22(self):
+        self.assertEqual(len(get_discovery_addresses({}, ['10.20.0.0/22'])), 1022)
+
+    def test_get_discovery_addresses_rejects_oversized_sweeps(self):
+        with self.assertRaises(ValueError):
+            get_discovery_addresses({}, ['10.0.0.0/8'])
+
+    def test_get_discovery_addresses_rejects_invalid_cidrs(self):
+        with self.assertRaises(ValueError):
+            get_discovery_addresses({}, ['10.0.0.0/33'])
+
+class TestDiscoverImds(TestCase):
+
+    def setUp(self):
+        self.first_mock_imd: dict = start_mock_imd('127.0.0.2')
+        self.port: int = self.first_mock_imd['port']
+        self.second_mock_imd: dict = start_mock_imd('127.0.0.3', self.port, firmware_version = '5.10.1', users = {'admin': 'password'})
+        self.other_listener: socket.socket = socket.create_server(('127.0.0.4', self.port))
+        self.inventory_directory = tempfile.TemporaryDirectory()
+        self.test_config: dict = {
+            **get_mock_imd_config(self.first_mock_imd, api_attempts = 1),
+            'discovery': {'port': self.port, 'timeout': 0.2, 'fingerprint_timeout': 0.5},
+            'inventories_path': self.inventory_directory.name
+        }
+
+    def tearDown(self):
+        stop_mock_imd(self.first_mock_imd)
+        stop_mock_imd(self.second_mock_imd)
+        self.other_listener.close()
+        self.inventory_directory.cleanup()
+
+    def test_discover_imds_fingerprints_imds_and_skips_other_hosts(self):
+        inventory: list[dict] = discover_imds(self.test_config, ['127.0.0.0/29'], quiet = True)
+        self.assertEqual(inventory, [
+            {'imd_ip': f'127.0.0.2:{self.port}', 'firmware_version': '6.1.0', 'admin_exists': False},
+            {'imd_ip': f'127.0.0.3:{self.port}', 'firmware_version': '5.10.1', 'admin_exists': True}
+        ])
+
+    def test_discover_imds_writes_an_inventory_usable_as_a_fleet_file(self):
+        inventory_file_path: str = os.path.join(self.inventory_directory.name, 'lab.json')
+        discover_imds(self.test_config, ['127.0.0.2/31'], inventory_file_path, quiet = True)
+        with open(inventory_file_path, 'r') as inventory_file:
+            self.assertEqual(len(json.load(inventory_file)), 2)
+        fleet: list[dict] = get_fleet(self.test_config, Namespace(fleet_file = inventory_file_path, fleet = None))
+        self.assertEqual([ imd['imd_ip'] for imd in fleet ], [f'127.0.0.2:{self.port}', f'127.0.0.3:{self.port}'])
+
+    def test_discover_imds_writes_timestamped_inventory_by_default(self):
+        discover_imds(self.test_config, ['127.0.0.2'], quiet = True)
+        inventory_files: list[str] = os.listdir(self.inventory_directory.name)
+        self.assertEqual(len(inventory_files), 1)
+        self.assertTrue(inventory_files[0].startswith('inventory_'))
+
+    def test_discover_imds_reports_invalid_cidrs(self):
+        with mock.patch('builtins.print') as mock_print:
+            self.assertEqual(discover_imds(self.test_config, ['not-a-cidr']), [])
+        self.assertIn('Unable to sweep', mock_print.call_args.args[0])
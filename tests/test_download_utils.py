@@ -0,0 +1,137 @@
+import hashlib, json, os, requests, tempfile
+
+from unittest import TestCase
+
+from tests.mock_download_server import start_mock_download_server, stop_mock_download_server
+from utils.download_utils import download_file, DownloadHashError, get_download_segments, get_download_state_path, get_partial_file_path, get_segmented_file_path
+
+test_content: bytes = bytes(range(256)) * 1024
+
+class TestDownloadFile(TestCase):
+
+    def setUp(self):
+        self.download_directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.destination: str = os.path.join(self.download_directory.name, 'geist-i03-6_3_0-12122024.zip')
+        self.test_config: dict = {'download_timeout': 5, 'download': {'attempts': 4, 'base_delay': 0.01, 'max_delay': 0.02, 'chunk_size': 16384}}
+
+    def tearDown(self):
+        stop_mock_download_server(self.mock_download)
+        self.download_directory.cleanup()
+
+    def read_destination(self) -> bytes:
+        with open(self.destination, 'rb') as downloaded_file:
+            return downloaded_file.read()
+
+    def test_download_file_resumes_with_range_requests(self):
+        self.mock_download: dict = start_mock_download_server(test_content, drop_after_bytes = [70000, 50000])
+        self.assertEqual(download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True), self.destination)
+        self.assertEqual(self.read_destination(), test_content)
+        download_requests: list[dict] = self.mock_download['requests']
+        self.assertEqual(len(download_requests), 3)
+        self.assertIsNone(download_requests[0]['range'])
+        self.assertEqual(download_requests[1]['if_range'], self.mock_download['etag'])
+        self.assertTrue(download_requests[1]['range'].startswith('bytes='))
+        self.assertFalse(os.path.exists(get_partial_file_path(self.destination)))
+        self.assertFalse(os.path.exists(get_download_state_path(self.destination)))
+
+    def test_download_file_resumes_a_previous_run(self):
+        self.mock_download: dict = start_mock_download_server(test_content, drop_after_bytes = [100000])
+        with self.assertRaises(requests.exceptions.RequestException):
+            download_file({**self.test_config, 'download': {**self.test_config['download'], 'attempts': 1}}, self.mock_download['url'], self.destination, quiet = True)
+        with open(get_download_state_path(self.destination), 'r') as download_state_file:
+            download_state: dict = json.load(download_state_file)
+        self.assertGreater(download_state['bytes'], 0)
+        self.assertEqual(download_state['etag'], self.mock_download['etag'])
+        download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True)
+        self.assertEqual(self.read_destination(), test_content)
+        self.assertEqual(self.mock_download['requests'][-1]['range'], f'bytes={download_state['bytes']}-')
+
+    def test_download_file_restarts_when_the_file_changed(self):
+        self.mock_download: dict = start_mock_download_server(test_content, drop_after_bytes = [100000])
+        with self.assertRaises(requests.exceptions.RequestException):
+            download_file({**self.test_config, 'download': {**self.test_config['download'], 'attempts': 1}}, self.mock_download['url'], self.destination, quiet = True)
+        changed_content: bytes = bytes(reversed(test_content))
+        self.mock_download.update(content = changed_content, etag = '"changed"')
+        download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True)
+        self.assertEqual(self.read_destination(), changed_content)
+
+    def test_download_file_restarts_when_the_server_ignores_ranges(self):
+        self.mock_download: dict = start_mock_download_server(test_content, supports_ranges = False, drop_after_bytes = [100000])
+        download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True)
+        self.assertEqual(self.read_destination(), test_content)
+
+    def test_download_file_does_not_retry_client_errors(self):
+        self.mock_download: dict = start_mock_download_server(test_content)
+        with self.assertRaises(requests.exceptions.HTTPError):
+            download_file(self.test_config, self.mock_download['url'].replace('.zip', '.missing'), self.destination, quiet = True)
+        self.assertEqual(len(self.mock_download['requests']), 1)
+
+class TestGetDownloadSegments(TestCase):
+
+    def test_get_download_segments_covers_every_byte(self):
+        self.assertEqual(get_download_segments(10, 3, 1), [(0, 3), (4, 7), (8, 9)])
+        self.assertEqual(get_download_segments(10, 8, 4), [(0, 3), (4, 7), (8, 9)])
+        self.assertEqual(get_download_segments(10, 4, 100), [(0, 9)])
+
+class TestSegmentedDownload(TestCase):
+
+    def setUp(self):
+        self.download_directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.destination: str = os.path.join(self.download_directory.name, 'geist-i03-6_3_0-12122024.zip')
+        self.test_config: dict = {'download_timeout': 5, 'download': {'attempts': 4, 'base_delay': 0.01, 'max_delay': 0.02, 'chunk_size': 16384, 'segments': 4, 'min_segment_size': 1024}}
+        self.test_sha256: str = hashlib.sha256(test_content).hexdigest()
+
+    def tearDown(self):
+        stop_mock_download_server(self.mock_download)
+        self.download_directory.cleanup()
+
+    def read_destination(self) -> bytes:
+        with open(self.destination, 'rb') as downloaded_file:
+            return downloaded_file.read()
+
+    def test_download_file_fetches_segments_concurrently(self):
+        self.mock_download: dict = start_mock_download_server(test_content)
+        download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True, expected_sha256 = self.test_sha256)
+        self.assertEqual(self.read_destination(), test_content)
+        segment_ranges: list[str] = sorted(download_request['range'] for download_request in self.mock_download['requests'][1:])
+        self.assertEqual(segment_ranges, ['bytes=0-65535', 'bytes=131072-196607', 'bytes=196608-262143', 'bytes=65536-131071'])
+        self.assertFalse(os.path.exists(get_segmented_file_path(self.destination)))
+
+    def test_download_file_retries_interrupted_segments_from_where_they_stopped(self):
+        self.mock_download: dict = start_mock_download_server(test_content, drop_after_bytes = [None, 20000])
+        download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True, expected_sha256 = self.test_sha256)
+        self.assertEqual(self.read_destination(), test_content)
+        self.assertEqual(len(self.mock_download['requests']), 6)
+        range_starts: list[int] = [ int(download_request['range'].split('=')[1].split('-')[0]) for download_request in self.mock_download['requests'] ]
+        self.assertEqual(len([ range_start for range_start in range_starts if range_start % 65536 == 16384 ]), 1)
+
+    def test_download_file_falls_back_to_a_single_stream_without_range_support(self):
+        self.mock_download: dict = start_mock_download_server(test_content, supports_ranges = False)
+        download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True, expected_sha256 = self.test_sha256)
+        self.assertEqual(self.read_destination(), test_content)
+        self.assertEqual(len(self.mock_download['requests']), 2)
+
+    def test_download_file_does_not_use_segments_without_a_known_hash(self):
+        self.mock_download: dict = start_mock_download_server(test_content)
+        download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True)
+        self.assertEqual(self.read_destination(), test_content)
+        self.assertEqual([ download_request['range'] for download_request in self.mock_download['requests'] ], [None])
+
+    def test_download_file_checks_segments_against_the_previous_hash(self):
+        self.mock_download: dict = start_mock_download_server(test_content)
+        download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True, previous_sha256 = self.test_sha256)
+        self.assertEqual(self.read_destination(), test_content)
+        self.assertEqual(len(self.mock_download['requests']), 5)
+
+    def test_download_file_falls_back_to_a_single_stream_when_the_previous_hash_is_stale(self):
+        self.mock_download: dict = start_mock_download_server(test_content)
+        download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True, previous_sha256 = '0' * 64)
+        self.assertEqual(self.read_destination(), test_content)
+        self.assertIsNone(self.mock_download['requests'][-1]['range'])
+
+    def test_download_file_rejects_files_that_do_not_match_the_expected_hash(self):
+        self.mock_download: dict = start_mock_download_server(test_content)
+        with self.assertRaises(DownloadHashError):
+            download_file(self.test_config, self.mock_download['url'], self.destination, quiet = True, expected_sha256 = '0' * 64)
+        self.assertFalse(os.path.exists(self.destination))
+        self.assertIsNone(self.mock_download['requests'][-1]['range'])
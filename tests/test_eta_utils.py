@@ -0,0 +1,68 @@
+import json, os, tempfile
+
+from unittest import TestCase
+
+from tests.mock_imd_server import get_mock_imd_config, reboot_mock_imd, start_mock_imd, stop_mock_imd
+from utils.api_utils import forget_imd_state
+from utils.eta_utils import estimate_reboot_seconds, get_percentile, record_reboot_duration, wait_for_imd_reboot_with_history
+
+class TestGetPercentile(TestCase):
+
+    def test_get_percentile_interpolates_between_samples(self):
+        self.assertEqual(get_percentile([10, 20, 30, 40], 50), 25)
+        self.assertEqual(get_percentile([40, 10, 30, 20], 0), 10)
+        self.assertEqual(get_percentile([40, 10, 30, 20], 100), 40)
+        self.assertEqual(get_percentile([90], 90), 90)
+
+class TestRebootHistory(TestCase):
+
+    def setUp(self):
+        self.history_directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.reboot_history_path: str = os.path.join(self.history_directory.name, 'reboot_history.json')
+        self.test_config: dict = {'reboot_history_path': self.reboot_history_path, 'reboot_history': {'max_samples': 3, 'percentile': 50}, 'reboot_wait': {'expected_seconds': 90}}
+
+    def tearDown(self):
+        self.history_directory.cleanup()
+
+    def test_estimate_reboot_seconds_falls_back_to_the_reboot_wait_default(self):
+        self.assertEqual(estimate_reboot_seconds(self.test_config, 'upgrade', '6.1.0', '6.3.0'), {'expected_seconds': 90, 'samples': 0, 'basis': 'default'})
+
+    def test_record_reboot_duration_keeps_the_most_recent_samples(self):
+        for seconds in [100, 60, 70, 80]:
+            record_reboot_duration(self.test_config, 'upgrade', '6.1.0', '6.3.0', seconds)
+        with open(self.reboot_history_path, 'r') as reboot_history_file:
+            self.assertEqual(json.load(reboot_history_file), {'upgrade 6.1.0 -> 6.3.0': [60, 70, 80]})
+        self.assertEqual(estimate_reboot_seconds(self.test_config, 'upgrade', '6.1.0', '6.3.0')['expected_seconds'], 70)
+
+    def test_estimate_reboot_seconds_uses_other_upgrades_to_the_same_version(self):
+        record_reboot_duration(self.test_config, 'upgrade', '6.0.0', '6.3.0', 120)
+        record_reboot_duration(self.test_config, 'upgrade', '6.1.0', '6.2.0', 40)
+        record_reboot_duration(self.test_config, 'reset', '6.1.0', '6.1.0', 30)
+        reboot_estimate: dict = estimate_reboot_seconds(self.test_config, 'upgrade', '6.2.0', '6.3.0')
+        self.assertEqual(reboot_estimate, {'expected_seconds': 120, 'samples': 1, 'basis': 'upgrade to 6.3.0'})
+        self.assertEqual(estimate_reboot_seconds(self.test_config, 'upgrade', '6.2.0', '6.4.0')['expected_seconds'], 80)
+
+    def test_record_reboot_duration_without_a_history_path_does_nothing(self):
+        record_reboot_duration({}, 'upgrade', '6.1.0', '6.3.0', 60)
+        self.assertEqual(os.listdir(self.history_directory.name), [])
+
+class TestWaitForImdRebootWithHistory(TestCase):
+
+    def setUp(self):
+        self.history_directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.mock_imd: dict = start_mock_imd(reboot_seconds = 0.3)
+        self.test_config: dict = get_mock_imd_config(self.mock_imd, reboot_history_path = os.path.join(self.history_directory.name, 'reboot_history.json'))
+
+    def tearDown(self):
+        forget_imd_state(self.test_config)
+        stop_mock_imd(self.mock_imd)
+        self.history_directory.cleanup()
+
+    def test_wait_for_imd_reboot_with_history_records_successful_reboots(self):
+        reboot_mock_imd(self.mock_imd)
+        reboot_result: dict = wait_for_imd_reboot_with_history(self.test_config, 'reset', '6.1.0', '6.1.0')
+        self.assertTrue(reboot_result['succeeded'])
+        self.assertEqual(reboot_result['expected_seconds'], 0.5)
+        reboot_estimate: dict = estimate_reboot_seconds(self.test_config, 'reset', '6.1.0', '6.1.0')
+        self.assertEqual(reboot_estimate['samples'], 1)
+        self.assertAlmostEqual(reboot_estimate['expected_seconds'], reboot_result['elapsed_seconds'], delta = 0.1)
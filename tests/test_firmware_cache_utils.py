@@ -0,0 +1,103 @@
+import json, os, tempfile, zipfile
+
+from unittest import mock, TestCase
+
+from utils.firmware_cache_utils import cache_firmware_files, get_cached_archive_sha256, get_cached_firmware_file_path, get_firmware_identity, hash_file
+from utils.firmware_utils import get_firmware_file_path
+from utils.parse_utils import parse_firmware_url
+
+test_firmware_url: str = 'https://www.vertiv.com/491d7b/globalassets/documents/firmware/geist-i03-6_3_0-12122024.zip'
+
+def create_firmware_archive(directory: str, filename: str, firmware_bytes: bytes) -> str:
+    archive_file_path: str = os.path.join(directory, filename)
+    with zipfile.ZipFile(archive_file_path, 'w') as firmware_archive:
+        firmware_archive.writestr(f'{filename.removesuffix('.zip')}/geist-i03-6_3_0.firmware', firmware_bytes)
+    return archive_file_path
+
+class TestFirmwareCache(TestCase):
+
+    def setUp(self):
+        self.cache_directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.source_directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.test_config: dict = {
+            'firmware_cache_path': self.cache_directory.name,
+            'firmware_target': '6.3.0',
+            'firmware_file_url': test_firmware_url,
+            'parsed_firmware_url': parse_firmware_url({}, test_firmware_url)
+        }
+
+    def tearDown(self):
+        self.cache_directory.cleanup()
+        self.source_directory.cleanup()
+
+    def test_get_firmware_identity_parses_the_model(self):
+        self.assertEqual(get_firmware_identity(self.test_config), {'url': test_firmware_url, 'version': '6.3.0', 'model': 'geist-i03'})
+
+    def test_cache_firmware_files_extracts_archives_into_content_addressed_paths(self):
+        archive_file_path: str = create_firmware_archive(self.source_directory.name, 'geist-i03-6_3_0-12122024.zip', b'firmware 6.3.0')
+        archive_sha256: str = hash_file(archive_file_path)
+        cached_firmware_file_path: str | None = cache_firmware_files(self.test_config, archive_file_path = archive_file_path, move = True)
+        self.assertEqual(os.path.basename(cached_firmware_file_path), 'geist-i03-6_3_0.firmware') #type: ignore[arg-type]
+        self.assertEqual(hash_file(cached_firmware_file_path), os.path.basename(os.path.dirname(cached_firmware_file_path))) #type: ignore[arg-type]
+        self.assertFalse(os.path.exists(archive_file_path))
+        with open(os.path.join(self.cache_directory.name, 'index.json'), 'r') as index_file:
+            firmware_cache_entry: dict = json.load(index_file)['entries'][0]
+        self.assertEqual(firmware_cache_entry['archive']['sha256'], archive_sha256)
+        self.assertEqual(get_cached_firmware_file_path(self.test_config), cached_firmware_file_path)
+
+    def test_get_cached_archive_sha256_matches_only_the_same_url(self):
+        self.assertIsNone(get_cached_archive_sha256(self.test_config))
+        archive_file_path: str = create_firmware_archive(self.source_directory.name, 'geist-i03-6_3_0-12122024.zip', b'firmware 6.3.0')
+        archive_sha256: str = hash_file(archive_file_path)
+        cache_firmware_files(self.test_config, archive_file_path = archive_file_path)
+        self.assertEqual(get_cached_archive_sha256(self.test_config), archive_sha256)
+        self.assertIsNone(get_cached_archive_sha256({**self.test_config, 'firmware_file_url': 'https://mirror.example.com/firmware/geist-i03-6_3_0-12122024.zip'}))
+
+    def test_get_cached_firmware_file_path_skips_hashing_unchanged_files(self):
+        firmware_file_path: str = os.path.join(self.source_directory.name, 'geist-i03-6_3_0.firmware')
+        with open(firmware_file_path, 'wb') as firmware_file: firmware_file.write(b'firmware 6.3.0')
+        cached_firmware_file_path: str | None = cache_firmware_files(self.test_config, firmware_file_path = firmware_file_path)
+        with mock.patch('utils.firmware_cache_utils.hash_file', wraps = hash_file) as mock_hash_file:
+            self.assertEqual(get_cached_firmware_file_path(self.test_config), cached_firmware_file_path)
+            mock_hash_file.assert_not_called()
+            os.utime(cached_firmware_file_path, ns = (0, 0)) #type: ignore[arg-type]
+            self.assertEqual(get_cached_firmware_file_path(self.test_config), cached_firmware_file_path)
+            self.assertEqual(mock_hash_file.call_count, 1)
+            self.assertEqual(get_cached_firmware_file_path(self.test_config), cached_firmware_file_path)
+            self.assertEqual(mock_hash_file.call_count, 1)
+
+    def test_get_cached_firmware_file_path_rejects_corrupted_files(self):
+        firmware_file_path: str = os.path.join(self.source_directory.name, 'geist-i03-6_3_0.firmware')
+        with open(firmware_file_path, 'wb') as firmware_file: firmware_file.write(b'firmware 6.3.0')
+        cached_firmware_file_path: str | None = cache_firmware_files(self.test_config, firmware_file_path = firmware_file_path)
+        with open(cached_firmware_file_path, 'r+b') as cached_firmware_file: cached_firmware_file.write(b'F') #type: ignore[arg-type]
+        os.utime(cached_firmware_file_path, ns = (0, 0)) #type: ignore[arg-type]
+        self.assertIsNone(get_cached_firmware_file_path(self.test_config))
+
+    def test_get_cached_firmware_file_path_re_extracts_from_the_cached_archive(self):
+        archive_file_path: str = create_firmware_archive(self.source_directory.name, 'geist-i03-6_3_0-12122024.zip', b'firmware 6.3.0')
+        cached_firmware_file_path: str | None = cache_firmware_files(self.test_config, archive_file_path = archive_file_path)
+        os.remove(cached_firmware_file_path) #type: ignore[arg-type]
+        self.assertEqual(get_cached_firmware_file_path(self.test_config), cached_firmware_file_path)
+        self.assertTrue(os.path.isfile(cached_firmware_file_path)) #type: ignore[arg-type]
+
+    def test_get_cached_firmware_file_path_matches_other_urls_by_version_and_model(self):
+        firmware_file_path: str = os.path.join(self.source_directory.name, 'geist-i03-6_3_0.firmware')
+        with open(firmware_file_path, 'wb') as firmware_file: firmware_file.write(b'firmware 6.3.0')
+        cached_firmware_file_path: str | None = cache_firmware_files(self.test_config, firmware_file_path = firmware_file_path)
+        mirror_firmware_url: str = 'https://mirror.example.com/firmware/geist-i03-6_3_0-12122024.zip'
+        mirror_config: dict = {**self.test_config, 'firmware_file_url': mirror_firmware_url, 'parsed_firmware_url': parse_firmware_url({}, mirror_firmware_url)}
+        self.assertEqual(get_cached_firmware_file_path(mirror_config), cached_firmware_file_path)
+        self.assertIsNone(get_cached_firmware_file_path({**mirror_config, 'firmware_target': '6.2.0'}))
+
+    @mock.patch('utils.firmware_utils.confirm')
+    def test_get_firmware_file_path_reuses_cached_firmware_without_prompting(self, mock_confirm):
+        archive_file_path: str = create_firmware_archive(self.source_directory.name, 'geist-i03-6_3_0-12122024.zip', b'firmware 6.3.0')
+        cached_firmware_file_path: str | None = cache_firmware_files(self.test_config, archive_file_path = archive_file_path)
+        self.assertEqual(get_firmware_file_path(self.test_config), (cached_firmware_file_path, 'geist-i03-6_3_0.firmware'))
+        mock_confirm.assert_not_called()
+
+    @mock.patch('utils.firmware_utils.confirm', return_value = False)
+    def test_get_firmware_file_path_returns_false_when_the_download_is_declined(self, mock_confirm):
+        with mock.patch('utils.firmware_utils.sys.argv', [self.source_directory.name]):
+            self.assertEqual(get_firmware_file_path(self.test_config), (False, False))
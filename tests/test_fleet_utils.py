@@ -0,0 +1,78 @@
+import time
+
+from unittest import mock, TestCase
+
+from utils.fleet_utils import default_fleet_concurrency, get_fleet_concurrency, get_imd_config, run_fleet
+
+test_ordered_api_calls: list[dict] = [{
+    'config_item': 'credentials',
+    'config_item_name': 'Username and Password',
+    'api_calls': [{
+        'cmd': 'add',
+        'method': 'post',
+        'api_path': 'auth',
+        'data': "{'username': 'test_username', 'password': 'test_password'}"
+    }]
+}]
+
+class TestGetImdConfig(TestCase):
+
+    def test_get_imd_config_sets_imd_urls(self):
+        imd_config: dict = get_imd_config({'current_imd_ip': '192.168.123.123'}, '10.0.0.5')
+        self.assertEqual(imd_config['current_imd_ip'], '10.0.0.5')
+        self.assertEqual(imd_config['api_base_url'], 'https://10.0.0.5/api/')
+        self.assertEqual(imd_config['imd_base_url'], 'https://10.0.0.5')
+
+    def test_get_imd_config_is_unattended_copy(self):
+        test_config: dict = {'current_imd_ip': '192.168.123.123'}
+        imd_config: dict = get_imd_config(test_config, '10.0.0.5')
+        self.assertTrue(imd_config['unattended'])
+        self.assertEqual(test_config['current_imd_ip'], '192.168.123.123')
+
+class TestGetFleetConcurrency(TestCase):
+
+    def test_get_fleet_concurrency_prefers_the_command_line(self):
+        self.assertEqual(get_fleet_concurrency({'default_fleet_concurrency': 4}, mock.Mock(concurrency = 2)), 2)
+        self.assertEqual(get_fleet_concurrency({'default_fleet_concurrency': 4}, mock.Mock(concurrency = None)), 4)
+
+    def test_get_fleet_concurrency_falls_back_without_a_configured_default(self):
+        self.assertEqual(get_fleet_concurrency({}, mock.Mock(concurrency = None)), default_fleet_concurrency)
+
+class TestRunFleet(TestCase):
+
+    @staticmethod
+    def slow_apply_all_api_calls(config: dict, ordered_api_calls: list[dict], quiet: bool = False, deadline: float | None = None) -> bool:
+        time.sleep(0.3 if config['current_imd_ip'] == '10.0.0.1' else 0.1)
+        return config['current_imd_ip'] != '10.0.0.3'
+
+    @mock.patch('utils.fleet_utils.apply_all_api_calls', side_effect = slow_apply_all_api_calls)
+    def test_run_fleet_configures_imds_concurrently(self, mock_apply_all_api_calls):
+        fleet_api_calls: dict = { f'10.0.0.{index}': test_ordered_api_calls for index in range(1, 5) }
+        start_time: float = time.monotonic()
+        fleet_results: list[dict] = run_fleet({}, fleet_api_calls, concurrency = 4, quiet = True)
+        self.assertLess(time.monotonic() - start_time, 0.6)
+        self.assertEqual(len(fleet_results), 4)
+
+    @mock.patch('utils.fleet_utils.apply_all_api_calls', side_effect = slow_apply_all_api_calls)
+    def test_run_fleet_returns_results_as_imds_finish(self, mock_apply_all_api_calls):
+        fleet_api_calls: dict = { f'10.0.0.{index}': test_ordered_api_calls for index in range(1, 4) }
+        fleet_results: list[dict] = run_fleet({}, fleet_api_calls, concurrency = 3, quiet = True)
+        self.assertEqual(fleet_results[-1]['imd_ip'], '10.0.0.1')
+
+    @mock.patch('utils.fleet_utils.apply_all_api_calls', side_effect = slow_apply_all_api_calls)
+    def test_run_fleet_reports_failed_imds(self, mock_apply_all_api_calls):
+        fleet_api_calls: dict = { '10.0.0.3': test_ordered_api_calls }
+        fleet_results: list[dict] = run_fleet({}, fleet_api_calls, concurrency = 1, quiet = True)
+        self.assertFalse(fleet_results[0]['succeeded'])
+
+    @mock.patch('utils.fleet_utils.apply_all_api_calls', side_effect = slow_apply_all_api_calls)
+    def test_run_fleet_passes_imd_credentials(self, mock_apply_all_api_calls):
+        run_fleet({}, { '10.0.0.2': test_ordered_api_calls }, concurrency = 1, quiet = True)
+        imd_config: dict = mock_apply_all_api_calls.call_args.args[0]
+        self.assertEqual((imd_config['username'], imd_config['password']), ('test_username', 'test_password'))
+
+    @mock.patch('utils.fleet_utils.apply_all_api_calls', side_effect = slow_apply_all_api_calls)
+    def test_run_fleet_passes_imd_deadline(self, mock_apply_all_api_calls):
+        start_time: float = time.monotonic()
+        run_fleet({'imd_deadline': 60}, { '10.0.0.2': test_ordered_api_calls }, concurrency = 1, quiet = True)
+        self.assertAlmostEqual(mock_apply_all_api_calls.call_args.kwargs['deadline'], start_time + 60, delta = 1)
@@ -0,0 +1,99 @@
+import os, requests, tempfile
+
+from unittest import mock, TestCase
+
+from utils.metrics_utils import active_metrics_export, increment_counter, observe_duration, observe_histogram, record_api_call_metrics, render_metrics, reset_metrics, start_metrics_export, stop_metrics_export, write_metrics_textfile
+from utils.firmware_utils import upgrade_imd_firmware
+from utils.network_utils import host_pings
+
+class TestRenderMetrics(TestCase):
+
+    def setUp(self):
+        reset_metrics()
+
+    def tearDown(self):
+        stop_metrics_export()
+        reset_metrics()
+
+    def test_render_metrics_formats_counters(self):
+        increment_counter('vg_imd_configurations_total', {'outcome': 'succeeded'})
+        increment_counter('vg_imd_configurations_total', {'outcome': 'succeeded'})
+        rendered_metrics: str = render_metrics()
+        self.assertIn('# TYPE vg_imd_configurations_total counter', rendered_metrics)
+        self.assertIn('vg_imd_configurations_total{outcome="succeeded"} 2', rendered_metrics)
+
+    def test_render_metrics_formats_cumulative_histogram_buckets(self):
+        for value in [0.003, 0.2, 700]:
+            observe_histogram('vg_imd_probe_seconds', value, {'method': 'tcp', 'result': 'up'})
+        rendered_metrics: str = render_metrics()
+        self.assertIn('vg_imd_probe_seconds_bucket{method="tcp",result="up",le="0.005"} 1', rendered_metrics)
+        self.assertIn('vg_imd_probe_seconds_bucket{method="tcp",result="up",le="0.25"} 2', rendered_metrics)
+        self.assertIn('vg_imd_probe_seconds_bucket{method="tcp",result="up",le="+Inf"} 3', rendered_metrics)
+        self.assertIn('vg_imd_probe_seconds_count{method="tcp",result="up"} 3', rendered_metrics)
+
+    def test_render_metrics_skips_unused_metrics(self):
+        self.assertEqual(render_metrics(), '\n')
+
+    def test_record_api_call_metrics_counts_retries_by_response_code(self):
+        record_api_call_metrics('https://10.0.0.1/api/conf/system', {'succeeded': True, 'attempts': [
+            {'ret_code': 5002, 'network_seconds': 0.1},
+            {'ret_code': None, 'network_seconds': 1},
+            {'ret_code': 0, 'network_seconds': 0.1}
+        ]})
+        rendered_metrics: str = render_metrics()
+        self.assertIn('vg_imd_api_call_retries_total{api_path="conf/system",ret_code="5002"} 1', rendered_metrics)
+        self.assertIn('vg_imd_api_call_retries_total{api_path="conf/system",ret_code="transport"} 1', rendered_metrics)
+        self.assertIn('vg_imd_api_calls_total{api_path="conf/system",outcome="succeeded"} 1', rendered_metrics)
+        self.assertIn('vg_imd_api_call_attempt_seconds_count{api_path="conf/system"} 3', rendered_metrics)
+
+    def test_observe_duration_marks_exceptions_as_failed(self):
+        with self.assertRaises(ValueError):
+            with observe_duration('vg_imd_firmware_upload_seconds', outcome = 'succeeded'):
+                raise ValueError('upload failed')
+        self.assertIn('vg_imd_firmware_upload_seconds_count{outcome="failed"} 1', render_metrics())
+
+    @mock.patch('utils.firmware_utils.confirm', return_value = False)
+    @mock.patch('utils.firmware_utils.read_firmware_version', return_value = '6.1.0')
+    def test_firmware_upload_outcome_follows_the_upload_result(self, mock_read_firmware_version, mock_confirm):
+        rejected_response: mock.Mock = mock.Mock(json = mock.Mock(return_value = {'retCode': 1001, 'retMsg': 'Authorization failure'}))
+        with tempfile.NamedTemporaryFile(suffix = '.firmware') as firmware_file, \
+            mock.patch('utils.firmware_utils.get_imd_session', return_value = mock.Mock(post = mock.Mock(return_value = rejected_response))):
+            upgrade_imd_firmware({'current_imd_ip': '10.0.0.1'}, '6.3.0', firmware_file.name, 'token', quiet = True)
+        with tempfile.NamedTemporaryFile(suffix = '.firmware') as firmware_file, \
+            mock.patch('utils.firmware_utils.get_imd_session', return_value = mock.Mock(post = mock.Mock(side_effect = requests.exceptions.ConnectionError('reset')))):
+            upgrade_imd_firmware({'current_imd_ip': '10.0.0.1'}, '6.3.0', firmware_file.name, 'token', quiet = True)
+        rendered_metrics: str = render_metrics()
+        self.assertIn('vg_imd_firmware_upload_seconds_count{outcome="failed"} 2', rendered_metrics)
+        self.assertNotIn('outcome="succeeded"', rendered_metrics)
+        self.assertNotIn('vg_imd_firmware_upload_bytes_total', rendered_metrics)
+
+    def test_host_pings_records_probe_latency(self):
+        with mock.patch('utils.network_utils.probe_host', side_effect = [False, True]), mock.patch('utils.network_utils.time.sleep'):
+            self.assertTrue(host_pings({'readiness_probe': {'method': 'tcp'}}, '10.0.0.1', 3, quiet = True))
+        rendered_metrics: str = render_metrics()
+        self.assertIn('vg_imd_probe_seconds_count{method="tcp",result="down"} 1', rendered_metrics)
+        self.assertIn('vg_imd_probe_seconds_count{method="tcp",result="up"} 1', rendered_metrics)
+
+    def test_write_metrics_textfile_replaces_file(self):
+        increment_counter('vg_imd_configurations_total', {'outcome': 'failed'})
+        with tempfile.TemporaryDirectory() as metrics_directory:
+            metrics_file_path: str = os.path.join(metrics_directory, 'vg_imd.prom')
+            write_metrics_textfile(metrics_file_path)
+            with open(metrics_file_path, 'r') as metrics_file:
+                self.assertIn('vg_imd_configurations_total{outcome="failed"} 1', metrics_file.read())
+            self.assertEqual(os.listdir(metrics_directory), ['vg_imd.prom'])
+
+    def test_metrics_export_serves_metrics_over_http_and_textfile(self):
+        increment_counter('vg_imd_configurations_total', {'outcome': 'succeeded'})
+        with tempfile.TemporaryDirectory() as metrics_directory:
+            metrics_file_path: str = os.path.join(metrics_directory, 'vg_imd.prom')
+            start_metrics_export({'metrics': {'textfile_interval': 60}}, 0, metrics_file_path)
+            metrics_port: int = active_metrics_export['server'].server_address[1]
+            metrics_response = requests.get(f'http://127.0.0.1:{metrics_port}/metrics', timeout = 5)
+            self.assertEqual(metrics_response.status_code, 200)
+            self.assertIn('vg_imd_configurations_total{outcome="succeeded"} 1', metrics_response.text)
+            self.assertEqual(requests.get(f'http://127.0.0.1:{metrics_port}/other', timeout = 5).status_code, 404)
+            increment_counter('vg_imd_configurations_total', {'outcome': 'succeeded'})
+            stop_metrics_export()
+            with open(metrics_file_path, 'r') as metrics_file:
+                self.assertIn('vg_imd_configurations_total{outcome="succeeded"} 2', metrics_file.read())
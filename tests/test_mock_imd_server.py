@@ -0,0 +1,138 @@
+import os, tempfile, time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from unittest import mock, TestCase
+
+from tests.mock_imd_server import get_mock_imd_config, start_mock_imd, start_mock_imds, stop_mock_imd
+from utils.api_utils import apply_all_api_calls, apply_api_call, forget_imd_state, get_admin_status, get_imd_resource, get_imd_token, reset_imd_to_factory_defaults, set_imd_creds
+from utils.auth_utils import cache_token
+from utils.eta_utils import estimate_reboot_seconds
+from utils.firmware_utils import get_firmware_version, upgrade_imd_firmware
+
+test_ordered_api_calls: list[dict] = [
+    {'config_item': 'credentials', 'config_item_name': 'Credentials', 'barrier': True, 'api_calls': [{'cmd': 'add', 'method': 'post', 'api_path': 'auth', 'data': {'username': 'admin', 'password': 'password', 'enabled': 'true', 'control': 'true', 'admin': 'true'}}]},
+    {'config_item': 'label', 'config_item_name': 'Hostname Label', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/system', 'data': {'label': 'ab-01-ps-a1', 'hostname': 'ab-01-ps-a1'}}]},
+    {'config_item': 'ssh', 'config_item_name': 'SSH', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/ssh', 'data': {'enabled': 'false'}}]},
+    {'config_item': 'dns_0', 'config_item_name': 'DNS 0', 'api_calls': [{'cmd': 'delete', 'method': 'post', 'api_path': 'conf/network/ethernet/dns/0'}]}
+]
+
+class TestMockImdServer(TestCase):
+
+    def setUp(self):
+        self.mock_imd: dict = start_mock_imd(reboot_seconds = 0.3)
+        self.test_config: dict = get_mock_imd_config(self.mock_imd)
+
+    def tearDown(self):
+        forget_imd_state(self.test_config)
+        stop_mock_imd(self.mock_imd)
+
+    def test_mock_imd_creates_admin_and_issues_tokens(self):
+        self.assertFalse(get_admin_status(self.test_config))
+        set_imd_creds(self.test_config)
+        self.assertTrue(bool(get_imd_token(self.test_config)))
+        self.assertEqual(self.mock_imd['state']['users'], {'admin': 'password'})
+
+    def test_rejected_credentials_are_not_retried(self):
+        with mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'password')):
+            set_imd_creds(self.test_config)
+        with mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'wrong-password')):
+            self.assertFalse(reset_imd_to_factory_defaults({**self.test_config, 'api_attempts': 5}, quiet = True))
+        self.assertEqual(len([ imd_request for imd_request in self.mock_imd['state']['requests'] if imd_request['path'] == '/api/sys/' ]), 1)
+
+    @mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'password'))
+    def test_apply_all_api_calls_configures_mock_imd(self, mock_get_credentials):
+        self.assertTrue(apply_all_api_calls(self.test_config, test_ordered_api_calls, quiet = True))
+        self.assertEqual(self.mock_imd['state']['conf']['conf/system']['label'], 'ab-01-ps-a1')
+        self.assertNotIn('conf/network/ethernet/dns/0', self.mock_imd['state']['conf'])
+        self.assertEqual(get_imd_resource(self.test_config, 'conf/ssh')['data'], {'enabled': 'false'}) #type: ignore[index]
+
+    @mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'password'))
+    def test_apply_all_api_calls_retries_injected_codes(self, mock_get_credentials):
+        self.mock_imd['state']['injected_codes'] = [5002, 5002, 5002]
+        self.assertTrue(apply_all_api_calls({**self.test_config, 'imd_concurrency': 1}, test_ordered_api_calls, quiet = True))
+
+    def get_login_requests(self) -> list[dict]:
+        return [ imd_request for imd_request in self.mock_imd['state']['requests'] if imd_request['path'] == '/api/auth/admin' ]
+
+    @mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'password'))
+    def test_concurrent_token_misses_log_in_once(self, mock_get_credentials):
+        set_imd_creds(self.test_config)
+        self.mock_imd['state']['latency'] = 0.05
+        with ThreadPoolExecutor(max_workers = 8) as executor:
+            tokens: list[str | bool] = list(executor.map(lambda _: get_imd_token(self.test_config), range(8)))
+        self.assertTrue(bool(tokens[0]))
+        self.assertEqual(set(tokens), {tokens[0]})
+        self.assertEqual(len(self.get_login_requests()), 1)
+
+    @mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'password'))
+    def test_concurrent_rejected_tokens_are_refreshed_once(self, mock_get_credentials):
+        set_imd_creds(self.test_config)
+        cache_token(self.test_config, 'expired-token')
+        self.mock_imd['state']['latency'] = 0.05
+        api_calls: list[dict] = [ {'cmd': 'set', 'method': 'post', 'api_path': api_path, 'data': {'enabled': 'false'}} for api_path in ['conf/ssh', 'conf/usb', 'conf/snmp', 'conf/http'] ]
+        with ThreadPoolExecutor(max_workers = len(api_calls)) as executor:
+            results: list[bool] = list(executor.map(lambda api_call: apply_api_call(self.test_config, api_call['api_path'], api_call, 0, True), api_calls))
+        self.assertTrue(all(results))
+        self.assertEqual(len(self.get_login_requests()), 1)
+
+    def test_mock_imd_reports_firmware_version(self):
+        self.assertEqual(get_firmware_version(self.test_config, quiet = True), '6.1.0')
+
+    @mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'password'))
+    def test_mock_imd_reboots_after_firmware_upload(self, mock_get_credentials):
+        token: str | bool = get_imd_token(self.test_config)
+        with tempfile.TemporaryDirectory() as firmware_directory:
+            firmware_file_path: str = os.path.join(firmware_directory, 'geist-i03-6_3_0.firmware')
+            with open(firmware_file_path, 'wb') as firmware_file: firmware_file.write(bytes(1024))
+            start_time: float = time.monotonic()
+            self.assertTrue(upgrade_imd_firmware(self.test_config, '6.3.0', firmware_file_path, token, quiet = True))
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.3)
+        self.assertEqual(get_firmware_version(self.test_config, quiet = True), '6.3.0')
+
+    @mock.patch('utils.firmware_utils.confirm', return_value = False)
+    @mock.patch('utils.firmware_utils.wait_for_imd_reboot_with_history')
+    def test_rejected_firmware_upload_does_not_wait_for_a_reboot(self, mock_wait_for_imd_reboot_with_history, mock_confirm):
+        with tempfile.TemporaryDirectory() as firmware_directory:
+            firmware_file_path: str = os.path.join(firmware_directory, 'geist-i03-6_3_0.firmware')
+            with open(firmware_file_path, 'wb') as firmware_file: firmware_file.write(bytes(1024))
+            upgrade_imd_firmware(self.test_config, '6.3.0', firmware_file_path, 'invalid-token', quiet = True)
+        mock_wait_for_imd_reboot_with_history.assert_not_called()
+        self.assertEqual(get_firmware_version(self.test_config, quiet = True), '6.1.0')
+
+    @mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'password'))
+    def test_mock_imd_resets_to_factory_defaults(self, mock_get_credentials):
+        set_imd_creds(self.test_config)
+        reset_imd_to_factory_defaults(self.test_config, quiet = True)
+        self.assertEqual(self.mock_imd['state']['users'], {})
+
+    @mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'password'))
+    def test_factory_reset_at_the_default_ip_waits_and_records_history(self, mock_get_credentials):
+        set_imd_creds(self.test_config)
+        with tempfile.TemporaryDirectory() as history_directory:
+            reset_config: dict = {**self.test_config, 'default_imd_ip': self.test_config['current_imd_ip'], 'reboot_history_path': os.path.join(history_directory, 'reboot_history.json')}
+            self.assertTrue(bool(reset_imd_to_factory_defaults(reset_config, quiet = True)))
+            self.assertEqual(estimate_reboot_seconds(reset_config, 'reset', '6.1.0', '6.1.0')['samples'], 1)
+
+    def test_rejected_factory_reset_is_not_waited_for_or_recorded(self):
+        with mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'password')):
+            set_imd_creds(self.test_config)
+        with tempfile.TemporaryDirectory() as history_directory, \
+            mock.patch('utils.api_utils.get_credentials', return_value = ('admin', 'wrong-password')), \
+            mock.patch('utils.api_utils.wait_for_imd_reboot_with_history') as mock_wait_for_imd_reboot_with_history:
+            reset_config: dict = {**self.test_config, 'default_imd_ip': self.test_config['current_imd_ip'], 'reboot_history_path': os.path.join(history_directory, 'reboot_history.json')}
+            self.assertFalse(reset_imd_to_factory_defaults(reset_config, quiet = True))
+            mock_wait_for_imd_reboot_with_history.assert_not_called()
+            self.assertFalse(os.path.exists(reset_config['reboot_history_path']))
+        self.assertEqual(self.mock_imd['state']['users'], {'admin': 'password'})
+
+class TestMockImds(TestCase):
+
+    def test_start_mock_imds_serves_each_imd_on_its_own_port(self):
+        mock_imds: list[dict] = start_mock_imds(3, firmware_version = '6.2.0')
+        try:
+            self.assertEqual(len({ mock_imd['port'] for mock_imd in mock_imds }), 3)
+            for mock_imd in mock_imds:
+                self.assertEqual(get_firmware_version(get_mock_imd_config(mock_imd), quiet = True), '6.2.0')
+        finally:
+            for mock_imd in mock_imds: stop_mock_imd(mock_imd)
@@ -1,18 +1,95 @@
-from unittest import TestCase
+import socket
 
-from utils.network_utils import host_pings, wait_for_ping
+from unittest import mock, TestCase
 
-class NotTestHostPings(TestCase):
+from utils.network_utils import host_pings, imd_is_alive, mark_imd_alive, mark_imd_unreachable, probe_hosts, split_imd_address, wait_for_imd, wait_for_ping
+
+def get_unused_port() -> int:
+    with socket.socket() as unused_socket:
+        unused_socket.bind(('localhost', 0))
+        return unused_socket.getsockname()[1]
+
+class ListeningHostTestCase(TestCase):
+
+    def setUp(self):
+        self.listening_socket: socket.socket = socket.create_server(('localhost', 0))
+        self.listening_address: str = f'localhost:{self.listening_socket.getsockname()[1]}'
+
+    def tearDown(self):
+        self.listening_socket.close()
+
+class NotTestHostPings(ListeningHostTestCase):
 
     def test_host_pings_returns_true_for_responsive_host(self):
-        self.assertTrue(host_pings({}, 'localhost'))
+        self.assertTrue(host_pings({}, self.listening_address))
 
     def test_host_pings_returns_false_for_unresponsive_host(self):
         self.assertFalse(host_pings({}, 'some_hostname_that_is_almost_certainly_not_real', 0))
 
+    def test_host_pings_returns_false_for_closed_port(self):
+        test_config: dict = { 'readiness_probe': { 'intervals': [0.01] } }
+        self.assertFalse(host_pings(test_config, f'localhost:{get_unused_port()}', 2, True))
+
 
-class TestWaitForPing(TestCase):
+class TestWaitForPing(ListeningHostTestCase):
 
     def test_wait_for_ping_returns_true_for_responsive_host(self):
-        test_config: dict = { 'current_imd_ip': 'localhost' }
+        test_config: dict = { 'current_imd_ip': self.listening_address }
         self.assertTrue(wait_for_ping(test_config, True))
+        mark_imd_unreachable(test_config)
+
+
+class TestSplitImdAddress(TestCase):
+
+    def test_split_imd_address_uses_default_port(self):
+        self.assertEqual(split_imd_address('192.168.123.123'), ('192.168.123.123', 443))
+
+    def test_split_imd_address_parses_port(self):
+        self.assertEqual(split_imd_address('127.0.0.1:8443'), ('127.0.0.1', 8443))
+
+    def test_split_imd_address_parses_ipv6(self):
+        self.assertEqual(split_imd_address('[::1]:8443'), ('::1', 8443))
+        self.assertEqual(split_imd_address('fe80::1'), ('fe80::1', 443))
+
+
+class TestProbeHosts(ListeningHostTestCase):
+
+    def test_probe_hosts_probes_many_addresses(self):
+        closed_address: str = f'localhost:{get_unused_port()}'
+        probe_results: dict = probe_hosts({}, [self.listening_address, closed_address])
+        self.assertEqual(probe_results, { self.listening_address: True, closed_address: False })
+
+
+class TestImdLiveness(TestCase):
+    test_config: dict = { 'current_imd_ip': 'liveness.test', 'liveness_ttl': 30 }
+
+    def tearDown(self):
+        mark_imd_unreachable(self.test_config)
+
+    def test_imd_is_alive_returns_false_for_unseen_imd(self):
+        self.assertFalse(imd_is_alive(self.test_config))
+
+    def test_imd_is_alive_returns_true_after_mark_imd_alive(self):
+        mark_imd_alive(self.test_config)
+        self.assertTrue(imd_is_alive(self.test_config))
+
+    def test_imd_is_alive_returns_false_after_mark_imd_unreachable(self):
+        mark_imd_alive(self.test_config)
+        mark_imd_unreachable(self.test_config)
+        self.assertFalse(imd_is_alive(self.test_config))
+
+    def test_imd_is_alive_expires_after_ttl(self):
+        mark_imd_alive(self.test_config)
+        self.assertFalse(imd_is_alive({ **self.test_config, 'liveness_ttl': 0.000001 }))
+
+    @mock.patch('utils.network_utils.host_pings', return_value = True)
+    def test_wait_for_imd_skips_probe_while_imd_is_alive(self, mock_host_pings):
+        mark_imd_alive(self.test_config)
+        self.assertTrue(wait_for_imd(self.test_config, True))
+        mock_host_pings.assert_not_called()
+
+    @mock.patch('utils.network_utils.host_pings', return_value = True)
+    def test_wait_for_imd_probes_stale_imd(self, mock_host_pings):
+        self.assertTrue(wait_for_imd(self.test_config, True))
+        mock_host_pings.assert_called_once()
+        self.assertTrue(imd_is_alive(self.test_config))
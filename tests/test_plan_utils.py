@@ -0,0 +1,69 @@
+from unittest import mock, TestCase
+
+from utils import plan_utils
+from utils.plan_utils import bind_execution_plan, compile_string_template, get_execution_plan
+
+test_prompts: dict = {
+    'formatters': [
+        {
+            'config_item': 'label',
+            'config_item_name': 'Hostname Label',
+            'format_functions': [['apply_string_template', "{{'label': '{imd_hostname}', 'hostname': '{imd_hostname}' }}"]],
+            'display_to_user': 1,
+            'value_to_display': '{imd_hostname}',
+            'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/system'}]
+        },
+        {
+            'config_item': 'location',
+            'config_item_name': 'Location',
+            'format_functions': [['apply_string_template', "{{'location': 'R{row}-{rack}', 'rackUnits': {rack}}}"]],
+            'barrier': True,
+            'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/contact'}]
+        }
+    ],
+    'defaults': [
+        {'config_item': 'ipv6', 'config_item_name': 'IPv6', 'api_calls': [{'method': 'post', 'api_path': 'conf/system', 'cmd': 'set', 'data': {'ip6Enabled': 'false'}}]}
+    ],
+    'api_call_sequence': ['label', 'ipv6', 'location']
+}
+
+test_config_items: list[dict] = [
+    {'config_item': 'imd_hostname', 'value': "o'brien-a1"},
+    {'config_item': 'row', 'value': '4'},
+    {'config_item': 'rack', 'value': '12'}
+]
+
+class TestCompileStringTemplate(TestCase):
+
+    def test_compile_string_template_keeps_fields_in_parsed_leaves(self):
+        self.assertEqual(compile_string_template({}, "{{'location': 'R{row}-{rack:0>2}', 'note': '{{literal}}'}}"), {'location': 'R{row}-{rack:0>2}', 'note': '{{literal}}'})
+
+class TestExecutionPlan(TestCase):
+
+    def test_get_execution_plan_compiles_once_per_prompts_content(self):
+        with mock.patch('utils.plan_utils.compile_execution_plan', wraps = plan_utils.compile_execution_plan) as mock_compile:
+            first_plan = get_execution_plan({}, {**test_prompts, 'api_call_sequence': ['ipv6', 'label']})
+            second_plan = get_execution_plan({}, {**test_prompts, 'api_call_sequence': ['ipv6', 'label']})
+        self.assertIs(first_plan, second_plan)
+        self.assertEqual(mock_compile.call_count, 1)
+
+    def test_execution_plan_is_immutable(self):
+        execution_plan = get_execution_plan({}, test_prompts)
+        with self.assertRaises(TypeError):
+            execution_plan['steps'][0]['api_calls'][0]['cmd'] = 'delete' #type: ignore[index]
+
+    def test_bind_execution_plan_binds_values_into_parsed_payloads(self):
+        ordered_api_calls: list[dict] = bind_execution_plan({}, get_execution_plan({}, test_prompts), test_config_items)
+        self.assertEqual([ ordered_api_call['config_item'] for ordered_api_call in ordered_api_calls ], ['label', 'ipv6', 'location'])
+        self.assertEqual(ordered_api_calls[0]['api_calls'][0]['data'], {'label': "o'brien-a1", 'hostname': "o'brien-a1"})
+        self.assertEqual(ordered_api_calls[0]['value_to_display'], "o'brien-a1")
+        self.assertTrue(ordered_api_calls[2]['barrier'])
+
+    def test_bind_execution_plan_falls_back_for_templates_that_are_not_json(self):
+        ordered_api_calls: list[dict] = bind_execution_plan({}, get_execution_plan({}, test_prompts), test_config_items)
+        self.assertEqual(ordered_api_calls[2]['api_calls'][0]['data'], {'location': 'R4-12', 'rackUnits': 12})
+
+    def test_bind_execution_plan_returns_independent_copies(self):
+        execution_plan = get_execution_plan({}, test_prompts)
+        bind_execution_plan({}, execution_plan, test_config_items)[1]['api_calls'][0]['data']['ip6Enabled'] = 'true'
+        self.assertEqual(bind_execution_plan({}, execution_plan, test_config_items)[1]['api_calls'][0]['data'], {'ip6Enabled': 'false'})
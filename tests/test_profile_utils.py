@@ -0,0 +1,64 @@
+import io, os, pstats, tempfile, time
+
+from contextlib import redirect_stdout
+
+from unittest import mock, TestCase
+
+from utils.profile_utils import exclude_from_profile, profiling_is_enabled, start_profiling, stop_profiling
+from utils.prompt_utils import confirm
+
+def busy_wait(seconds: float) -> None:
+    end_time: float = time.perf_counter() + seconds
+    while time.perf_counter() < end_time: pass
+
+def slow_operator(prompt: str) -> str:
+    time.sleep(0.3)
+    return 'y'
+
+class TestProfiling(TestCase):
+
+    def setUp(self):
+        self.profile_directory = tempfile.TemporaryDirectory()
+        self.profile_file_path: str = os.path.join(self.profile_directory.name, 'profiles', 'test.pstats')
+
+    def tearDown(self):
+        stop_profiling(quiet = True)
+        self.profile_directory.cleanup()
+
+    def get_cumulative_seconds(self, profile_stats: pstats.Stats, function_name: str) -> float:
+        return sum(stats[3] for (file_name, line_number, name), stats in profile_stats.stats.items() if name == function_name) #type: ignore[attr-defined]
+
+    def test_stop_profiling_without_start_does_nothing(self):
+        self.assertFalse(profiling_is_enabled())
+        self.assertIsNone(stop_profiling(quiet = True))
+
+    def test_stop_profiling_writes_pstats_file(self):
+        start_profiling(self.profile_file_path)
+        self.assertTrue(profiling_is_enabled())
+        busy_wait(0.05)
+        profile_stats: pstats.Stats | None = stop_profiling(quiet = True)
+        self.assertFalse(profiling_is_enabled())
+        self.assertGreaterEqual(self.get_cumulative_seconds(profile_stats, 'busy_wait'), 0.04) #type: ignore[arg-type]
+        self.assertGreaterEqual(self.get_cumulative_seconds(pstats.Stats(self.profile_file_path), 'busy_wait'), 0.04)
+
+    def test_time_waiting_for_user_input_is_excluded(self):
+        start_profiling(self.profile_file_path)
+        with mock.patch('utils.prompt_utils.input', slow_operator, create = True):
+            self.assertTrue(confirm({}, 'Continue? '))
+        profile_stats: pstats.Stats | None = stop_profiling(quiet = True)
+        self.assertLess(self.get_cumulative_seconds(profile_stats, 'slow_operator'), 0.05) #type: ignore[arg-type]
+        self.assertLess(self.get_cumulative_seconds(profile_stats, 'confirm'), 0.05) #type: ignore[arg-type]
+
+    def test_exclude_from_profile_does_nothing_when_profiling_is_disabled(self):
+        with exclude_from_profile():
+            busy_wait(0.001)
+        self.assertFalse(profiling_is_enabled())
+
+    def test_stop_profiling_prints_top_functions(self):
+        start_profiling(self.profile_file_path)
+        busy_wait(0.01)
+        printed_output: io.StringIO = io.StringIO()
+        with redirect_stdout(printed_output):
+            stop_profiling()
+        self.assertIn('busy_wait', printed_output.getvalue())
+        self.assertIn('waiting for user input excluded', printed_output.getvalue())
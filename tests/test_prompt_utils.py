@@ -180,4 +180,25 @@ class TestUpdateConfig(TestCase):
         for config_item in [ config_item for config_item in test_updates.keys() ]:
             utils.prompt_utils.update_config(test_config, config_item, test_updates[config_item])
 
-        self.assertDictEqual(test_config, test_updates)
\ No newline at end of file
+        self.assertDictEqual(test_config, test_updates)
+
+class TestGetUniqueConfigItemsFromValues(TestCase):
+    test_prompts: dict = {
+        'prompts': [
+            {'config_item': 'row', 'verify_functions': [['is_int']], 'format_functions': [['zfill', 2]], 'empty_allowed': False},
+            {'config_item': 'pdu_letter', 'verify_functions': [['is_one_of', ['a', 'b']]], 'format_functions': [['upper']], 'default_value': 'a', 'empty_allowed': False}
+        ]
+    }
+
+    def test_get_unique_config_items_from_values_formats_values(self):
+        unique_config_items = utils.prompt_utils.get_unique_config_items_from_values({}, self.test_prompts, {'row': 4, 'pdu_letter': 'b'}, quiet = True)
+        self.assertEqual(unique_config_items, [
+            {'config_item': 'row', 'value': '04', 'test': 0},
+            {'config_item': 'pdu_letter', 'value': 'B', 'test': 0}])
+
+    def test_get_unique_config_items_from_values_uses_defaults(self):
+        unique_config_items = utils.prompt_utils.get_unique_config_items_from_values({}, self.test_prompts, {'row': '7'}, quiet = True)
+        self.assertEqual(unique_config_items[1]['value'], 'A')
+
+    def test_get_unique_config_items_from_values_rejects_invalid_values(self):
+        self.assertFalse(utils.prompt_utils.get_unique_config_items_from_values({}, self.test_prompts, {'row': 'seven'}, quiet = True))
@@ -0,0 +1,81 @@
+import requests, threading, time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+from utils.rate_limit_utils import RateLimitedAdapter, acquire_request_slot, acquire_tokens, create_token_bucket, get_rate_limit_group, rate_limit_buckets, throttle_upload
+
+test_config: dict = {
+    'rate_limits': {
+        'groups': [{'cidr': '10.20.0.0/16', 'requests_per_second': 5, 'burst': 1, 'upload_bytes_per_second': 1000000}],
+        'default': {'prefix_length': 24, 'requests_per_second': 20, 'burst': 2, 'upload_bytes_per_second': 640 * 1024}
+    }
+}
+
+class UploadHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, format, *args):
+        pass
+
+class TestGetRateLimitGroup(TestCase):
+
+    def test_get_rate_limit_group_matches_configured_cidr(self):
+        self.assertEqual(get_rate_limit_group(test_config, '10.20.3.4')[0], '10.20.0.0/16')
+
+    def test_get_rate_limit_group_groups_other_addresses_by_prefix(self):
+        self.assertEqual(get_rate_limit_group(test_config, '192.168.123.123'), ('192.168.123.0/24', test_config['rate_limits']['default']))
+
+    def test_get_rate_limit_group_keys_hostnames_by_name(self):
+        self.assertEqual(get_rate_limit_group(test_config, 'imd.example.com')[0], 'imd.example.com')
+
+class TestTokenBucket(TestCase):
+
+    def test_acquire_tokens_allows_burst_then_waits(self):
+        token_bucket: dict = create_token_bucket(rate = 50, capacity = 2)
+        start_time: float = time.monotonic()
+        for _ in range(4): acquire_tokens(token_bucket, 1)
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.035)
+
+    def test_acquire_request_slot_is_unlimited_by_default(self):
+        rate_limit_buckets.clear()
+        self.assertEqual(sum(acquire_request_slot({}, '192.168.123.123') for _ in range(100)), 0)
+        self.assertEqual(rate_limit_buckets, {})
+
+    def test_throttle_upload_limits_bandwidth(self):
+        rate_limit_buckets.clear()
+        start_time: float = time.monotonic()
+        uploaded_bytes: bytes = b''.join(throttle_upload(test_config, '192.168.50.1', bytes(1280 * 1024)))
+        self.assertEqual(len(uploaded_bytes), 1280 * 1024)
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.9)
+
+class TestRateLimitedAdapter(TestCase):
+
+    def setUp(self):
+        rate_limit_buckets.clear()
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(('127.0.0.1', 0), UploadHandler)
+        threading.Thread(target = self.server.serve_forever, daemon = True).start()
+        self.session: requests.Session = requests.Session()
+        self.session.mount('http://', RateLimitedAdapter(test_config))
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_rate_limited_adapter_limits_requests_per_second(self):
+        url: str = f'http://127.0.0.1:{self.server.server_port}/api/conf/system'
+        start_time: float = time.monotonic()
+        for _ in range(4): self.session.post(url, json = {})
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.09)
+
+    def test_rate_limited_adapter_streams_throttled_uploads(self):
+        url: str = f'http://127.0.0.1:{self.server.server_port}/transfer/firmware'
+        response = self.session.post(url, files = {'firmware_file': bytes(1024 * 1024)})
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,78 @@
+import threading, time
+
+from unittest import TestCase
+
+from tests.mock_imd_server import get_mock_imd_config, reboot_mock_imd, start_mock_imd, stop_mock_imd
+from utils.api_utils import forget_imd_state
+from utils.reboot_utils import get_probe_interval, reboot_phases, wait_for_imd_reboot
+
+class TestGetProbeInterval(TestCase):
+    reboot_wait: dict = {'min_interval': 0.5, 'max_interval': 10}
+
+    def test_get_probe_interval_is_short_near_the_expected_time(self):
+        self.assertEqual(get_probe_interval(self.reboot_wait, 89, 90), 0.5)
+        self.assertEqual(get_probe_interval(self.reboot_wait, 92, 90), 0.5)
+
+    def test_get_probe_interval_is_long_far_from_the_expected_time(self):
+        self.assertEqual(get_probe_interval(self.reboot_wait, 0, 90), 10)
+        self.assertEqual(get_probe_interval(self.reboot_wait, 70, 90), 5)
+        self.assertEqual(get_probe_interval(self.reboot_wait, 110, 90), 5)
+
+class TestWaitForImdReboot(TestCase):
+
+    def setUp(self):
+        self.mock_imd: dict = start_mock_imd(reboot_seconds = 0.3)
+        self.test_config: dict = get_mock_imd_config(self.mock_imd)
+
+    def tearDown(self):
+        forget_imd_state(self.test_config)
+        stop_mock_imd(self.mock_imd)
+
+    def test_wait_for_imd_reboot_walks_every_phase(self):
+        self.mock_imd['state']['pending_firmware_version'] = '6.3.0'
+        reboot_mock_imd(self.mock_imd)
+        reboot_result: dict = wait_for_imd_reboot(self.test_config, '6.3.0')
+        self.assertTrue(reboot_result['succeeded'])
+        self.assertEqual(reboot_result['firmware_version'], '6.3.0')
+        self.assertEqual(list(reboot_result['phase_seconds'].keys()), reboot_phases[1:])
+        self.assertGreaterEqual(reboot_result['elapsed_seconds'], 0.3)
+        self.assertLess(reboot_result['elapsed_seconds'], 2)
+
+    def test_wait_for_imd_reboot_gives_up_after_the_hard_timeout(self):
+        reboot_mock_imd(self.mock_imd)
+        time.sleep(0.1)
+        stop_mock_imd(self.mock_imd)
+        reboot_result: dict = wait_for_imd_reboot({**self.test_config, 'reboot_wait': {**self.test_config['reboot_wait'], 'timeout': 0.5}}, '6.3.0')
+        self.assertFalse(reboot_result['succeeded'])
+        self.assertEqual(reboot_result['phase'], 'went_down')
+        self.assertIn('not back within 0.5 s', reboot_result['error'])
+        self.assertLess(reboot_result['elapsed_seconds'], 1)
+
+    def test_wait_for_imd_reboot_reports_unexpected_firmware_version(self):
+        reboot_mock_imd(self.mock_imd)
+        reboot_result: dict = wait_for_imd_reboot({**self.test_config, 'reboot_wait': {**self.test_config['reboot_wait'], 'version_timeout': 0.2}}, '6.3.0')
+        self.assertFalse(reboot_result['succeeded'])
+        self.assertEqual(reboot_result['phase'], 'api_up')
+        self.assertIn('firmware 6.1.0 instead of 6.3.0', reboot_result['error'])
+
+    def test_wait_for_imd_reboot_fails_when_the_imd_never_goes_down(self):
+        reboot_result: dict = wait_for_imd_reboot({**self.test_config, 'reboot_wait': {**self.test_config['reboot_wait'], 'went_down_timeout': 0.3}})
+        self.assertFalse(reboot_result['succeeded'])
+        self.assertEqual(reboot_result['phase'], 'uploaded')
+        self.assertEqual(reboot_result['phase_seconds'], {})
+        self.assertIn('never went down within 0.3 s', reboot_result['error'])
+        self.assertLess(reboot_result['elapsed_seconds'], 1)
+
+    def test_wait_for_imd_reboot_confirms_a_slow_flash_that_never_goes_down(self):
+        threading.Timer(0.5, lambda: self.mock_imd['state'].update(firmware_version = '6.3.0')).start()
+        reboot_result: dict = wait_for_imd_reboot({**self.test_config, 'reboot_wait': {**self.test_config['reboot_wait'], 'went_down_timeout': 0.2}}, '6.3.0')
+        self.assertTrue(reboot_result['succeeded'])
+        self.assertEqual(reboot_result['firmware_version'], '6.3.0')
+        self.assertGreaterEqual(reboot_result['elapsed_seconds'], 0.5)
+
+    def test_wait_for_imd_reboot_gives_up_on_a_flash_that_never_confirms(self):
+        reboot_result: dict = wait_for_imd_reboot({**self.test_config, 'reboot_wait': {**self.test_config['reboot_wait'], 'went_down_timeout': 0.2, 'timeout': 0.6}}, '6.3.0')
+        self.assertFalse(reboot_result['succeeded'])
+        self.assertEqual(reboot_result['phase'], 'uploaded')
+        self.assertEqual(reboot_result['firmware_version'], '6.1.0')
+        self.assertIn('not back within 0.6 s', reboot_result['error'])
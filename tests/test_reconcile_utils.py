@@ -0,0 +1,62 @@
+from unittest import mock, TestCase
+
+from utils.reconcile_utils import get_reconciled_api_calls, get_reconciled_api_paths, reconcile_api_calls, values_match
+
+test_ordered_api_calls: list[dict] = [
+    {'config_item': 'credentials', 'config_item_name': 'Username and Password', 'api_calls': [{'cmd': 'add', 'method': 'post', 'api_path': 'auth', 'data': "{'username': 'test_username', 'password': 'test_password'}"}]},
+    {'config_item': 'label', 'config_item_name': 'Hostname Label', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/system', 'data': "{'label': 'test_hostname', 'hostname': 'test_hostname' }"}]},
+    {'config_item': 'ipv6', 'config_item_name': 'IPv6', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/system', 'data': {'ip6Enabled': 'false'}}]},
+    {'config_item': 'stp', 'config_item_name': 'STP', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/network/ethernet/stp', 'data': {'enabled': 'false', 'maxHops': 40}}]},
+    {'config_item': 'dns_0', 'config_item_name': 'DNS 0', 'api_calls': [{'cmd': 'delete', 'method': 'post', 'api_path': 'conf/network/ethernet/dns/0'}]},
+    {'config_item': 'static_ip', 'config_item_name': 'Static IP', 'api_calls': [{'cmd': 'delete', 'method': 'post', 'api_path': 'conf/network/ethernet/address/0'}]}
+]
+
+test_imd_resources: dict = {
+    'conf/system': {'retCode': 0, 'retMsg': '', 'data': {'label': 'test_hostname', 'hostname': 'test_hostname', 'ip6Enabled': False}},
+    'conf/network/ethernet/stp': {'retCode': 0, 'retMsg': '', 'data': {'enabled': True, 'maxHops': 40}},
+    'conf/network/ethernet/dns/0': {'retCode': 3001, 'retMsg': 'Not found'},
+    'conf/network/ethernet/address/0': {'retCode': 0, 'retMsg': '', 'data': {'address': '192.168.123.123'}}
+}
+
+class TestValuesMatch(TestCase):
+
+    def test_values_match_ignores_type_and_case_of_scalars(self):
+        self.assertTrue(values_match('false', False))
+        self.assertTrue(values_match(24576, '24576'))
+
+    def test_values_match_compares_desired_keys_only(self):
+        self.assertTrue(values_match({'enabled': 'false'}, {'enabled': False, 'port': 22}))
+        self.assertFalse(values_match({'enabled': 'false', 'port': 23}, {'enabled': False, 'port': 22}))
+        self.assertFalse(values_match({'enabled': 'false'}, {}))
+
+class TestGetReconciledApiPaths(TestCase):
+
+    def test_get_reconciled_api_paths_skips_add_commands(self):
+        self.assertNotIn('auth', get_reconciled_api_paths(test_ordered_api_calls))
+
+class TestGetReconciledApiCalls(TestCase):
+
+    @mock.patch('utils.reconcile_utils.get_admin_status', return_value = False)
+    def test_get_reconciled_api_calls_skips_matching_calls(self, mock_get_admin_status):
+        reconciled_api_calls: list[dict] = get_reconciled_api_calls({}, test_ordered_api_calls, test_imd_resources)
+        self.assertEqual([ api_call['config_item'] for api_call in reconciled_api_calls ], ['credentials', 'stp', 'static_ip'])
+
+    @mock.patch('utils.reconcile_utils.get_admin_status', return_value = True)
+    @mock.patch('utils.reconcile_utils.get_imd_token', return_value = 'test_token')
+    def test_get_reconciled_api_calls_skips_working_credentials(self, mock_get_imd_token, mock_get_admin_status):
+        reconciled_api_calls: list[dict] = get_reconciled_api_calls({}, test_ordered_api_calls[:1], {})
+        self.assertEqual(reconciled_api_calls, [])
+
+    @mock.patch('utils.reconcile_utils.get_admin_status', return_value = False)
+    def test_get_reconciled_api_calls_keeps_calls_for_unreadable_resources(self, mock_get_admin_status):
+        reconciled_api_calls: list[dict] = get_reconciled_api_calls({}, test_ordered_api_calls, {})
+        self.assertEqual(len(reconciled_api_calls), len(test_ordered_api_calls))
+
+class TestReconcileApiCalls(TestCase):
+
+    @mock.patch('utils.reconcile_utils.get_admin_status', return_value = True)
+    @mock.patch('utils.reconcile_utils.get_imd_token', return_value = 'test_token')
+    @mock.patch('utils.reconcile_utils.get_imd_resources', return_value = {**test_imd_resources, 'conf/network/ethernet/stp': {'retCode': 0, 'data': {'enabled': 'false', 'maxHops': 40}}, 'conf/network/ethernet/address/0': {'retCode': 3001}})
+    def test_reconcile_api_calls_returns_no_calls_for_configured_imd(self, mock_get_imd_resources, mock_get_imd_token, mock_get_admin_status):
+        self.assertEqual(reconcile_api_calls({}, test_ordered_api_calls, quiet = True), [])
+        mock_get_imd_resources.assert_called_once()
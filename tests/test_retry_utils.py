@@ -0,0 +1,95 @@
+import requests, time
+
+from unittest import mock, TestCase
+
+from utils.retry_utils import clear_attempt_history, get_attempt_history, get_retry_delay, get_retry_policy, is_treated_as_success, send_with_retries
+
+test_config: dict = {
+    'current_imd_ip': 'retry.test',
+    'retry_policies': {
+        'default':   {'retry': True, 'base_delay': 0.001, 'multiplier': 2, 'max_delay': 0.004, 'jitter': 0},
+        'transport': {'retry': True, 'base_delay': 0.001, 'multiplier': 2, 'max_delay': 0.004, 'jitter': 0},
+        '2001':      {'retry': False}
+    }
+}
+
+class TestGetRetryPolicy(TestCase):
+
+    def test_get_retry_policy_merges_code_policy_over_default(self):
+        retry_policy: dict = get_retry_policy(test_config, 2001)
+        self.assertFalse(retry_policy['retry'])
+        self.assertEqual(retry_policy['base_delay'], 0.001)
+
+    def test_get_retry_policy_falls_back_to_built_in_policies(self):
+        self.assertEqual(get_retry_policy({}, 3001)['treat_as_success'], ['delete'])
+        self.assertTrue(get_retry_policy({}, 9999)['retry'])
+
+class TestGetRetryDelay(TestCase):
+    retry_policy: dict = {'base_delay': 0.25, 'multiplier': 2, 'max_delay': 1, 'jitter': 0}
+
+    def test_get_retry_delay_grows_exponentially(self):
+        self.assertEqual([ get_retry_delay(self.retry_policy, attempt) for attempt in range(1, 4) ], [0.25, 0.5, 1])
+
+    def test_get_retry_delay_is_capped(self):
+        self.assertEqual(get_retry_delay(self.retry_policy, 10), 1)
+
+    def test_get_retry_delay_applies_jitter(self):
+        for _ in range(20):
+            self.assertTrue(0.5 <= get_retry_delay({**self.retry_policy, 'jitter': 0.5}, 10) <= 1)
+
+class TestIsTreatedAsSuccess(TestCase):
+
+    def test_is_treated_as_success_matches_command(self):
+        self.assertTrue(is_treated_as_success({'treat_as_success': ['delete']}, 'delete'))
+        self.assertFalse(is_treated_as_success({'treat_as_success': ['delete']}, 'set'))
+        self.assertTrue(is_treated_as_success({'treat_as_success': True}, 'set'))
+
+class TestSendWithRetries(TestCase):
+
+    def setUp(self):
+        clear_attempt_history(test_config)
+
+    def test_send_with_retries_retries_until_success(self):
+        send_request = mock.Mock(side_effect = [{'retCode': 5002}, requests.exceptions.ConnectionError('down'), {'retCode': 0}])
+        retry_result: dict = send_with_retries(test_config, send_request, 'set', max_attempts = 5)
+        self.assertTrue(retry_result['succeeded'])
+        self.assertEqual([ attempt['ret_code'] for attempt in retry_result['attempts'] ], [5002, None, 0])
+        self.assertEqual(len(get_attempt_history(test_config)), 3)
+
+    def test_send_with_retries_stops_at_max_attempts(self):
+        send_request = mock.Mock(return_value = {'retCode': 5002})
+        retry_result: dict = send_with_retries(test_config, send_request, 'set', max_attempts = 3)
+        self.assertFalse(retry_result['succeeded'])
+        self.assertEqual(send_request.call_count, 3)
+
+    def test_send_with_retries_does_not_retry_when_policy_forbids(self):
+        send_request = mock.Mock(return_value = {'retCode': 2001})
+        send_with_retries(test_config, send_request, 'set', max_attempts = 3)
+        self.assertEqual(send_request.call_count, 1)
+
+    def test_send_with_retries_treats_deleted_items_as_success(self):
+        retry_result: dict = send_with_retries(test_config, mock.Mock(return_value = {'retCode': 3001}), 'delete', max_attempts = 3)
+        self.assertTrue(retry_result['succeeded'])
+
+    def test_send_with_retries_skips_unlisted_codes_when_asked(self):
+        send_request = mock.Mock(return_value = {'retCode': 4242})
+        send_with_retries(test_config, send_request, max_attempts = 3, retry_unlisted_codes = False)
+        self.assertEqual(send_request.call_count, 1)
+
+    def test_send_with_retries_records_attempt_timing(self):
+        send_request = mock.Mock(side_effect = [{'retCode': 5002}, {'retCode': 0}])
+        first_attempt: dict = send_with_retries(test_config, send_request, max_attempts = 2)['attempts'][0]
+        self.assertGreater(first_attempt['sleep_seconds'], 0)
+        self.assertGreaterEqual(first_attempt['network_seconds'], 0)
+
+    def test_send_with_retries_stops_retrying_at_deadline(self):
+        send_request = mock.Mock(return_value = {'retCode': 5002})
+        retry_result: dict = send_with_retries(test_config, send_request, max_attempts = 100, deadline = time.monotonic() + 0.02)
+        self.assertTrue(retry_result['deadline_exceeded'])
+        self.assertLess(send_request.call_count, 100)
+
+    def test_send_with_retries_does_not_send_after_deadline(self):
+        send_request = mock.Mock(return_value = {'retCode': 0})
+        retry_result: dict = send_with_retries(test_config, send_request, max_attempts = 3, deadline = time.monotonic() - 1)
+        self.assertFalse(retry_result['succeeded'])
+        send_request.assert_not_called()
@@ -0,0 +1,87 @@
+import threading, time
+
+from unittest import TestCase
+
+from utils.schedule_utils import create_concurrency_limit, get_api_call_dependencies, get_barrier_stages, has_declared_dependencies, record_response_code, run_with_dependencies
+
+def get_test_ordered_api_call(config_item: str, api_path: str, **kwargs) -> dict:
+    return {'config_item': config_item, 'config_item_name': config_item, 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': api_path}], **kwargs}
+
+test_ordered_api_calls: list[dict] = [
+    get_test_ordered_api_call('credentials', 'auth', barrier = True),
+    get_test_ordered_api_call('ipv6', 'conf/system'),
+    get_test_ordered_api_call('dns_1', 'conf/network/ethernet/dns/1'),
+    get_test_ordered_api_call('dns_0', 'conf/network/ethernet/dns/0', depends_on = ['dns_1']),
+    get_test_ordered_api_call('label', 'conf/system'),
+    get_test_ordered_api_call('snmp', 'conf/snmp'),
+    get_test_ordered_api_call('dhcp', 'conf/network/ethernet', barrier = True),
+    get_test_ordered_api_call('static_ip', 'conf/network/ethernet/address/0', barrier = True)
+]
+
+class TestHasDeclaredDependencies(TestCase):
+
+    def test_has_declared_dependencies_returns_true_for_barriers(self):
+        self.assertTrue(has_declared_dependencies(test_ordered_api_calls))
+
+    def test_has_declared_dependencies_returns_false_for_legacy_calls(self):
+        self.assertFalse(has_declared_dependencies([get_test_ordered_api_call('snmp', 'conf/snmp')]))
+
+class TestGetApiCallDependencies(TestCase):
+    dependencies: dict[int, set[int]] = get_api_call_dependencies(test_ordered_api_calls)
+
+    def test_get_api_call_dependencies_runs_barrier_first(self):
+        self.assertEqual(self.dependencies[0], set())
+        self.assertEqual(self.dependencies[1], {0})
+        self.assertEqual(self.dependencies[5], {0})
+
+    def test_get_api_call_dependencies_honors_depends_on(self):
+        self.assertEqual(self.dependencies[3], {0, 2})
+
+    def test_get_api_call_dependencies_serializes_calls_to_same_api_path(self):
+        self.assertEqual(self.dependencies[4], {0, 1})
+
+    def test_get_api_call_dependencies_barrier_waits_for_all_earlier_calls(self):
+        self.assertEqual(self.dependencies[6], {0, 1, 2, 3, 4, 5})
+        self.assertEqual(self.dependencies[7], {6})
+
+class TestGetBarrierStages(TestCase):
+
+    def test_get_barrier_stages_runs_each_barrier_alone(self):
+        barrier_stages: list[list[dict]] = get_barrier_stages(test_ordered_api_calls)
+        self.assertEqual([ [ ordered_api_call['config_item'] for ordered_api_call in barrier_stage ] for barrier_stage in barrier_stages ],
+            [['credentials'], ['ipv6', 'dns_1', 'dns_0', 'label', 'snmp'], ['dhcp'], ['static_ip']])
+
+class TestRecordResponseCode(TestCase):
+
+    def test_record_response_code_halves_limit_when_imd_is_busy(self):
+        concurrency_limit: dict = create_concurrency_limit(4)
+        record_response_code(concurrency_limit, 5002)
+        self.assertEqual(concurrency_limit['limit'], 2)
+        record_response_code(concurrency_limit, 5002)
+        record_response_code(concurrency_limit, 5002)
+        self.assertEqual(concurrency_limit['limit'], 1)
+
+    def test_record_response_code_recovers_limit_after_successes(self):
+        concurrency_limit: dict = create_concurrency_limit(4)
+        record_response_code(concurrency_limit, 5002)
+        for _ in range(2): record_response_code(concurrency_limit, 0)
+        self.assertEqual(concurrency_limit['limit'], 3)
+
+class TestRunWithDependencies(TestCase):
+
+    def test_run_with_dependencies_respects_dependencies(self):
+        finished_tasks: list[int] = []
+        lock = threading.Lock()
+        def run_task(task: int) -> bool:
+            time.sleep(0.05 if task == 0 else 0.01)
+            with lock: finished_tasks.append(task)
+            return True
+        results: dict[int, bool] = run_with_dependencies({0: set(), 1: {0}, 2: {0}, 3: {1, 2}}, run_task, 4)
+        self.assertEqual(finished_tasks[0], 0)
+        self.assertEqual(finished_tasks[-1], 3)
+        self.assertTrue(all(results.values()))
+
+    def test_run_with_dependencies_runs_independent_tasks_concurrently(self):
+        start_time: float = time.monotonic()
+        run_with_dependencies({ task: set() for task in range(4) }, lambda task: time.sleep(0.2) is None, 4)
+        self.assertLess(time.monotonic() - start_time, 0.5)
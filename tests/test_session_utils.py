@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from utils.session_utils import close_all_imd_sessions, close_imd_session, get_imd_session
+
+class TestGetImdSession(TestCase):
+
+    def tearDown(self):
+        close_all_imd_sessions()
+
+    def test_get_imd_session_reuses_session_for_same_imd(self):
+        test_config: dict = { 'current_imd_ip': '192.168.123.123' }
+        self.assertIs(get_imd_session(test_config), get_imd_session(test_config))
+
+    def test_get_imd_session_returns_separate_sessions_per_imd(self):
+        first_session = get_imd_session({ 'current_imd_ip': '192.168.123.123' })
+        second_session = get_imd_session({ 'current_imd_ip': '192.168.123.124' })
+        self.assertIsNot(first_session, second_session)
+
+    def test_get_imd_session_disables_certificate_verification(self):
+        self.assertFalse(get_imd_session({ 'current_imd_ip': '192.168.123.123' }).verify)
+
+class TestCloseImdSession(TestCase):
+
+    def test_close_imd_session_rebuilds_session_on_next_use(self):
+        test_config: dict = { 'current_imd_ip': '192.168.123.123' }
+        first_session = get_imd_session(test_config)
+        close_imd_session(test_config)
+        self.assertIsNot(first_session, get_imd_session(test_config))
+        close_imd_session(test_config)
+
+    def test_close_imd_session_ignores_unknown_imd(self):
+        close_imd_session({ 'current_imd_ip': '10.0.0.1' })
@@ -0,0 +1,61 @@
+import json, os, tempfile
+
+from unittest import mock, TestCase
+
+from utils.snapshot_utils import get_snapshot_api_paths, load_latest_imd_snapshot, snapshot_imds, take_imd_snapshot, write_imd_snapshot
+
+test_prompts: dict = {
+    'formatters': [
+        {'config_item': 'label', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/system'}]},
+        {'config_item': 'ntp', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/time'}]}
+    ],
+    'defaults': [
+        {'config_item': 'ipv6', 'api_calls': [{'cmd': 'set', 'method': 'post', 'api_path': 'conf/system', 'data': {'ip6Enabled': 'false'}}]},
+        {'config_item': 'dns_0', 'api_calls': [{'cmd': 'delete', 'method': 'post', 'api_path': 'conf/network/ethernet/dns/0'}]}
+    ]
+}
+
+test_imd_resources: dict = {
+    'sys/version': {'retCode': 0, 'retMsg': '', 'data': '6.3.0'},
+    'conf/system': {'retCode': 0, 'retMsg': '', 'data': {'label': 'test_hostname'}},
+    'conf/time': False,
+    'conf/network/ethernet/dns/0': {'retCode': 3001, 'retMsg': 'Not found'}
+}
+
+class TestGetSnapshotApiPaths(TestCase):
+
+    def test_get_snapshot_api_paths_lists_each_path_once(self):
+        self.assertEqual(get_snapshot_api_paths(test_prompts), ['sys/version', 'conf/system', 'conf/time', 'conf/network/ethernet/dns/0'])
+
+class TestImdSnapshots(TestCase):
+
+    def setUp(self):
+        self.snapshots_directory = tempfile.TemporaryDirectory()
+        self.test_config: dict = {'current_imd_ip': '127.0.0.1:8443', 'snapshots_path': self.snapshots_directory.name}
+
+    def tearDown(self):
+        self.snapshots_directory.cleanup()
+
+    @mock.patch('utils.snapshot_utils.get_imd_resources', return_value = test_imd_resources)
+    def test_take_imd_snapshot_keeps_code_and_data(self, mock_get_imd_resources):
+        imd_snapshot: dict = take_imd_snapshot(self.test_config, test_prompts)
+        self.assertEqual(imd_snapshot['resources']['conf/system'], {'retCode': 0, 'data': {'label': 'test_hostname'}})
+        self.assertIsNone(imd_snapshot['resources']['conf/time'])
+
+    @mock.patch('utils.snapshot_utils.get_imd_resources', return_value = test_imd_resources)
+    def test_write_imd_snapshot_round_trips_through_load(self, mock_get_imd_resources):
+        imd_snapshot: dict = take_imd_snapshot(self.test_config, test_prompts)
+        snapshot_file_path: str = write_imd_snapshot(self.test_config, imd_snapshot)
+        self.assertTrue(os.path.basename(snapshot_file_path).startswith('127.0.0.1_8443_'))
+        with open(snapshot_file_path) as snapshot_file:
+            self.assertNotIn('\n', snapshot_file.read())
+        self.assertEqual(load_latest_imd_snapshot(self.test_config), json.loads(json.dumps(imd_snapshot)))
+
+    def test_load_latest_imd_snapshot_returns_false_without_snapshots(self):
+        self.assertFalse(load_latest_imd_snapshot(self.test_config))
+
+    @mock.patch('utils.snapshot_utils.get_imd_resources', return_value = test_imd_resources)
+    def test_snapshot_imds_snapshots_every_imd(self, mock_get_imd_resources):
+        snapshot_results: list[dict] = snapshot_imds(self.test_config, test_prompts, ['10.0.0.1', '10.0.0.2'], concurrency = 2, quiet = True)
+        self.assertTrue(all(snapshot_result['succeeded'] for snapshot_result in snapshot_results))
+        self.assertEqual(len(os.listdir(self.snapshots_directory.name)), 2)
@@ -0,0 +1,32 @@
+from unittest import mock, TestCase
+
+from utils.sys_utils import exit_with_code, register_exit_handler, run_exit_handlers
+
+class TestExitHandlers(TestCase):
+
+    def tearDown(self):
+        run_exit_handlers()
+
+    def test_exit_handlers_run_once_in_reverse_order(self):
+        calls: list[str] = []
+        register_exit_handler(lambda: calls.append('first'))
+        register_exit_handler(lambda: calls.append('second'))
+        run_exit_handlers()
+        run_exit_handlers()
+        self.assertEqual(calls, ['second', 'first'])
+
+    def test_failing_exit_handler_does_not_stop_the_others(self):
+        calls: list[str] = []
+        register_exit_handler(lambda: calls.append('first'))
+        register_exit_handler(mock.Mock(side_effect = RuntimeError('handler failed')))
+        with mock.patch('builtins.print'):
+            run_exit_handlers()
+        self.assertEqual(calls, ['first'])
+
+    @mock.patch('utils.sys_utils.os._exit')
+    def test_exit_with_code_runs_exit_handlers_before_exiting(self, mock_exit):
+        calls: list[str] = []
+        register_exit_handler(lambda: calls.append('handler'))
+        exit_with_code(3)
+        self.assertEqual(calls, ['handler'])
+        mock_exit.assert_called_once_with(3)
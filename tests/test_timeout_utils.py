@@ -0,0 +1,36 @@
+import time
+
+from unittest import TestCase
+
+from utils.timeout_utils import deadline_has_passed, get_endpoint_class, get_imd_deadline, get_request_timeout
+
+class TestGetEndpointClass(TestCase):
+
+    def test_get_endpoint_class_classifies_api_paths(self):
+        self.assertEqual(get_endpoint_class('auth/test_username'), 'auth')
+        self.assertEqual(get_endpoint_class('https://10.0.0.1/api/sys/version'), 'version')
+        self.assertEqual(get_endpoint_class('https://10.0.0.1/transfer/firmware?token=abc'), 'firmware_upload')
+        self.assertEqual(get_endpoint_class('conf/network/ethernet/dns/0'), 'config')
+
+class TestGetRequestTimeout(TestCase):
+
+    def test_get_request_timeout_merges_configured_timeouts(self):
+        test_config: dict = {'request_timeouts': {'version': [1, 2]}}
+        self.assertEqual(get_request_timeout(test_config, 'sys/version'), (1, 2))
+        self.assertEqual(get_request_timeout(test_config, 'auth/'), (3.05, 15))
+
+    def test_get_request_timeout_is_capped_by_deadline(self):
+        connect_timeout, read_timeout = get_request_timeout({}, 'conf/system', time.monotonic() + 1)
+        self.assertLessEqual(connect_timeout, 1)
+        self.assertLessEqual(read_timeout, 1)
+        self.assertGreater(get_request_timeout({}, 'conf/system', time.monotonic() - 1)[1], 0)
+
+class TestImdDeadline(TestCase):
+
+    def test_get_imd_deadline_is_none_when_not_configured(self):
+        self.assertIsNone(get_imd_deadline({}))
+        self.assertFalse(deadline_has_passed(None))
+
+    def test_deadline_has_passed(self):
+        self.assertFalse(deadline_has_passed(get_imd_deadline({'imd_deadline': 60})))
+        self.assertTrue(deadline_has_passed(time.monotonic() - 0.001))
@@ -0,0 +1,78 @@
+import os, tempfile
+
+from unittest import mock, TestCase
+
+from tests.mock_imd_server import get_mock_imd_config, start_mock_imd, stop_mock_imd
+from utils.api_utils import apply_all_api_calls, forget_imd_state
+from utils.retry_utils import send_with_retries
+from utils.trace_utils import load_trace_events, start_tracing, stop_tracing, trace_span, tracing_is_enabled
+
+test_config: dict = {
+    'current_imd_ip': 'trace.test',
+    'retry_policies': {'default': {'retry': True, 'base_delay': 0.001, 'multiplier': 1, 'max_delay': 0.001, 'jitter': 0}}
+}
+
+class TestTraceSpan(TestCase):
+
+    def setUp(self):
+        self.trace_directory = tempfile.TemporaryDirectory()
+        self.trace_file_path: str = os.path.join(self.trace_directory.name, 'traces', 'test.trace.json')
+
+    def tearDown(self):
+        stop_tracing()
+        self.trace_directory.cleanup()
+
+    def get_spans(self) -> list[dict]:
+        return [ trace_event for trace_event in load_trace_events(self.trace_file_path) if trace_event['ph'] == 'X' ]
+
+    def test_trace_span_does_nothing_when_tracing_is_disabled(self):
+        with trace_span(test_config, 'span', 'test', attempt = 1) as span_args:
+            span_args['ret_code'] = 0
+        self.assertFalse(tracing_is_enabled())
+        self.assertFalse(os.path.exists(self.trace_file_path))
+
+    def test_trace_file_is_a_chrome_trace_event_array(self):
+        start_tracing(self.trace_file_path)
+        with trace_span(test_config, 'outer', 'imd'):
+            with trace_span(test_config, 'inner', 'http_attempt', attempt = 1) as span_args:
+                span_args['ret_code'] = 0
+        stop_tracing()
+        with open(self.trace_file_path, 'r') as trace_file:
+            self.assertEqual(trace_file.readline(), '[\n')
+        inner_span, outer_span = self.get_spans()
+        self.assertEqual(inner_span['args'], {'imd_ip': 'trace.test', 'attempt': 1, 'ret_code': 0})
+        self.assertEqual(outer_span['cat'], 'imd')
+        self.assertLessEqual(outer_span['ts'], inner_span['ts'])
+        self.assertGreaterEqual(outer_span['ts'] + outer_span['dur'], inner_span['ts'] + inner_span['dur'])
+
+    def test_send_with_retries_traces_attempts_and_sleeps(self):
+        start_tracing(self.trace_file_path)
+        send_request = mock.Mock(side_effect = [{'retCode': 9999}, {'retCode': 0}])
+        send_with_retries(test_config, send_request, max_attempts = 2, label = 'conf/system')
+        spans: list[dict] = self.get_spans()
+        self.assertEqual([ (span['name'], span['cat']) for span in spans ], [('conf/system', 'http_attempt'), ('retry_sleep', 'sleep'), ('conf/system', 'http_attempt')])
+        self.assertEqual([ span['args']['ret_code'] for span in spans if span['cat'] == 'http_attempt' ], [9999, 0])
+        self.assertEqual(spans[1]['args']['seconds'], 0.001)
+
+    def test_apply_all_api_calls_traces_config_items_and_http_requests(self):
+        mock_imd: dict = start_mock_imd()
+        mock_imd_config: dict = get_mock_imd_config(mock_imd, imd_concurrency = 1)
+        ordered_api_calls: list[dict] = [
+            {'config_item': 'credentials', 'config_item_name': 'Credentials', 'api_calls': [{'cmd': 'add', 'method': 'post', 'api_path': 'auth', 'data': {'username': 'admin', 'password': 'password'}}]}
+        ]
+        start_tracing(self.trace_file_path)
+        try:
+            self.assertTrue(apply_all_api_calls(mock_imd_config, ordered_api_calls, quiet = True))
+        finally:
+            forget_imd_state(mock_imd_config)
+            stop_mock_imd(mock_imd)
+        spans_by_category: dict[str, list[dict]] = {}
+        for span in self.get_spans():
+            spans_by_category.setdefault(span['cat'], []).append(span)
+        self.assertEqual(spans_by_category['config_item'][0]['name'], 'Credentials')
+        self.assertTrue(spans_by_category['config_item'][0]['args']['succeeded'])
+        self.assertEqual(spans_by_category['http'][0]['name'], 'POST /api/auth')
+        self.assertEqual(spans_by_category['http'][0]['args']['status_code'], 200)
+        self.assertGreater(spans_by_category['http'][0]['args']['bytes_sent'], 0)
+        self.assertGreater(spans_by_category['http'][0]['args']['bytes_received'], 0)
+        self.assertIn('probe', spans_by_category.keys())
@@ -1,17 +1,49 @@
-import json, requests, time, urllib3 # type: ignore[import-untyped]
+import json, urllib3 # type: ignore[import-untyped]
 from halo import Halo # type: ignore
+from concurrent.futures import ThreadPoolExecutor
 from requests import Response
+from types import MappingProxyType
+from typing import Callable
 
-from utils.dict_utils import get_dict_with_matching_key_value_pair, get_values_if_keys_exist
-from utils.format_utils import format_red, format_yellow, get_formatted_config_items, get_status_messages, truncate_message
-from utils.parse_utils import is_exactly_zero
+from utils.auth_utils import cache_admin_status, cache_token, clear_auth_context, get_cached_admin_status, get_cached_token, get_login_lock, invalidate_token
+from utils.breaker_utils import reset_circuit_breaker
+from utils.dict_utils import get_value_if_key_exists, get_values_if_keys_exist
+from utils.eta_utils import wait_for_imd_reboot_with_history
+from utils.format_utils import format_green, format_red, format_yellow, get_status_messages, truncate_message
+from utils.metrics_utils import record_api_call_metrics
+from utils.parse_utils import is_exactly_zero, parse_api_call_data
+from utils.plan_utils import bind_execution_plan, get_execution_plan
+from utils.reboot_utils import read_firmware_version
 from utils.prompt_utils import confirm, get_credentials
-from utils.network_utils import wait_for_ping
+from utils.network_utils import mark_imd_alive, mark_imd_unreachable, wait_for_imd
+from utils.retry_utils import send_with_retries, transport_errors
+from utils.schedule_utils import acquire_concurrency_slot, create_concurrency_limit, get_api_call_dependencies, get_barrier_stages, has_declared_dependencies, record_response_code, release_concurrency_slot, run_with_dependencies
+from utils.session_utils import close_imd_session, get_imd_session, get_session_pool_size
 from utils.spinner_utils import get_spinner
 from utils.sys_utils import exit_with_code
+from utils.timeout_utils import get_request_timeout
+from utils.trace_utils import trace_span
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+def forget_imd_state(config: dict) -> None:
+    close_imd_session(config)
+    mark_imd_unreachable(config)
+    clear_auth_context(config)
+    reset_circuit_breaker(config)
+
+def track_imd_liveness(config: dict, send_request: Callable[[], dict]) -> Callable[[], dict]:
+    def send_request_and_track_liveness() -> dict:
+        try:
+            response: dict = send_request()
+        except transport_errors:
+            mark_imd_unreachable(config)
+            raise
+        mark_imd_alive(config)
+        return response
+
+    return send_request_and_track_liveness
+
 def make_api_call(
     config: dict,
     url: str, 
@@ -24,33 +56,43 @@ def make_api_call(
     quiet: bool = False) -> Response | bool:
 
     spinner = Halo(text = f'{status_msg}\n', spinner = get_spinner(config))
-    try:
-        if not quiet: spinner.start()
+    session = get_imd_session(config)
+    api_attempts: int = get_value_if_key_exists(config, 'api_attempts') or 1
+    request_timeout: tuple[float, float] = get_request_timeout(config, url)
+
+    def send_request() -> dict:
         match action:
             case 'get':
-                request = requests.get(url, headers = headers, verify = False)
+                request = session.get(url, headers = headers, json = json_payload if bool(json_payload) else None, verify = False, timeout = request_timeout)
             case 'post':
-                request = requests.post(url, headers = headers, json = json_payload, verify = False)
-        response = json.loads(request.text)
-        response_code = response['retCode']
-        if is_exactly_zero(response_code):
-            if not quiet: spinner.succeed(success_msg)
-        else:
-            response_message: str = response['retMsg']
-            failure_message: str = response_message if bool(response_message) else f'Return Code: {response_code}' if bool(response_code) else response
-            if not quiet: spinner.fail(truncate_message(f'IMD Error: {failure_message}.'))
-        return response
-    except requests.exceptions.ConnectionError as error:
-        if not quiet: 
+                request = session.post(url, headers = headers, json = json_payload, verify = False, timeout = request_timeout)
+        return json.loads(request.text)
+
+    while True:
+        try:
+            if not quiet: spinner.start()
+            retry_result: dict = send_with_retries(config, track_imd_liveness(config, send_request), max_attempts = api_attempts, label = url, retry_unlisted_codes = False)
+            record_api_call_metrics(url, retry_result)
+            response: dict | None = retry_result['response']
+            if response is None: raise retry_result['error']
+            response_code = response['retCode']
+            if is_exactly_zero(response_code):
+                if not quiet: spinner.succeed(success_msg)
+            else:
+                response_message: str = response['retMsg']
+                failure_message: str = response_message if bool(response_message) else f'Return Code: {response_code}' if bool(response_code) else response #type: ignore[assignment]
+                if not quiet: spinner.fail(truncate_message(f'IMD Error: {failure_message}.'))
+            return response #type: ignore[return-value]
+        except transport_errors as error:
+            if quiet: return False
             spinner.fail(truncate_message(f'Error while interacting with IMD: {error}.'))
             if not confirm(config, 'Do you want to try again? (y or n): '):
                 if not confirm(config, 'Do you want to continue with the configuration? (y or n): '):
                     exit_with_code(1)
-            else: make_api_call(config, url, headers, json_payload, action, status_msg, success_msg, function_name, quiet)
-    except Exception as error:
-        if not quiet: spinner.fail(truncate_message(f'Function \'{function_name}\' error: \'{error}\''))
-        
-    return False
+                return False
+        except Exception as error:
+            if not quiet: spinner.fail(truncate_message(f'Function \'{function_name}\' error: \'{error}\''))
+            return False
 
 def interact_with_imd(
     config: dict, 
@@ -80,8 +122,12 @@ def interact_with_imd(
     quiet = quiet)
 
 def get_admin_status(config: dict) -> bool:
+    cached_admin_status: bool | None = get_cached_admin_status(config)
+    if cached_admin_status is not None: return cached_admin_status
     admin_status: Response | bool = interact_with_imd(config, 'sys/state/adminExists', {}, '', '', 'get', quiet = True)
-    if type(admin_status) != bool: admin_exists: bool = bool(admin_status['data']) #type: ignore[index]
+    if type(admin_status) != bool:
+        admin_exists: bool = bool(admin_status['data']) #type: ignore[index]
+        cache_admin_status(config, admin_exists)
     else: admin_exists = False
     
     return admin_exists
@@ -91,7 +137,7 @@ def set_imd_creds(config: dict, quiet: bool = True) -> Response | bool:
     creds_api_endpoint: str = 'auth/'
     new_user_settings: dict = {'token': '', 'cmd': 'add', 'data': {'username': username, 'password': password, 'enabled': 'true', 'control': 'true', 'admin': 'true', 'language': 'en'}}
 
-    return interact_with_imd(
+    creds_response: Response | bool = interact_with_imd(
         config = config, 
         api_endpoint = creds_api_endpoint,
         json_payload = new_user_settings,
@@ -102,48 +148,88 @@ def set_imd_creds(config: dict, quiet: bool = True) -> Response | bool:
         function_name = 'set_imd_creds', 
         status_msg = 'Setting IMD Credentials.',
         success_msg = 'Successfully Set IMD credentials!')
+    if type(creds_response) == dict and is_exactly_zero(creds_response['retCode']): #type: ignore[index]
+        cache_admin_status(config, True)
+        invalidate_token(config)
 
-    return False
+    return creds_response
 
-def login_to_imd(config: dict, quiet: bool = True) -> str | bool:
-    username, password = get_credentials(config)
-    login_api_endpoint: str = f'auth/{username}'
-    login_json: dict = {'token': '', 'cmd': 'login', 'data': {'password': password}}
-    admin_exists: bool = get_admin_status(config)
+def get_imd_token(config: dict, quiet: bool = True) -> str | bool:
+    cached_token: str | bool = get_cached_token(config)
+    if bool(cached_token): return cached_token
+    with get_login_lock(config):
+        cached_token = get_cached_token(config)
+        if bool(cached_token): return cached_token
+        username, password = get_credentials(config)
+        login_api_endpoint: str = f'auth/{username}'
+        login_json: dict = {'token': '', 'cmd': 'login', 'data': {'password': password}}
+        admin_exists: bool = get_admin_status(config)
+
+        if not admin_exists: set_imd_creds(config, True)
+        response = interact_with_imd(
+            config = config, 
+            api_endpoint = login_api_endpoint,
+            json_payload = login_json,
+            username = username,
+            password = password, 
+            action = 'post', 
+            quiet = quiet, 
+            function_name = 'login_to_imd', 
+            status_msg = 'Logging into IMD.',
+            success_msg = 'Successfully Logged into IMD!')
 
-    if not admin_exists: set_imd_creds(config, True)
-    response = interact_with_imd(
-        config = config, 
-        api_endpoint = login_api_endpoint,
-        json_payload = login_json,
-        username = username,
-        password = password, 
-        action = 'post', 
-        quiet = quiet, 
-        function_name = 'login_to_imd', 
-        status_msg = 'Logging into IMD.',
-        success_msg = 'Successfully Logged into IMD!')
-    
-    if type(response) == dict:
         try:
-            return response['data']['token'] # type: ignore
-        except KeyError:
-            if not confirm(config, format_red('Unable to log into IMD. Do you want to try again? (y or n): ')):
-                if not quiet: print(format_red('Unable to log into IMD. Please reset the IMD to factory defaults.'))
-            else: return login_to_imd(config, quiet)
-    return False
+            token: str = response['data']['token'] # type: ignore
+            cache_token(config, token)
+            return token
+        except (KeyError, TypeError):
+            return False
+
+def login_to_imd(config: dict, quiet: bool = True) -> str | bool:
+    token: str | bool = get_imd_token(config, quiet)
+    if bool(token) or bool(get_value_if_key_exists(config, 'unattended')):
+        return token
+    if not confirm(config, format_red('Unable to log into IMD. Do you want to try again? (y or n): ')):
+        if not quiet: print(format_red('Unable to log into IMD. Please reset the IMD to factory defaults.'))
+        return False
+
+    return login_to_imd(config, quiet)
+
+def get_imd_resource(config: dict, api_path: str) -> dict | bool:
+    use_token_auth: bool = bool(get_value_if_key_exists(config, 'use_token_auth')) and get_admin_status(config)
+    token: str | bool = get_imd_token(config) if use_token_auth else False
+
+    return interact_with_imd(
+        config = config,
+        api_endpoint = api_path,
+        json_payload = {'token': token} if bool(token) else {},
+        username = '',
+        password = '',
+        action = 'get',
+        quiet = True,
+        function_name = 'get_imd_resource') #type: ignore[return-value]
+
+def get_imd_resources(config: dict, api_paths: list[str]) -> dict[str, dict | bool]:
+    unique_api_paths: list[str] = list(dict.fromkeys(api_paths))
+    if not bool(unique_api_paths): return {}
+    with ThreadPoolExecutor(max_workers = get_session_pool_size(config)) as executor:
+        imd_resources: list[dict | bool] = list(executor.map(lambda api_path: get_imd_resource(config, api_path), unique_api_paths))
+
+    return dict(zip(unique_api_paths, imd_resources))
 
 def reset_imd_to_factory_defaults(config: dict, quiet: bool = True) -> Response | bool:
-    if wait_for_ping(config, quiet = False):
+    if wait_for_imd(config, quiet = False):
         admin_exists: bool = get_admin_status(config)
         if not admin_exists and not quiet:
             print(format_yellow('The IMD is already set to factory defaults.'))
             return False
         username, password = get_credentials(config)
+        wait_for_reset_reboot: bool = config['current_imd_ip'] == get_value_if_key_exists(config, 'default_imd_ip')
+        firmware_version: str | None = read_firmware_version(config) if wait_for_reset_reboot else None
         reset_api_endpoint: str = 'sys/'
         factory_reset_json: dict = {'username': username, 'password': password, 'cmd': "reset", 'data': {'target': "defaults"}}
 
-        return interact_with_imd(
+        reset_response: Response | bool = interact_with_imd(
             config = config, 
             api_endpoint = reset_api_endpoint,
             json_payload = factory_reset_json,
@@ -154,86 +240,171 @@ def reset_imd_to_factory_defaults(config: dict, quiet: bool = True) -> Response
             function_name = 'reset_imd_to_factory_defaults', 
             status_msg = 'Resetting IMD to Factory Defaults.',
             success_msg = 'Successfully Reset IMD to Factory Defaults!')
+        forget_imd_state(config)
+        reset_succeeded: bool = type(reset_response) == dict and is_exactly_zero(reset_response['retCode']) #type: ignore[index]
+        if not reset_succeeded:
+            return False
+        if wait_for_reset_reboot:
+            reboot_result: dict = wait_for_imd_reboot_with_history(config, 'reset', firmware_version, firmware_version, quiet = quiet)
+            if not quiet and not reboot_result['succeeded']: print(format_red(f'IMD did not come back after the reset: {reboot_result['error']}.'))
+            if not quiet and reboot_result['succeeded']: print(f'IMD back at factory defaults after {reboot_result['elapsed_seconds']} s.')
+
+        return reset_response
     
     return False
 
 def get_ordered_api_calls(config: dict, prompts: dict, unique_config_items: list[dict]) -> list[dict]:
-    api_call_sequence: list[str] = prompts['api_call_sequence']
-    formatted_config_items: list[dict] = get_formatted_config_items(config, prompts, unique_config_items)
-    defaults: list[dict] = prompts['defaults']
-    api_calls: list[dict] = formatted_config_items + defaults
-    ordered_api_calls: list[dict] = [
-        get_dict_with_matching_key_value_pair(api_calls, 'config_item', api_call)
-        for api_call in api_call_sequence
-    ]
-
-    return ordered_api_calls
-
-def apply_api_call(config: dict, config_item_name: str, api_call: dict, retry_attempts: int, quiet=False) -> bool:
-    def retry(retry_attempts: int, spinner: Halo, message: str) -> bool:
-        if not quiet: spinner.fail(truncate_message(format_red(message)))
-        auto_retry: bool = retry_attempts > 0
-        retry_wait_time: int = config['api_retry_time'] 
-        if auto_retry:
-            time.sleep(retry_wait_time)
-            if not quiet: print("\033[A\033[A")
-            return apply_api_call(config, config_item_name, api_call, retry_attempts - 1, quiet) 
-        if not confirm(config, 'Do you want to try again? (y or n): '):
-            if not confirm(config, 'Do you want to continue with the configuration? (y or n): '): 
-                if not quiet: print(format_yellow('Exiting the script. You may wish to reset the IMD to factory defaults.'))
-                exit_with_code(1)
-            return False
-        return apply_api_call(config, config_item_name, api_call, config['api_attempts'], quiet)
+    execution_plan: MappingProxyType = get_execution_plan(config, prompts)
+    return bind_execution_plan(config, execution_plan, unique_config_items)
+
+def get_authenticated_payload(config: dict, command: str, data: dict | None = None) -> dict:
+    token: str | bool = get_imd_token(config) if bool(get_value_if_key_exists(config, 'use_token_auth')) else False
+    credentials: dict = {'token': token} if bool(token) else {'username': config['username'], 'password': config['password']}
+
+    return {**credentials, 'cmd': command, **({'data': data} if data is not None else {})}
 
+def get_retry_message(failure_message: str, retry_result: dict) -> str:
+    response: dict | None = retry_result['response']
+    if bool(get_value_if_key_exists(retry_result, 'deadline_exceeded')):
+        return f'{failure_message} | IMD deadline exceeded.'
+    if response is None:
+        return f'Error while interacting with IMD: \'{retry_result['error']}\''
+    api_response_code, api_response_message = response['retCode'], response['retMsg']
+    match api_response_code:
+        case 1001:
+            return 'Temporary authorization failure, please wait.'
+        case 5002:
+            return 'IMD is busy, please wait.'
+    return f'{failure_message} | Response Code: {api_response_code}, IMD Error: {api_response_message}.'
+
+def apply_api_call(config: dict, config_item_name: str, api_call: dict, retry_attempts: int, quiet=False, on_response_code: Callable | None = None, deadline: float | None = None) -> bool:
     method, command, raw_data, api_path = get_values_if_keys_exist(api_call, ['method', 'cmd', 'data', 'api_path'])
     if bool(raw_data):
-        data: dict = raw_data if type(raw_data) == dict else json.loads(raw_data.replace('\'', '\"'))
-    api_attempts, default_api_retry_time, headers = get_values_if_keys_exist(config, ['default_api_attempts', 'default_api_retry_time', 'headers'])
+        data: dict = parse_api_call_data(config, raw_data)
+    if bool(raw_data) and method == 'post' and command == 'add':
+        get_json_data: Callable[[], dict] = lambda: {'token': '', 'cmd': 'add', 'data': data}
+    elif bool(raw_data) and method == 'post' and command == 'set':
+        get_json_data = lambda: get_authenticated_payload(config, 'set', data)
+    elif not bool(raw_data) and command == 'delete':
+        get_json_data = lambda: get_authenticated_payload(config, 'delete')
+    else:
+        return False
+    headers: dict = config['headers']
     url = f'{config['api_base_url']}{api_path}' if api_path[0] != '/' else f'{config['imd_base_url']}{api_path}'
     status_message, success_message, failure_message = get_status_messages(config, config_item_name, command)
     spinner = Halo(spinner = get_spinner(config))
-    if not quiet: spinner.start(text = status_message)
-    try:
-        wait_for_ping(config, quiet = True)
-        if bool(raw_data) and method == 'post': 
-            if command == 'add': json_data: dict = {'token': '', 'cmd': 'add', 'data': data}
-            elif command == 'set': json_data = {'username': config['username'], 'password': config['password'], 'cmd': 'set', 'data': data}
-            request = requests.post(url, headers = headers, json = json_data, verify = False)
-        if not bool(raw_data) and command == 'delete':   
-            request = requests.post(url, headers = headers, json = {'username': config['username'], 'password': config['password'], 'cmd': 'delete'}, verify = False)
-        if bool(request):
-            response: dict = json.loads(request.text)
-            api_response_message, api_response_code = response['retMsg'], response['retCode']
-            api_call_successful: bool = bool(api_response_code == 0)
-            credentials_already_set: bool = api_path == 'auth' and api_response_message == 'Not enough permissions'
-            config_item_already_deleted: bool = api_response_code == 3001 and command == 'delete'
-            
-            if api_call_successful or credentials_already_set or config_item_already_deleted:
-                if not quiet and bool(success_message): spinner.succeed(text = success_message)
-                return True
-            if api_response_code == 1001:
-                time.sleep(2)
-                return retry(retry_attempts, spinner, 'Temporary authorization failure, please wait.')
-            if api_response_code == 5002:
-                time.sleep(2)
-                return retry(retry_attempts, spinner, 'IMD is busy, please wait.')
-            else:
-                return retry(retry_attempts, spinner, f'{failure_message} | Response Code: {api_response_code}, IMD Error: {api_response_message}.')
-                return False 
-    except requests.exceptions.ConnectionError as error:
-        return retry(retry_attempts, spinner, f'Error while interacting with IMD: \'{error}\'')
+    session = get_imd_session(config)
 
-    return False
+    def post_api_call(json_data: dict) -> dict:
+        return json.loads(session.post(url, headers = headers, json = json_data, verify = False, timeout = get_request_timeout(config, api_path, deadline)).text)
+
+    def send_api_call() -> dict:
+        wait_for_imd(config, quiet = True)
+        json_data: dict = get_json_data()
+        response: dict = post_api_call(json_data)
+        token_was_rejected: bool = response['retCode'] == 1001 and bool(get_value_if_key_exists(json_data, 'token'))
+        if token_was_rejected:
+            invalidate_token(config, json_data['token'])
+            response = post_api_call(get_json_data())
+        return response
+
+    def api_call_succeeded(response: dict) -> bool:
+        credentials_already_set: bool = api_path == 'auth' and response['retMsg'] == 'Not enough permissions'
+        return response['retCode'] == 0 or credentials_already_set
 
-def apply_all_api_calls(config: dict, ordered_api_calls: list[dict]) ->  bool:
+    def show_retry(attempt: dict) -> None:
+        if not quiet: spinner.text = f'{status_message.strip()} (attempt {attempt['attempt'] + 1}, last response: {attempt['ret_code'] or attempt['error']})\n'
+
+    while True:
+        if not quiet: spinner.start(text = status_message)
+        retry_result: dict = send_with_retries(
+            config = config,
+            send_request = track_imd_liveness(config, send_api_call),
+            command = command,
+            max_attempts = retry_attempts + 1,
+            label = api_path,
+            is_success = api_call_succeeded,
+            on_response_code = on_response_code,
+            on_retry = show_retry,
+            deadline = deadline)
+        record_api_call_metrics(api_path, retry_result)
+        if retry_result['succeeded']:
+            if api_path == 'auth' and command == 'add': cache_admin_status(config, True)
+            if not quiet and bool(success_message): spinner.succeed(text = success_message)
+            return True
+        if not quiet: spinner.fail(truncate_message(format_red(get_retry_message(failure_message, retry_result))))
+        if bool(get_value_if_key_exists(config, 'unattended')):
+            return False
+        if not confirm(config, 'Do you want to try again? (y or n): '):
+            if not confirm(config, 'Do you want to continue with the configuration? (y or n): '): 
+                if not quiet: print(format_yellow('Exiting the script. You may wish to reset the IMD to factory defaults.'))
+                exit_with_code(1)
+            return False
+        retry_attempts = config['api_attempts']
+
+def get_imd_concurrency(config: dict) -> int:
+    imd_concurrency: int | bool = get_value_if_key_exists(config, 'imd_concurrency')
+    return imd_concurrency if bool(imd_concurrency) else 1 #type: ignore[return-value]
+
+def apply_ordered_api_call(config: dict, ordered_api_call: dict, concurrency_limit: dict, deadline: float | None = None) -> bool:
+    config_item_name: str = ordered_api_call['config_item_name']
+    api_call_results: list[bool] = []
+    with trace_span(config, config_item_name, 'config_item') as config_item_span:
+        for api_call in ordered_api_call['api_calls']:
+            acquire_concurrency_slot(concurrency_limit)
+            try:
+                api_call_results.append(
+                    apply_api_call(config, config_item_name, api_call, config['api_attempts'], True, lambda response_code: record_response_code(concurrency_limit, response_code), deadline)
+                )
+            finally:
+                release_concurrency_slot(concurrency_limit)
+        config_item_span['succeeded'] = all(api_call_results)
+
+    return all(api_call_results)
+
+def apply_api_calls_concurrently(config: dict, ordered_api_calls: list[dict], quiet: bool = False, deadline: float | None = None) -> bool:
+    unattended_config: dict = {**config, 'unattended': True}
+    imd_concurrency: int = get_imd_concurrency(config)
+    concurrency_limit: dict = create_concurrency_limit(imd_concurrency)
+
+    def apply_barrier_stage(barrier_stage: list[dict]) -> bool:
+        def run_ordered_api_call(index: int) -> bool:
+            ordered_api_call: dict = barrier_stage[index]
+            api_call_succeeded: bool = apply_ordered_api_call(unattended_config, ordered_api_call, concurrency_limit, deadline)
+            command: str = ordered_api_call['api_calls'][0]['cmd'] if bool(ordered_api_call['api_calls']) else ''
+            status_message, success_message, failure_message = get_status_messages(config, ordered_api_call['config_item_name'], command)
+            if not quiet: print(f'{format_green('✔')} {success_message}' if api_call_succeeded else f'{format_red('✖')} {failure_message}')
+            return api_call_succeeded
+
+        api_call_results: dict[int, bool] = run_with_dependencies(get_api_call_dependencies(barrier_stage), run_ordered_api_call, imd_concurrency)
+        failed_api_calls: list[dict] = [ barrier_stage[index] for index in sorted(api_call_results.keys()) if not api_call_results[index] ]
+        if not bool(failed_api_calls) or bool(get_value_if_key_exists(config, 'unattended')):
+            return not bool(failed_api_calls)
+        if not quiet: print(format_yellow(f'Retrying {len(failed_api_calls)} failed configuration items one at a time.'))
+        return apply_all_api_calls({**config, 'imd_concurrency': 1}, failed_api_calls, quiet, deadline)
+
+    barrier_stages: list[list[dict]] = get_barrier_stages(ordered_api_calls)
+    for stage_index, barrier_stage in enumerate(barrier_stages):
+        if apply_barrier_stage(barrier_stage): continue
+        remaining_api_calls: int = sum(len(remaining_stage) for remaining_stage in barrier_stages[stage_index + 1:])
+        if not quiet and remaining_api_calls > 0: print(format_yellow(f'Skipping the remaining {remaining_api_calls} configuration items because earlier items failed.'))
+        return False
+
+    return True
+
+def apply_all_api_calls(config: dict, ordered_api_calls: list[dict], quiet: bool = False, deadline: float | None = None) ->  bool:
+    if get_imd_concurrency(config) > 1 and has_declared_dependencies(ordered_api_calls):
+        return apply_api_calls_concurrently(config, ordered_api_calls, quiet, deadline)
     retry_attempts: int = config['api_attempts']
     api_call_results: list = []
     for ordered_api_call in ordered_api_calls:
-        for api_call in ordered_api_call['api_calls']:
-            config_item_name: str = ordered_api_call['config_item_name']
-            api_call_results.append(
-                apply_api_call(config, config_item_name, api_call, retry_attempts)
-            )
+        config_item_name: str = ordered_api_call['config_item_name']
+        with trace_span(config, config_item_name, 'config_item') as config_item_span:
+            config_item_results: list[bool] = [
+                apply_api_call(config, config_item_name, api_call, retry_attempts, quiet, deadline = deadline)
+                for api_call in ordered_api_call['api_calls'] ]
+            config_item_span['succeeded'] = all(config_item_results)
+        api_call_results += config_item_results
     all_api_calls_succeeded: bool = all(api_call_results)
 
     return all_api_calls_succeeded
\ No newline at end of file
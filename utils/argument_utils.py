@@ -15,10 +15,21 @@ def parse_args(system_arguments: list[str]) -> Namespace:
     parser.add_argument('-r', '--reset_imd',            help='Reset the currently connected IMD to factory defaults.', action='store_true')
     parser.add_argument('-u', '--upgrade',              help='Upgrade the firmware of the currently connected IMD.', action='store_true')
 
+    parser.add_argument('--concurrency',            help='Set the maximum number of IMDs to configure at once in fleet mode.', type = int)
+    parser.add_argument('--discover',               help='Sweep one or more CIDR ranges for IMDs and write an inventory .json file that can be used with --fleet_file.', nargs = '+', metavar = 'CIDR')
+    parser.add_argument('--fleet',                  help='Configure several IMDs concurrently, given their IP addresses.', nargs = '+', metavar = 'IMD_IP_ADDRESS')
+    parser.add_argument('--fleet_file',             help='Configure the IMDs listed in a fleet .json file concurrently.')
+    parser.add_argument('--inventory_file',         help='Specify the inventory file written by --discover.')
+    parser.add_argument('--metrics_file',           help='Periodically rewrite Prometheus metrics to a textfile (for the node_exporter textfile collector).')
+    parser.add_argument('--metrics_port',           help='Serve Prometheus metrics on http://127.0.0.1:METRICS_PORT/metrics while the script runs.', type = int)
+    parser.add_argument('--profile',                help='Profile the script with cProfile, write the stats to a .pstats file and print the slowest functions on exit. Time spent waiting for user input is excluded.', metavar = 'PROFILE_FILE')
     parser.add_argument('--prompts_file',           help='Specify the interactive prompts file to use.')
+    parser.add_argument('--reconcile',              help='Read the current IMD configuration first and only apply settings that differ.', action = 'store_true')
     parser.add_argument('--reset_script',           help='Remove all customized config and prompts files leaving only the default templates for these files.', action='store_true')
+    parser.add_argument('--snapshot',               help='Save a timestamped .json snapshot of the IMD configuration (or of every IMD given with --fleet or --fleet_file).', action = 'store_true')
     parser.add_argument('--skip_firmware_check',    help='Don\'t check the current IMD firmware version.', action = 'store_true')
     parser.add_argument('--spinner',                help='Set the spinner to use during lengthy script operations (see https://github.com/sindresorhus/cli-spinners).')
+    parser.add_argument('--trace',                  help='Write a trace of every IMD, configuration item, HTTP attempt, probe and sleep to a .json file that can be opened in chrome://tracing or Perfetto.', metavar = 'TRACE_FILE')
     
 
     return parser.parse_args()
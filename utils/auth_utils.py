@@ -0,0 +1,52 @@
+import threading, time
+
+from utils.dict_utils import get_value_if_key_exists, get_values_if_keys_exist
+
+imd_auth_contexts: dict[str, dict] = {}
+imd_auth_contexts_lock: threading.Lock = threading.Lock()
+imd_login_locks: dict[str, threading.Lock] = {}
+
+def get_auth_context(config: dict) -> dict:
+    with imd_auth_contexts_lock:
+        return dict(imd_auth_contexts.get(config['current_imd_ip'], {}))
+
+def update_auth_context(config: dict, **auth_context_values) -> None:
+    with imd_auth_contexts_lock:
+        imd_auth_contexts.setdefault(config['current_imd_ip'], {}).update(auth_context_values)
+
+def clear_auth_context(config: dict) -> None:
+    with imd_auth_contexts_lock:
+        imd_auth_contexts.pop(config['current_imd_ip'], None)
+
+def get_login_lock(config: dict) -> threading.Lock:
+    with imd_auth_contexts_lock:
+        return imd_login_locks.setdefault(config['current_imd_ip'], threading.Lock())
+
+def get_config_credentials(config: dict) -> tuple:
+    return get_values_if_keys_exist(config, ['username', 'password'])
+
+def get_cached_token(config: dict) -> str | bool:
+    auth_context: dict = get_auth_context(config)
+    token, token_expires_at, token_credentials = get_values_if_keys_exist(auth_context, ['token', 'token_expires_at', 'token_credentials'])
+    token_is_current: bool = bool(token) and time.monotonic() < token_expires_at and token_credentials == get_config_credentials(config)
+
+    return token if token_is_current else False
+
+def cache_token(config: dict, token: str) -> None:
+    token_ttl: float = get_value_if_key_exists(config, 'token_ttl') or 300
+    update_auth_context(config,
+        token = token,
+        token_expires_at = time.monotonic() + token_ttl,
+        token_credentials = get_config_credentials(config))
+
+def invalidate_token(config: dict, rejected_token: str | bool = False) -> None:
+    with imd_auth_contexts_lock:
+        auth_context: dict = imd_auth_contexts.setdefault(config['current_imd_ip'], {})
+        if not bool(rejected_token) or auth_context.get('token') == rejected_token:
+            auth_context['token'] = False
+
+def get_cached_admin_status(config: dict) -> bool | None:
+    return get_auth_context(config).get('admin_exists')
+
+def cache_admin_status(config: dict, admin_exists: bool) -> None:
+    update_auth_context(config, admin_exists = admin_exists)
@@ -0,0 +1,64 @@
+import requests, threading, time
+
+from utils.dict_utils import get_value_if_key_exists
+
+default_circuit_breaker: dict = {'failure_threshold': 3, 'cooldown': 30}
+
+imd_circuit_breakers: dict[str, dict] = {}
+imd_circuit_breakers_lock: threading.Lock = threading.Lock()
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    pass
+
+def get_circuit_breaker_settings(config: dict) -> dict:
+    configured_circuit_breaker: dict = get_value_if_key_exists(config, 'circuit_breaker') or {}
+    return {**default_circuit_breaker, **configured_circuit_breaker}
+
+def get_circuit_breaker(config: dict) -> dict:
+    imd_ip: str = get_value_if_key_exists(config, 'current_imd_ip') or ''
+    return imd_circuit_breakers.setdefault(imd_ip, {'state': 'closed', 'consecutive_failures': 0, 'opened_at': 0, 'reason': '', 'trial_in_flight': False})
+
+def get_circuit_state(config: dict) -> str:
+    with imd_circuit_breakers_lock:
+        circuit_breaker: dict = get_circuit_breaker(config)
+        cooldown_elapsed: bool = time.monotonic() - circuit_breaker['opened_at'] >= get_circuit_breaker_settings(config)['cooldown']
+        return 'half_open' if circuit_breaker['state'] == 'open' and cooldown_elapsed else circuit_breaker['state']
+
+def get_circuit_open_reason(config: dict) -> str:
+    with imd_circuit_breakers_lock:
+        return get_circuit_breaker(config)['reason']
+
+def circuit_is_open(config: dict) -> bool:
+    return bool(get_value_if_key_exists(config, 'unattended')) and get_circuit_state(config) == 'open'
+
+def circuit_allows_request(config: dict) -> bool:
+    if not bool(get_value_if_key_exists(config, 'unattended')):
+        return True
+    circuit_state: str = get_circuit_state(config)
+    with imd_circuit_breakers_lock:
+        circuit_breaker: dict = get_circuit_breaker(config)
+        if circuit_state == 'half_open' and not circuit_breaker['trial_in_flight']:
+            circuit_breaker['trial_in_flight'] = True
+            return True
+        return circuit_state == 'closed'
+
+def record_transport_failure(config: dict, error: Exception) -> None:
+    failure_threshold: int = get_circuit_breaker_settings(config)['failure_threshold']
+    with imd_circuit_breakers_lock:
+        circuit_breaker: dict = get_circuit_breaker(config)
+        circuit_breaker['consecutive_failures'] += 1
+        if circuit_breaker['trial_in_flight'] or circuit_breaker['consecutive_failures'] >= failure_threshold:
+            circuit_breaker.update(
+                state = 'open',
+                opened_at = time.monotonic(),
+                reason = f'Circuit opened after {circuit_breaker['consecutive_failures']} consecutive transport failures: {error}',
+                trial_in_flight = False)
+
+def record_transport_success(config: dict) -> None:
+    with imd_circuit_breakers_lock:
+        get_circuit_breaker(config).update(state = 'closed', consecutive_failures = 0, reason = '', trial_in_flight = False)
+
+def reset_circuit_breaker(config: dict) -> None:
+    imd_ip: str = get_value_if_key_exists(config, 'current_imd_ip') or ''
+    with imd_circuit_breakers_lock:
+        imd_circuit_breakers.pop(imd_ip, None)
@@ -0,0 +1,101 @@
+import hashlib, json, re, threading, validators
+
+from typing import Callable
+
+from utils.dict_utils import get_value_if_key_exists
+
+FormatCallable = Callable[[str, dict], str]
+VerifyCallable = Callable[[str], bool]
+
+format_function_compilers: dict[str, Callable[[list], FormatCallable]] = {
+    'zfill':                    lambda format_function: lambda value, config_values: value.zfill(format_function[1]),
+    'lower':                    lambda format_function: lambda value, config_values: value.lower(),
+    'upper':                    lambda format_function: lambda value, config_values: value.upper(),
+    'replace':                  lambda format_function: lambda value, config_values: value.replace(format_function[1], format_function[2]),
+    'apply_string_template':    lambda format_function: lambda value, config_values: format_function[1].format(**config_values)
+}
+
+def is_int(value: str) -> bool:
+    try:
+        return type(int(value)) == int
+    except ValueError:
+        return False
+
+valid_username_regex: re.Pattern = re.compile(r'[a-zA-Z][a-zA-Z0-9-_]{0,31}')
+
+verify_function_compilers: dict[str, Callable[[list], VerifyCallable]] = {
+    'is_int':               lambda verify_function: lambda user_input: is_int(user_input.strip()),
+    'is_one_of':            lambda verify_function: lambda user_input: user_input.strip().lower() in verify_function[1],
+    'is_between':           lambda verify_function: lambda user_input: int(verify_function[1]) <= len(user_input) <= int(verify_function[2]),
+    'is_hostname':          lambda verify_function: lambda user_input: bool(validators.hostname(user_input.strip())),
+    'is_domain_name':       lambda verify_function: lambda user_input: bool(validators.domain(user_input.strip())),
+    'is_valid_username':    lambda verify_function: lambda user_input: bool(valid_username_regex.fullmatch(user_input.strip()))
+}
+
+compiled_functions: dict[str, FormatCallable | VerifyCallable] = {}
+compiled_prompts: dict[str, dict] = {}
+compiled_functions_lock: threading.Lock = threading.Lock()
+
+def get_prompts_hash(prompts: dict) -> str:
+    return hashlib.sha256(json.dumps(prompts, sort_keys = True).encode()).hexdigest()
+
+def get_function_compiler(function_compilers: dict, function: list, function_type: str) -> Callable:
+    if function[0] not in function_compilers.keys():
+        raise ValueError(f'Unknown {function_type} function \'{function[0]}\'')
+    return function_compilers[function[0]]
+
+def compose_format_functions(format_callables: list[FormatCallable]) -> FormatCallable:
+    def run_format_functions(value: str, config_values: dict) -> str:
+        for format_callable in format_callables:
+            value = format_callable(value, config_values)
+        return value
+
+    return run_format_functions
+
+def compose_verify_functions(verify_callables: list[VerifyCallable]) -> VerifyCallable:
+    def run_verify_functions(user_input: str) -> bool:
+        return all(verify_callable(user_input) for verify_callable in verify_callables)
+
+    return run_verify_functions
+
+def get_compiled_functions(functions: list[list], function_type: str) -> Callable:
+    compiled_functions_key: str = f'{function_type}:{json.dumps(functions)}'
+    with compiled_functions_lock:
+        if compiled_functions_key in compiled_functions.keys():
+            return compiled_functions[compiled_functions_key]
+    function_compilers: dict = format_function_compilers if function_type == 'format' else verify_function_compilers
+    callables: list[Callable] = [
+        get_function_compiler(function_compilers, function, function_type)(function)
+        for function in functions if bool(function) ]
+    composed_callable: Callable = compose_format_functions(callables) if function_type == 'format' else compose_verify_functions(callables)
+    with compiled_functions_lock:
+        compiled_functions[compiled_functions_key] = composed_callable
+
+    return composed_callable
+
+def get_compiled_format_functions(format_functions: list[list]) -> FormatCallable:
+    return get_compiled_functions(format_functions, 'format')
+
+def get_compiled_verify_functions(verify_functions: list[list]) -> VerifyCallable:
+    return get_compiled_functions(verify_functions, 'verify')
+
+def compile_config_item_functions(config_item: dict) -> dict:
+    try:
+        return {
+            'format': get_compiled_format_functions(get_value_if_key_exists(config_item, 'format_functions') or []),
+            'verify': get_compiled_verify_functions(get_value_if_key_exists(config_item, 'verify_functions') or [])
+        }
+    except ValueError as compile_error:
+        raise ValueError(f'{compile_error} in \'{get_value_if_key_exists(config_item, 'config_item')}\'')
+
+def compile_prompts(prompts: dict) -> dict[str, dict]:
+    prompts_hash: str = get_prompts_hash(prompts)
+    with compiled_functions_lock:
+        if prompts_hash in compiled_prompts.keys():
+            return compiled_prompts[prompts_hash]
+    config_items: list[dict] = (get_value_if_key_exists(prompts, 'prompts') or []) + (get_value_if_key_exists(prompts, 'formatters') or [])
+    compiled_config_items: dict[str, dict] = { config_item['config_item']: compile_config_item_functions(config_item) for config_item in config_items }
+    with compiled_functions_lock:
+        compiled_prompts[prompts_hash] = compiled_config_items
+
+    return compiled_config_items
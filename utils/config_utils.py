@@ -2,10 +2,11 @@ import json, os, shutil
 
 from argparse import Namespace
 
+from utils.compile_utils import compile_prompts
 from utils.dict_utils import get_value_if_key_exists, get_values_if_keys_exist
 from utils.encryption_utils import encrypt, decrypt
 from utils.format_utils import format_red, format_blue, format_bold
-from utils.parse_utils import parse_firmware_url, verify_input, contains_unspecified_defaults
+from utils.parse_utils import parse_api_call_data, parse_firmware_url, verify_input, contains_unspecified_defaults
 from utils.prompt_utils import confirm, enumerate_options, get_input
 from utils.sys_utils import exit_with_code
 from utils.time_utils import get_file_modification_time
@@ -65,6 +66,11 @@ def get_prompts_file_contents(config: dict) -> tuple:
         prompts_file_path: str = os.path.join(config_files_path, prompts_filename)
         with open(prompts_file_path, 'r') as prompts_file:
             prompts_file_contents: dict = json.load(prompts_file)
+        try:
+            compile_prompts(prompts_file_contents)
+        except ValueError as compile_error:
+            print(format_red(f'Invalid prompts file \'{prompts_filename}\': {compile_error}.'))
+            exit_with_code(1)
     else:
         return (False, False, False)
 
@@ -151,17 +157,19 @@ def get_config(main_file: str, args: Namespace, quiet: bool = True) -> dict:
             "parsed_firmware_url": parsed_firmware_url,
             "interactive_prompts_filename": prompts_filename,
             "config_files_path": config_files_path,
+            "snapshots_path": os.path.join(script_path, 'snapshots'),
+            "inventories_path": os.path.join(script_path, 'inventories'),
+            "reboot_history_path": os.path.join(config_files_path, 'reboot_history.json'),
             "display_greeting": False if is_first_run else True,
             "spinner": spinner,
-            "api_attempts": initial_config['default_api_attempts'],
-            "api_retry_time": initial_config['default_api_retry_time']
+            "api_attempts": initial_config['default_api_attempts']
             }
 
         return finished_config
 
 def get_credentials_from_imd_config(config: dict, imd_config: list[dict]) -> tuple[str, str]:
     credentials_config_item: dict = [ config_item for config_item in imd_config if config_item['config_item'] == 'credentials' ][0]
-    data: dict = json.loads(credentials_config_item['api_calls'][0]['data'].replace('\'', '\"'))
+    data: dict = parse_api_call_data(config, credentials_config_item['api_calls'][0]['data'])
     username, password = data['username'], data['password']
 
     return username, password
@@ -0,0 +1,115 @@
+import ipaddress, json, os, time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.api_utils import forget_imd_state, interact_with_imd
+from utils.dict_utils import get_value_if_key_exists
+from utils.fleet_utils import get_imd_config
+from utils.format_utils import format_blue, format_bold, format_green, format_red
+from utils.network_utils import get_readiness_probe, probe_hosts
+from utils.parse_utils import is_valid_firmware_version
+
+default_discovery: dict = {
+    'port': 443,
+    'timeout': 0.5,
+    'concurrency': 256,
+    'fingerprint_concurrency': 32,
+    'fingerprint_timeout': 3,
+    'max_addresses': 65536
+}
+inventory_time_format: str = '%Y%m%d-%H%M%S'
+
+def get_discovery_settings(config: dict) -> dict:
+    discovery: dict = get_value_if_key_exists(config, 'discovery') or {}
+    return {**default_discovery, **discovery}
+
+def format_discovery_address(address: ipaddress.IPv4Address | ipaddress.IPv6Address, port: int) -> str:
+    host: str = f'[{address}]' if address.version == 6 else str(address)
+    return host if port == 443 else f'{host}:{port}'
+
+def get_discovery_addresses(config: dict, cidrs: list[str]) -> list[str]:
+    discovery: dict = get_discovery_settings(config)
+    networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network] = [ ipaddress.ip_network(cidr.strip(), strict = False) for cidr in cidrs ]
+    address_count: int = sum(network.num_addresses for network in networks)
+    if address_count > discovery['max_addresses']:
+        raise ValueError(f'{address_count} addresses requested, the discovery limit is {discovery['max_addresses']}')
+    addresses: dict[str, None] = {}
+    for network in networks:
+        network_hosts = network.hosts() if network.num_addresses > 1 else [network.network_address]
+        for address in network_hosts:
+            addresses[format_discovery_address(address, discovery['port'])] = None
+
+    return list(addresses.keys())
+
+def find_listening_addresses(config: dict, addresses: list[str]) -> list[str]:
+    discovery: dict = get_discovery_settings(config)
+    probe_config: dict = {**config, 'readiness_probe': {
+        **get_readiness_probe(config),
+        'method': 'tcp',
+        'port': discovery['port'],
+        'timeout': discovery['timeout'],
+        'concurrency': discovery['concurrency']
+    }}
+    probe_results: dict[str, bool] = probe_hosts(probe_config, addresses)
+
+    return [ address for address in addresses if probe_results[address] ]
+
+def get_imd_fingerprint(config: dict, imd_ip: str) -> dict | None:
+    fingerprint_timeout: float = get_discovery_settings(config)['fingerprint_timeout']
+    request_timeouts: dict = {**(get_value_if_key_exists(config, 'request_timeouts') or {}), 'version': [fingerprint_timeout, fingerprint_timeout], 'config': [fingerprint_timeout, fingerprint_timeout]}
+    imd_config: dict = {**get_imd_config(config, imd_ip), 'api_attempts': 1, 'request_timeouts': request_timeouts}
+    try:
+        version_response: dict | bool = interact_with_imd(imd_config, 'sys/version', {}, '', '', 'get', quiet = True) #type: ignore[assignment]
+        if type(version_response) != dict or version_response['retCode'] != 0: #type: ignore[index]
+            return None
+        firmware_version: str | bool = get_value_if_key_exists(version_response, 'data')
+        if type(firmware_version) != str or not is_valid_firmware_version(config, firmware_version):
+            return None
+        admin_response: dict | bool = interact_with_imd(imd_config, 'sys/state/adminExists', {}, '', '', 'get', quiet = True) #type: ignore[assignment]
+        admin_exists: bool | None = bool(admin_response['data']) if type(admin_response) == dict and admin_response['retCode'] == 0 else None #type: ignore[index]
+    finally:
+        forget_imd_state(imd_config)
+
+    return {
+        'imd_ip': imd_ip,
+        'firmware_version': firmware_version,
+        'admin_exists': admin_exists
+    }
+
+def fingerprint_imds(config: dict, addresses: list[str]) -> list[dict]:
+    if not bool(addresses): return []
+    fingerprint_concurrency: int = min(get_discovery_settings(config)['fingerprint_concurrency'], len(addresses))
+    with ThreadPoolExecutor(max_workers = fingerprint_concurrency) as executor:
+        imd_fingerprints: list[dict | None] = list(executor.map(lambda address: get_imd_fingerprint(config, address), addresses))
+
+    return [ imd_fingerprint for imd_fingerprint in imd_fingerprints if imd_fingerprint is not None ]
+
+def get_inventory_file_path(config: dict) -> str:
+    return os.path.join(config['inventories_path'], f'inventory_{time.strftime(inventory_time_format)}.json')
+
+def write_inventory(inventory_file_path: str, inventory: list[dict]) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(inventory_file_path)), exist_ok = True)
+    with open(inventory_file_path, 'w') as inventory_file:
+        json.dump(inventory, inventory_file, indent = 4)
+
+    return inventory_file_path
+
+def discover_imds(config: dict, cidrs: list[str], inventory_file_path: str = '', quiet: bool = False) -> list[dict]:
+    start_time: float = time.monotonic()
+    try:
+        addresses: list[str] = get_discovery_addresses(config, cidrs)
+    except ValueError as address_error:
+        if not quiet: print(format_red(f'Unable to sweep {', '.join(cidrs)}: {address_error}.'))
+        return []
+    if not quiet: print(format_bold(f'Sweeping {len(addresses)} addresses in {', '.join(cidrs)}...'))
+    listening_addresses: list[str] = find_listening_addresses(config, addresses)
+    if not quiet: print(f'{len(listening_addresses)} addresses accepted connections on port {get_discovery_settings(config)['port']}. Identifying IMDs...')
+    inventory: list[dict] = fingerprint_imds(config, listening_addresses)
+    inventory_file_path = write_inventory(inventory_file_path or get_inventory_file_path(config), inventory)
+    if not quiet:
+        for imd in inventory:
+            admin_status: str = 'admin configured' if imd['admin_exists'] else 'no admin' if imd['admin_exists'] is False else 'admin status unknown'
+            print(f'{format_green('✔')} IMD at {format_blue(imd['imd_ip'])}: firmware {imd['firmware_version']}, {admin_status}.')
+        print(f'\nFound {len(inventory)} IMDs in {round(time.monotonic() - start_time, 1)} s. Inventory written to \'{format_blue(inventory_file_path)}\'.')
+
+    return inventory
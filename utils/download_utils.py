@@ -0,0 +1,245 @@
+import json, math, os, re, requests, threading, time #type: ignore[import-untyped]
+from concurrent.futures import as_completed, Future, ThreadPoolExecutor
+from tqdm.auto import tqdm #type: ignore[import-untyped]
+from typing import BinaryIO
+
+from utils.dict_utils import get_value_if_key_exists
+from utils.firmware_cache_utils import hash_file
+from utils.format_utils import format_yellow
+from utils.retry_utils import get_retry_delay
+from utils.trace_utils import trace_span
+
+default_download: dict = {
+    'attempts': 8,
+    'base_delay': 1,
+    'multiplier': 2,
+    'max_delay': 30,
+    'jitter': 0.5,
+    'chunk_size': 1048576,
+    'segments': 1,
+    'min_segment_size': 4194304
+}
+
+class IncompleteDownloadError(Exception):
+    pass
+
+class SegmentedDownloadError(Exception):
+    pass
+
+class DownloadHashError(Exception):
+    pass
+
+def get_download_settings(config: dict) -> dict:
+    download: dict = get_value_if_key_exists(config, 'download') or {}
+    return {**default_download, **download}
+
+def get_partial_file_path(destination: str) -> str:
+    return f'{destination}.part'
+
+def get_download_state_path(destination: str) -> str:
+    return f'{destination}.part.json'
+
+def create_download_state(url: str) -> dict:
+    return {'url': url, 'bytes': 0, 'total': None, 'etag': None, 'last_modified': None}
+
+def write_download_state(destination: str, download_state: dict) -> None:
+    download_state_path: str = get_download_state_path(destination)
+    temporary_file_path: str = f'{download_state_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary_file_path, 'w') as download_state_file:
+        json.dump(download_state, download_state_file)
+    os.replace(temporary_file_path, download_state_path)
+
+def load_download_state(destination: str, url: str) -> dict:
+    partial_file_path: str = get_partial_file_path(destination)
+    try:
+        with open(get_download_state_path(destination), 'r') as download_state_file:
+            download_state: dict = json.load(download_state_file)
+    except (OSError, ValueError):
+        return create_download_state(url)
+    if get_value_if_key_exists(download_state, 'url') != url or not os.path.isfile(partial_file_path):
+        return create_download_state(url)
+    download_state['bytes'] = min(download_state['bytes'], os.path.getsize(partial_file_path))
+    os.truncate(partial_file_path, download_state['bytes'])
+
+    return download_state
+
+def remove_download_state(destination: str) -> None:
+    for file_path in [get_partial_file_path(destination), get_download_state_path(destination)]:
+        if os.path.isfile(file_path): os.remove(file_path)
+
+def get_resume_validator(download_state: dict) -> str | None:
+    etag: str | None = download_state['etag']
+    if etag is not None and not etag.startswith('W/'): return etag
+    return download_state['last_modified']
+
+def get_resume_headers(download_state: dict) -> dict:
+    resume_validator: str | None = get_resume_validator(download_state)
+    if download_state['bytes'] == 0 or resume_validator is None: return {}
+    return {'Range': f'bytes={download_state['bytes']}-', 'If-Range': resume_validator}
+
+def get_content_range_start(download_response: requests.Response) -> int | None:
+    content_range_match = re.match(r'bytes (\d+)-\d+/(\d+|\*)', download_response.headers.get('Content-Range', ''))
+    return int(content_range_match.group(1)) if content_range_match else None
+
+def restart_download_state(download_state: dict, download_response: requests.Response) -> None:
+    content_length: str | None = download_response.headers.get('Content-Length')
+    download_state.update({
+        'bytes': 0,
+        'total': int(content_length) if content_length is not None else None,
+        'etag': download_response.headers.get('ETag'),
+        'last_modified': download_response.headers.get('Last-Modified')
+    })
+
+def download_remaining_bytes(config: dict, url: str, destination: str, download_state: dict, progress_bar: tqdm, headers: dict = {}) -> None:
+    download_settings: dict = get_download_settings(config)
+    request_headers: dict = {**headers, 'Accept-Encoding': 'identity', **get_resume_headers(download_state)}
+    with requests.get(url, headers = request_headers, stream = True, allow_redirects = True, timeout = get_value_if_key_exists(config, 'download_timeout') or 10) as download_response:
+        if download_response.status_code == 416 and download_state['bytes'] == download_state['total']:
+            return
+        if download_response.status_code == 416:
+            download_state['bytes'] = 0
+            raise IncompleteDownloadError('Server rejected the resume range, restarting the download')
+        if download_response.status_code == 206 and get_content_range_start(download_response) != download_state['bytes']:
+            raise IncompleteDownloadError(f'Server resumed at {download_response.headers.get('Content-Range')} instead of byte {download_state['bytes']}')
+        if download_response.status_code not in [200, 206]:
+            download_response.raise_for_status()
+            raise IncompleteDownloadError(f'Unexpected response while downloading: {download_response.status_code}')
+        if download_response.status_code == 200:
+            restart_download_state(download_state, download_response)
+            progress_bar.reset(total = download_state['total'])
+        with open(get_partial_file_path(destination), 'r+b' if download_state['bytes'] > 0 else 'wb') as partial_file:
+            partial_file.seek(download_state['bytes'])
+            for chunk in download_response.iter_content(chunk_size = download_settings['chunk_size']):
+                partial_file.write(chunk)
+                partial_file.flush()
+                download_state['bytes'] += len(chunk)
+                write_download_state(destination, download_state)
+                progress_bar.update(len(chunk))
+    if download_state['total'] is not None and download_state['bytes'] < download_state['total']:
+        raise IncompleteDownloadError(f'Connection closed after {download_state['bytes']} of {download_state['total']} bytes')
+
+def download_is_retryable(download_error: Exception) -> bool:
+    if isinstance(download_error, requests.exceptions.HTTPError) and download_error.response is not None:
+        return download_error.response.status_code >= 500 or download_error.response.status_code in [408, 429]
+    return isinstance(download_error, (requests.exceptions.RequestException, IncompleteDownloadError))
+
+def download_single_stream(config: dict, url: str, destination: str, headers: dict = {}, quiet: bool = False) -> str:
+    download_settings: dict = get_download_settings(config)
+    download_state: dict = load_download_state(destination, url)
+    if download_state['bytes'] > 0 and not quiet: print(f'Resuming download at {download_state['bytes']} bytes.')
+    desc: str = '(Unknown total file size)' if download_state['total'] is None and download_state['bytes'] == 0 else ''
+    with tqdm(total = download_state['total'], initial = download_state['bytes'], unit = 'B', unit_scale = True, desc = desc, disable = quiet) as progress_bar:
+        for attempt in range(1, download_settings['attempts'] + 1):
+            try:
+                with trace_span(config, 'download', 'http', url = url, attempt = attempt, resumed_at = download_state['bytes']):
+                    download_remaining_bytes(config, url, destination, download_state, progress_bar, headers)
+                break
+            except (requests.exceptions.RequestException, IncompleteDownloadError) as download_error:
+                if not download_is_retryable(download_error) or attempt == download_settings['attempts']: raise
+                retry_delay: float = get_retry_delay(download_settings, attempt)
+                if not quiet: progress_bar.write(format_yellow(f'Download interrupted at {download_state['bytes']} bytes ({download_error}). Resuming in {retry_delay:.1f} s.'))
+                with trace_span(config, 'download_retry_sleep', 'sleep', attempt = attempt, seconds = round(retry_delay, 3)):
+                    time.sleep(retry_delay)
+    os.replace(get_partial_file_path(destination), destination)
+    remove_download_state(destination)
+
+    return destination
+
+def get_segmented_file_path(destination: str) -> str:
+    return f'{destination}.segments.part'
+
+def get_ranged_download_details(config: dict, url: str, headers: dict = {}) -> dict:
+    request_headers: dict = {**headers, 'Accept-Encoding': 'identity', 'Range': 'bytes=0-0'}
+    with requests.get(url, headers = request_headers, stream = True, allow_redirects = True, timeout = get_value_if_key_exists(config, 'download_timeout') or 10) as probe_response:
+        content_range_match = re.match(r'bytes 0-0/(\d+)', probe_response.headers.get('Content-Range', ''))
+        if probe_response.status_code != 206 or content_range_match is None:
+            raise SegmentedDownloadError(f'Server does not support range requests (status {probe_response.status_code})')
+        validator: str | None = get_resume_validator({'etag': probe_response.headers.get('ETag'), 'last_modified': probe_response.headers.get('Last-Modified')})
+
+    return {'url': probe_response.url, 'total': int(content_range_match.group(1)), 'validator': validator}
+
+def get_download_segments(total: int, segments: int, min_segment_size: int) -> list[tuple[int, int]]:
+    segment_count: int = max(min(segments, math.ceil(total / max(min_segment_size, 1))), 1)
+    segment_size: int = math.ceil(total / segment_count)
+    return [ (segment_start, min(segment_start + segment_size, total) - 1) for segment_start in range(0, total, segment_size) ]
+
+def write_at_offset(segmented_file: BinaryIO, segment_lock: threading.Lock, chunk: bytes, offset: int) -> None:
+    if hasattr(os, 'pwrite'):
+        os.pwrite(segmented_file.fileno(), chunk, offset)
+        return
+    with segment_lock:
+        segmented_file.seek(offset)
+        segmented_file.write(chunk)
+
+def download_segment(config: dict, ranged_download: dict, segment: tuple[int, int], segmented_file: BinaryIO, segment_lock: threading.Lock, progress_bar: tqdm, stopped: threading.Event, headers: dict = {}) -> int:
+    download_settings: dict = get_download_settings(config)
+    offset, segment_end = segment
+    for attempt in range(1, download_settings['attempts'] + 1):
+        validator_headers: dict = {'If-Range': ranged_download['validator']} if ranged_download['validator'] is not None else {}
+        request_headers: dict = {**headers, 'Accept-Encoding': 'identity', 'Range': f'bytes={offset}-{segment_end}', **validator_headers}
+        try:
+            with trace_span(config, 'download_segment', 'http', segment_start = segment[0], attempt = attempt, resumed_at = offset):
+                with requests.get(ranged_download['url'], headers = request_headers, stream = True, timeout = get_value_if_key_exists(config, 'download_timeout') or 10) as segment_response:
+                    if segment_response.status_code != 206 or get_content_range_start(segment_response) != offset:
+                        raise SegmentedDownloadError(f'Server answered the range {offset}-{segment_end} with status {segment_response.status_code}')
+                    for chunk in segment_response.iter_content(chunk_size = download_settings['chunk_size']):
+                        if stopped.is_set(): return offset - segment[0]
+                        chunk = chunk[:segment_end + 1 - offset]
+                        write_at_offset(segmented_file, segment_lock, chunk, offset)
+                        offset += len(chunk)
+                        with segment_lock: progress_bar.update(len(chunk))
+            if offset <= segment_end:
+                raise IncompleteDownloadError(f'Connection closed {segment_end + 1 - offset} bytes before the end of the segment')
+            return offset - segment[0]
+        except (requests.exceptions.RequestException, IncompleteDownloadError) as segment_error:
+            if not download_is_retryable(segment_error) or attempt == download_settings['attempts'] or stopped.is_set(): raise
+            retry_delay: float = get_retry_delay(download_settings, attempt)
+            with trace_span(config, 'download_retry_sleep', 'sleep', attempt = attempt, seconds = round(retry_delay, 3)):
+                stopped.wait(retry_delay)
+
+    return offset - segment[0]
+
+def download_segmented(config: dict, url: str, destination: str, expected_sha256: str, headers: dict = {}, quiet: bool = False) -> str:
+    download_settings: dict = get_download_settings(config)
+    ranged_download: dict = get_ranged_download_details(config, url, headers)
+    download_segments: list[tuple[int, int]] = get_download_segments(ranged_download['total'], download_settings['segments'], download_settings['min_segment_size'])
+    segmented_file_path: str = get_segmented_file_path(destination)
+    segment_lock: threading.Lock = threading.Lock()
+    stopped: threading.Event = threading.Event()
+    try:
+        with open(segmented_file_path, 'wb') as segmented_file, \
+            tqdm(total = ranged_download['total'], unit = 'B', unit_scale = True, desc = f'{len(download_segments)} segments', disable = quiet) as progress_bar:
+            segmented_file.truncate(ranged_download['total'])
+            with ThreadPoolExecutor(max_workers = len(download_segments)) as executor:
+                segment_futures: list[Future] = [ executor.submit(download_segment, config, ranged_download, segment, segmented_file, segment_lock, progress_bar, stopped, headers) for segment in download_segments ]
+                for segment_future in as_completed(segment_futures):
+                    if segment_future.exception() is not None: stopped.set()
+                assembled_bytes: int = sum(segment_future.result() for segment_future in segment_futures)
+        if assembled_bytes != ranged_download['total'] or os.path.getsize(segmented_file_path) != ranged_download['total']:
+            raise SegmentedDownloadError(f'Assembled {assembled_bytes} of {ranged_download['total']} bytes')
+        if hash_file(segmented_file_path) != expected_sha256.lower():
+            raise SegmentedDownloadError(f'Assembled file does not match SHA-256 {expected_sha256}')
+        os.replace(segmented_file_path, destination)
+    finally:
+        if os.path.isfile(segmented_file_path): os.remove(segmented_file_path)
+
+    return destination
+
+def download_file(config: dict, url: str, destination: str, headers: dict = {}, quiet: bool = False, expected_sha256: str | None = None, previous_sha256: str | None = None) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok = True)
+    single_stream_in_progress: bool = load_download_state(destination, url)['bytes'] > 0
+    segmented_sha256: str | None = expected_sha256 or previous_sha256
+    segments_requested: bool = get_download_settings(config)['segments'] > 1 and not single_stream_in_progress
+    if segments_requested and segmented_sha256 is None and not quiet:
+        print(format_yellow('No SHA-256 hash is known for this download to check the assembled segments against. Downloading as a single stream.'))
+    if segments_requested and segmented_sha256 is not None:
+        try:
+            return download_segmented(config, url, destination, segmented_sha256, headers, quiet)
+        except (requests.exceptions.RequestException, IncompleteDownloadError, SegmentedDownloadError) as segmented_download_error:
+            if not quiet: print(format_yellow(f'Segmented download failed ({segmented_download_error}). Downloading as a single stream.'))
+    download_single_stream(config, url, destination, headers, quiet)
+    if expected_sha256 is not None and hash_file(destination) != expected_sha256.lower():
+        os.remove(destination)
+        raise DownloadHashError(f'Downloaded file does not match SHA-256 {expected_sha256}')
+
+    return destination
@@ -0,0 +1,89 @@
+import json, math, os, threading
+
+from utils.dict_utils import get_value_if_key_exists
+from utils.format_utils import format_blue
+from utils.reboot_utils import get_reboot_wait_settings, wait_for_imd_reboot
+
+default_reboot_history: dict = {
+    'max_samples': 20,
+    'percentile': 50
+}
+
+reboot_history_lock: threading.Lock = threading.Lock()
+
+def get_reboot_history_settings(config: dict) -> dict:
+    reboot_history: dict = get_value_if_key_exists(config, 'reboot_history') or {}
+    return {**default_reboot_history, **reboot_history}
+
+def get_reboot_history_key(operation: str, from_version: str | None, to_version: str | None) -> str:
+    return f'{operation} {from_version or 'unknown'} -> {to_version or 'unknown'}'
+
+def load_reboot_history(config: dict) -> dict[str, list[float]]:
+    reboot_history_path: str | bool = get_value_if_key_exists(config, 'reboot_history_path')
+    if not bool(reboot_history_path) or not os.path.isfile(reboot_history_path): #type: ignore[arg-type]
+        return {}
+    try:
+        with open(reboot_history_path, 'r') as reboot_history_file: #type: ignore[arg-type]
+            reboot_history: dict = json.load(reboot_history_file)
+    except (OSError, ValueError):
+        return {}
+
+    return reboot_history if type(reboot_history) == dict else {}
+
+def write_reboot_history(reboot_history_path: str, reboot_history: dict[str, list[float]]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(reboot_history_path)), exist_ok = True)
+    temporary_file_path: str = f'{reboot_history_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary_file_path, 'w') as reboot_history_file:
+        json.dump(reboot_history, reboot_history_file, indent = 4)
+    os.replace(temporary_file_path, reboot_history_path)
+
+def record_reboot_duration(config: dict, operation: str, from_version: str | None, to_version: str | None, seconds: float) -> None:
+    reboot_history_path: str | bool = get_value_if_key_exists(config, 'reboot_history_path')
+    if not bool(reboot_history_path): return
+    max_samples: int = get_reboot_history_settings(config)['max_samples']
+    reboot_history_key: str = get_reboot_history_key(operation, from_version, to_version)
+    with reboot_history_lock:
+        reboot_history: dict[str, list[float]] = load_reboot_history(config)
+        durations: list[float] = reboot_history.get(reboot_history_key, []) + [round(seconds, 3)]
+        reboot_history[reboot_history_key] = durations[-max_samples:]
+        write_reboot_history(reboot_history_path, reboot_history) #type: ignore[arg-type]
+
+def get_percentile(samples: list[float], percentile: float) -> float:
+    sorted_samples: list[float] = sorted(samples)
+    rank: float = (len(sorted_samples) - 1) * percentile / 100
+    lower_sample, upper_sample = sorted_samples[math.floor(rank)], sorted_samples[math.ceil(rank)]
+    return lower_sample + (upper_sample - lower_sample) * (rank - math.floor(rank))
+
+def get_reboot_duration_samples(reboot_history: dict[str, list[float]], operation: str, from_version: str | None, to_version: str | None) -> tuple[list[float], str]:
+    exact_samples: list[float] = reboot_history.get(get_reboot_history_key(operation, from_version, to_version), [])
+    if bool(exact_samples): return exact_samples, get_reboot_history_key(operation, from_version, to_version)
+    target_suffix: str = f' -> {to_version or 'unknown'}'
+    target_samples: list[float] = [ seconds for key, durations in reboot_history.items() if key.startswith(f'{operation} ') and key.endswith(target_suffix) for seconds in durations ]
+    if bool(target_samples): return target_samples, f'{operation} to {to_version or 'unknown'}'
+    operation_samples: list[float] = [ seconds for key, durations in reboot_history.items() if key.startswith(f'{operation} ') for seconds in durations ]
+
+    return operation_samples, operation
+
+def estimate_reboot_seconds(config: dict, operation: str, from_version: str | None, to_version: str | None) -> dict:
+    with reboot_history_lock:
+        reboot_history: dict[str, list[float]] = load_reboot_history(config)
+    samples, basis = get_reboot_duration_samples(reboot_history, operation, from_version, to_version)
+    if not bool(samples):
+        return {'expected_seconds': get_reboot_wait_settings(config)['expected_seconds'], 'samples': 0, 'basis': 'default'}
+    percentile: float = get_reboot_history_settings(config)['percentile']
+
+    return {'expected_seconds': round(get_percentile(samples, percentile), 1), 'samples': len(samples), 'basis': basis}
+
+def format_reboot_estimate(reboot_estimate: dict) -> str:
+    if reboot_estimate['samples'] == 0:
+        return f'about {format_blue(reboot_estimate['expected_seconds'])} s (no history yet)'
+    return f'about {format_blue(reboot_estimate['expected_seconds'])} s (from {reboot_estimate['samples']} previous {reboot_estimate['basis']} reboots)'
+
+def wait_for_imd_reboot_with_history(config: dict, operation: str, from_version: str | None, to_version: str | None, target_firmware_version: str | None = None, quiet: bool = True) -> dict:
+    reboot_estimate: dict = estimate_reboot_seconds(config, operation, from_version, to_version)
+    if not quiet: print(f'Expecting the IMD back in {format_reboot_estimate(reboot_estimate)}.')
+    reboot_result: dict = wait_for_imd_reboot(config, target_firmware_version, reboot_estimate['expected_seconds'])
+    if reboot_result['succeeded']:
+        record_reboot_duration(config, operation, from_version, to_version, reboot_result['elapsed_seconds'])
+
+    return {**reboot_result, 'expected_seconds': reboot_estimate['expected_seconds']}
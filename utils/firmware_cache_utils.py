@@ -0,0 +1,138 @@
+import hashlib, json, os, re, shutil, tempfile, threading
+
+from utils.dict_utils import get_value_if_key_exists
+
+firmware_cache_index_filename: str = 'index.json'
+
+firmware_cache_lock: threading.Lock = threading.Lock()
+
+def get_firmware_cache_path(config: dict) -> str:
+    firmware_cache_path: str | bool = get_value_if_key_exists(config, 'firmware_cache_path')
+    if bool(firmware_cache_path): return os.path.expanduser(firmware_cache_path) #type: ignore[arg-type]
+    cache_home: str = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'vg_imd_config', 'firmware')
+
+def get_firmware_identity(config: dict) -> dict:
+    parsed_firmware_url: dict = config['parsed_firmware_url']
+    return {
+        'url': parsed_firmware_url['url'],
+        'version': get_value_if_key_exists(config, 'firmware_target') or None,
+        'model': re.sub(r'-\d+_\d+_\d+\.firmware$', '', parsed_firmware_url['firmware_filename'])
+    }
+
+def hash_file(file_path: str) -> str:
+    with open(file_path, 'rb') as hashed_file:
+        return hashlib.file_digest(hashed_file, 'sha256').hexdigest()
+
+def load_firmware_cache_index(firmware_cache_path: str) -> dict:
+    try:
+        with open(os.path.join(firmware_cache_path, firmware_cache_index_filename), 'r') as index_file:
+            firmware_cache_index: dict = json.load(index_file)
+    except (OSError, ValueError):
+        return {'entries': []}
+
+    return firmware_cache_index if type(get_value_if_key_exists(firmware_cache_index, 'entries')) == list else {'entries': []}
+
+def write_firmware_cache_index(firmware_cache_path: str, firmware_cache_index: dict) -> None:
+    os.makedirs(firmware_cache_path, exist_ok = True)
+    index_file_path: str = os.path.join(firmware_cache_path, firmware_cache_index_filename)
+    temporary_file_path: str = f'{index_file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary_file_path, 'w') as index_file:
+        json.dump(firmware_cache_index, index_file, indent = 4)
+    os.replace(temporary_file_path, index_file_path)
+
+def get_cached_file_record(firmware_cache_path: str, cached_file_path: str, sha256: str) -> dict:
+    cached_file_stat: os.stat_result = os.stat(cached_file_path)
+    return {
+        'path': os.path.relpath(cached_file_path, firmware_cache_path),
+        'sha256': sha256,
+        'size': cached_file_stat.st_size,
+        'mtime': cached_file_stat.st_mtime_ns
+    }
+
+def add_file_to_firmware_cache(firmware_cache_path: str, file_path: str, move: bool = False) -> dict:
+    sha256: str = hash_file(file_path)
+    cached_file_directory: str = os.path.join(firmware_cache_path, 'objects', sha256)
+    cached_file_path: str = os.path.join(cached_file_directory, os.path.basename(file_path))
+    os.makedirs(cached_file_directory, exist_ok = True)
+    if os.path.isfile(cached_file_path) and move:
+        os.remove(file_path)
+    elif move:
+        os.replace(file_path, cached_file_path)
+    elif not os.path.isfile(cached_file_path):
+        shutil.copy2(file_path, cached_file_path)
+
+    return get_cached_file_record(firmware_cache_path, cached_file_path, sha256)
+
+def cached_file_is_valid(firmware_cache_path: str, cached_file_record: dict | None) -> bool:
+    if cached_file_record is None: return False
+    cached_file_path: str = os.path.join(firmware_cache_path, cached_file_record['path'])
+    if not os.path.isfile(cached_file_path): return False
+    cached_file_stat: os.stat_result = os.stat(cached_file_path)
+    if cached_file_stat.st_size != cached_file_record['size']: return False
+    if cached_file_stat.st_mtime_ns == cached_file_record['mtime']: return True
+    if hash_file(cached_file_path) != cached_file_record['sha256']: return False
+    cached_file_record['mtime'] = cached_file_stat.st_mtime_ns
+
+    return True
+
+def find_firmware_cache_entry(firmware_cache_index: dict, firmware_identity: dict) -> dict | None:
+    url_entries: list[dict] = [ entry for entry in firmware_cache_index['entries'] if entry['url'] == firmware_identity['url'] ]
+    version_entries: list[dict] = [ entry for entry in firmware_cache_index['entries']
+        if entry['version'] == firmware_identity['version'] and entry['model'] == firmware_identity['model'] and firmware_identity['version'] is not None ]
+
+    return (url_entries + version_entries + [None])[0]
+
+def record_firmware_cache_entry(firmware_cache_path: str, firmware_identity: dict, archive_record: dict | None, firmware_record: dict) -> None:
+    with firmware_cache_lock:
+        firmware_cache_index: dict = load_firmware_cache_index(firmware_cache_path)
+        firmware_cache_index['entries'] = [ entry for entry in firmware_cache_index['entries'] if entry['url'] != firmware_identity['url'] ]
+        firmware_cache_index['entries'].append({**firmware_identity, 'archive': archive_record, 'firmware': firmware_record})
+        write_firmware_cache_index(firmware_cache_path, firmware_cache_index)
+
+def extract_firmware_from_archive(firmware_cache_path: str, archive_file_path: str, firmware_filename: str) -> dict | None:
+    os.makedirs(firmware_cache_path, exist_ok = True)
+    with tempfile.TemporaryDirectory(dir = firmware_cache_path) as extraction_path:
+        shutil.unpack_archive(archive_file_path, extraction_path)
+        extracted_file_paths: list[str] = [ os.path.join(directory, filename) for directory, _, filenames in os.walk(extraction_path) for filename in filenames ]
+        firmware_file_paths: list[str] = [ file_path for file_path in extracted_file_paths if os.path.basename(file_path) == firmware_filename ] \
+            or [ file_path for file_path in extracted_file_paths if file_path.endswith('.firmware') ]
+        if not bool(firmware_file_paths): return None
+        return add_file_to_firmware_cache(firmware_cache_path, firmware_file_paths[0], move = True)
+
+def cache_firmware_files(config: dict, archive_file_path: str | None = None, firmware_file_path: str | None = None, move: bool = False) -> str | None:
+    firmware_cache_path: str = get_firmware_cache_path(config)
+    archive_record: dict | None = add_file_to_firmware_cache(firmware_cache_path, archive_file_path, move) if archive_file_path is not None else None
+    firmware_record: dict | None = None
+    if firmware_file_path is not None:
+        firmware_record = add_file_to_firmware_cache(firmware_cache_path, firmware_file_path, move)
+    elif archive_record is not None:
+        firmware_record = extract_firmware_from_archive(firmware_cache_path, os.path.join(firmware_cache_path, archive_record['path']), config['parsed_firmware_url']['firmware_filename'])
+    if firmware_record is None: return None
+    record_firmware_cache_entry(firmware_cache_path, get_firmware_identity(config), archive_record, firmware_record)
+
+    return os.path.join(firmware_cache_path, firmware_record['path'])
+
+def get_cached_archive_sha256(config: dict) -> str | None:
+    with firmware_cache_lock:
+        firmware_cache_index: dict = load_firmware_cache_index(get_firmware_cache_path(config))
+    archive_records: list[dict] = [ entry['archive'] for entry in firmware_cache_index['entries'] if entry['url'] == config['firmware_file_url'] and entry['archive'] is not None ]
+    return archive_records[0]['sha256'] if bool(archive_records) else None
+
+def get_cached_firmware_file_path(config: dict) -> str | None:
+    firmware_cache_path: str = get_firmware_cache_path(config)
+    firmware_identity: dict = get_firmware_identity(config)
+    with firmware_cache_lock:
+        firmware_cache_index: dict = load_firmware_cache_index(firmware_cache_path)
+        firmware_cache_entry: dict | None = find_firmware_cache_entry(firmware_cache_index, firmware_identity)
+        if firmware_cache_entry is None: return None
+        loaded_firmware_cache_entry: str = json.dumps(firmware_cache_entry)
+        firmware_is_valid: bool = cached_file_is_valid(firmware_cache_path, firmware_cache_entry['firmware'])
+        archive_is_valid: bool = not firmware_is_valid and cached_file_is_valid(firmware_cache_path, firmware_cache_entry['archive'])
+        if json.dumps(firmware_cache_entry) != loaded_firmware_cache_entry: write_firmware_cache_index(firmware_cache_path, firmware_cache_index)
+    if firmware_is_valid:
+        return os.path.join(firmware_cache_path, firmware_cache_entry['firmware']['path'])
+    if archive_is_valid:
+        return cache_firmware_files({**config, 'firmware_cache_path': firmware_cache_path}, os.path.join(firmware_cache_path, firmware_cache_entry['archive']['path']))
+
+    return None
@@ -1,70 +1,66 @@
-import functools, os, requests, shutil, sys, time #type: ignore[import-untyped]
+import os, shutil, sys, time
 from halo import Halo #type: ignore[import-untyped]
-from tqdm.auto import tqdm #type: ignore[import-untyped]
+from requests import Response
 
-from utils.api_utils import login_to_imd
+from utils.api_utils import forget_imd_state, login_to_imd
 from utils.dict_utils import get_value_if_key_exists
+from utils.download_utils import download_file
+from utils.eta_utils import wait_for_imd_reboot_with_history
+from utils.firmware_cache_utils import cache_firmware_files, get_cached_archive_sha256, get_cached_firmware_file_path, get_firmware_cache_path
 from utils.format_utils import format_blue, format_red, truncate_message
-from utils.network_utils import wait_for_ping
-from utils.parse_utils import is_valid_firmware_version, version_is_higher
+from utils.metrics_utils import increment_counter, observe_duration
+from utils.network_utils import mark_imd_alive, wait_for_imd
+from utils.parse_utils import is_exactly_zero, is_valid_firmware_version, version_is_higher
 from utils.prompt_utils import confirm, get_credentials
+from utils.reboot_utils import format_reboot_phase_seconds, read_firmware_version
+from utils.session_utils import get_imd_session
 from utils.spinner_utils import get_spinner
+from utils.timeout_utils import get_request_timeout
+from utils.trace_utils import trace_span
 
-def download_and_extract_firmware(config: dict, firmware_download_destination: str, firmware_dir_path) -> bool:
+def download_and_extract_firmware(config: dict, firmware_download_destination: str) -> str | bool:
     firmware_download_url: str = config['firmware_file_url']
     download_headers: dict = {'user-Agent' : 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/51.0.2704.103 Safari/537.36'}
-    download_timeout: int = config['download_timeout']
     try:
-        firmware_request = requests.get(firmware_download_url, headers = download_headers, stream = True, allow_redirects = True, timeout = download_timeout)
-        if firmware_request.status_code != 200:
-            firmware_request.raise_for_status()
-            raise RuntimeError(f'Error while attempting to download firmware file: {firmware_request.status_code}')
-        firmware_file_size: int = int(firmware_request.headers.get('Content-Length', 0))
-        desc: str = '(Unknown total file size)' if firmware_file_size == 0 else ''
-        firmware_request.raw.read = functools.partial(firmware_request.raw.read, decode_content = True) # type: ignore
-        with tqdm.wrapattr(firmware_request.raw, 'read', total = firmware_file_size, desc = desc) as firmware_request_raw:
-            with open(firmware_download_destination, 'wb') as zipped_firmware_file:
-                shutil.copyfileobj(firmware_request_raw, zipped_firmware_file)
-        shutil.unpack_archive(firmware_download_destination, firmware_dir_path)
-        return True
+        download_file(config, firmware_download_url, firmware_download_destination, download_headers,
+            expected_sha256 = get_value_if_key_exists(config, 'firmware_sha256') or None,
+            previous_sha256 = get_cached_archive_sha256(config))
+        cached_firmware_file_path: str | None = cache_firmware_files(config, archive_file_path = firmware_download_destination, move = True)
+        if cached_firmware_file_path is None:
+            raise RuntimeError(f'No {config['parsed_firmware_url']['firmware_filename']} file found in {os.path.basename(firmware_download_destination)}')
+        return cached_firmware_file_path
     except Exception as error:
-        if confirm(config, f'Error downloading firmware file: {error}\n Try again?', error = True):
-                return download_and_extract_firmware(config, firmware_download_destination , firmware_dir_path)
-        else:
-            return False
+        print(format_red(f'Error downloading firmware file: {error}'))
+        return False
 
-def get_firmware_file_path(config: dict) -> tuple[str, str] | tuple[bool, bool]:
+def cache_legacy_firmware_files(config: dict) -> str | None:
     parsed_firmware_url: dict = config['parsed_firmware_url']
     firmware_dir_path: str = f'{sys.argv[0]}/firmware/'
-    bare_filename: str = parsed_firmware_url['bare_filename']
-    firmware_zip_filename: str = parsed_firmware_url['filename']
-    firmware_zip_path: str = f'{firmware_dir_path}/{firmware_zip_filename}'
+    firmware_zip_path: str = f'{firmware_dir_path}{parsed_firmware_url['filename']}'
+    firmware_file_path: str = f'{firmware_dir_path}{parsed_firmware_url['bare_filename']}/{parsed_firmware_url['firmware_filename']}'
     firmware_zip_file_exists: bool = os.path.isfile(firmware_zip_path)
-    firmware_filename: str = parsed_firmware_url['firmware_filename']
-    firmware_file_path: str = f'{firmware_dir_path}{bare_filename}/{firmware_filename}'
     firmware_file_exists: bool = os.path.isfile(firmware_file_path)
-    firmware_download_destination: str = f'{firmware_dir_path}{firmware_zip_filename}'
+    if not firmware_zip_file_exists and not firmware_file_exists: return None
+    try:
+        return cache_firmware_files(config, 
+            archive_file_path = firmware_zip_path if firmware_zip_file_exists else None, 
+            firmware_file_path = firmware_file_path if firmware_file_exists else None)
+    except (OSError, ValueError, shutil.ReadError) as cache_error:
+        print(format_red(f'Unable to cache firmware found in \'{firmware_dir_path}\': {cache_error}'))
+        return None
 
-    if not firmware_zip_file_exists and not firmware_file_exists and confirm(config = config, 
-    confirm_prompt = 'Firmware file not found. Download and extract firmware from the Vertiv website? '):
-        try:
-            download_and_extract_firmware(config = config, firmware_download_destination = firmware_download_destination, firmware_dir_path = firmware_dir_path)
-        except Exception as download_error:
-            if confirm(config, f'Error downloading firmware file: {download_error}\n Try again?', error = True):
-                return get_firmware_file_path(config)
-            else:
-                return False, False
-    if firmware_zip_file_exists and not firmware_file_exists and confirm(config = config, 
-    confirm_prompt = 'Compressed firmware file found. Do you want to extract it?'):
-        try:
-            shutil.unpack_archive(firmware_download_destination, firmware_dir_path)
-            print(f'Firmware extracted to \'{firmware_dir_path}\'.')
-        except Exception as error:
-            if confirm(config, f'Error extracting firmware file: {error}\n Try again?', error = True):
-                return get_firmware_file_path(config)
-            else:
-                return False, False
-    return firmware_file_path, firmware_filename
+def get_firmware_file_path(config: dict) -> tuple[str, str] | tuple[bool, bool]:
+    firmware_filename: str = config['parsed_firmware_url']['firmware_filename']
+    cached_firmware_file_path: str | None = get_cached_firmware_file_path(config) or cache_legacy_firmware_files(config)
+    if cached_firmware_file_path is not None:
+        return cached_firmware_file_path, firmware_filename
+    if not confirm(config = config, confirm_prompt = 'Firmware file not found. Download and extract firmware from the Vertiv website? '):
+        return False, False
+    firmware_download_destination: str = os.path.join(get_firmware_cache_path(config), 'downloads', config['parsed_firmware_url']['filename'])
+    downloaded_firmware_file_path: str | bool = download_and_extract_firmware(config = config, firmware_download_destination = firmware_download_destination)
+    if not bool(downloaded_firmware_file_path):
+        return False, False
+    return downloaded_firmware_file_path, firmware_filename #type: ignore[return-value]
 
 def get_firmware_version(config: dict, quiet: bool = False) -> str | bool:
     spinner: Halo = Halo(text = 'Checking current IMD firmware version...\n', spinner = get_spinner(config))
@@ -74,14 +70,16 @@ def get_firmware_version(config: dict, quiet: bool = False) -> str | bool:
 
     try:
         if not quiet: spinner.start()
-        if wait_for_ping(config, quiet = True):
-            firmware_response: dict = requests.get(api_firmware_url, headers = headers, verify = False).json()
+        if wait_for_imd(config, quiet = True):
+            firmware_response: dict = get_imd_session(config).get(api_firmware_url, headers = headers, verify = False, timeout = get_request_timeout(config, api_firmware_url)).json()
+            mark_imd_alive(config)
             response_code: int = firmware_response['retCode']
             response_message: str = firmware_response['retMsg']
             firmware_version: str = firmware_response['data']
             if response_code == 0 and is_valid_firmware_version(config = config, firmware_version = firmware_version):
                 if not quiet:
-                    time.sleep(1)
+                    with trace_span(config, 'display_sleep', 'sleep', seconds = 1):
+                        time.sleep(1)
                     spinner.succeed(f'\nCurrent IMD Firmware Version: {format_blue(firmware_version)}')
                 return firmware_version
             else:
@@ -100,35 +98,46 @@ def get_firmware_version(config: dict, quiet: bool = False) -> str | bool:
                 return get_firmware_version(config = config, quiet = quiet)
     return False
 
-def wait_for_firmware_upgrade(config: dict, target_firmware_version: str | bool, wait_time_in_seconds: int = 10) -> bool:
-    current_firmware_version: str | bool = get_firmware_version(config, True)
-    if current_firmware_version != target_firmware_version:
-        time.sleep(wait_time_in_seconds)
-        return wait_for_firmware_upgrade(config, target_firmware_version, wait_time_in_seconds)
-    return True
+def check_firmware_upload_response(upload_response: Response) -> None:
+    upload_response.raise_for_status()
+    upload_result: dict = upload_response.json()
+    if not is_exactly_zero(get_value_if_key_exists(upload_result, 'retCode')):
+        raise RuntimeError(f'IMD rejected the firmware upload: {get_value_if_key_exists(upload_result, 'retMsg') or upload_result}')
 
-def upgrade_imd_firmware(config: dict, target_firmware_version: str | bool, firmware_file_path: str | bool, token: str | bool, quiet: bool = False) -> bool:
+def upgrade_imd_firmware(config: dict, target_firmware_version: str | bool, firmware_file_path: str | bool, token: str | bool, quiet: bool = False, current_firmware_version: str | None = None) -> bool:
     firmware_upgrade_api_endpoint: str = f'https://{config['current_imd_ip']}/transfer/firmware?token={token}'
     firmware_upgrade_headers: dict = {'Content_Type' : 'multipart/form-data'}
     spinner: Halo = Halo(text = f'Uploading Firmware v.{format_blue(target_firmware_version)}\n', spinner = get_spinner(config)) #type: ignore[arg-type]
 
     try:
+        from_firmware_version: str | None = current_firmware_version or read_firmware_version(config)
         if not quiet: spinner.start()
         with open(firmware_file_path, 'rb') as file_bytes:
-            requests.post(
-                firmware_upgrade_api_endpoint, 
-                headers = firmware_upgrade_headers, 
-                files = { 'firmware_file': file_bytes },
-                verify = False)
+            with observe_duration('vg_imd_firmware_upload_seconds', outcome = 'failed') as upload_labels:
+                upload_response: Response = get_imd_session(config).post(
+                    firmware_upgrade_api_endpoint, 
+                    headers = firmware_upgrade_headers, 
+                    files = { 'firmware_file': file_bytes },
+                    verify = False,
+                    timeout = get_request_timeout(config, firmware_upgrade_api_endpoint))
+                check_firmware_upload_response(upload_response)
+                upload_labels['outcome'] = 'succeeded'
+            increment_counter('vg_imd_firmware_upload_bytes_total', amount = os.path.getsize(firmware_file_path)) #type: ignore[arg-type]
+            forget_imd_state(config)
             if not quiet: spinner.succeed('Firmware file uploaded successfully, please wait while the IMD restarts.')
-            time.sleep(60)
-            wait_for_firmware_upgrade(config, target_firmware_version, 10)
+            with trace_span(config, 'wait_for_imd_reboot', 'imd', target_firmware_version = target_firmware_version) as reboot_span:
+                reboot_result: dict = wait_for_imd_reboot_with_history(config, 'upgrade', from_firmware_version, target_firmware_version, target_firmware_version, quiet) #type: ignore[arg-type]
+                reboot_span.update({ key: reboot_result[key] for key in ['succeeded', 'phase', 'phase_seconds', 'expected_seconds'] })
+            if not reboot_result['succeeded']:
+                if not quiet: print(format_red(f'Firmware upgrade not confirmed: {reboot_result['error']}.'))
+                return False
+            if not quiet: print(f'IMD back on firmware v.{format_blue(reboot_result['firmware_version'])} after {reboot_result['elapsed_seconds']} s ({format_reboot_phase_seconds(reboot_result)}).')
             return True
     except Exception as firmware_upgrade_error:
         if not quiet: spinner.fail(truncate_message(f'\n Error upgrading firmware: {firmware_upgrade_error}'))
         if not confirm(config, '\nDo you want to try again (y or n): '): 
             return True
-        upgrade_imd_firmware(config, target_firmware_version, firmware_file_path, token)
+        upgrade_imd_firmware(config, target_firmware_version, firmware_file_path, token, current_firmware_version = current_firmware_version)
     return False
 
 def prompt_to_upgrade_imd_firmware(config: dict, quiet: bool = True) -> bool:
@@ -151,7 +160,7 @@ def prompt_to_upgrade_imd_firmware(config: dict, quiet: bool = True) -> bool:
         username, password = get_credentials(config)
         token: str | bool = login_to_imd(config, quiet = True)
         if bool(token):
-            return upgrade_imd_firmware(config, target_firmware_version, firmware_file_path, token, quiet)
+            return upgrade_imd_firmware(config, target_firmware_version, firmware_file_path, token, quiet, current_firmware_version) #type: ignore[arg-type]
     else:
         if not quiet: print(f'The current IMD firmware version {format_blue(current_firmware_version)} is newer than the target firmware version {format_blue(target_firmware_version)}.') #type: ignore[arg-type]
         return True
@@ -0,0 +1,133 @@
+import asyncio, json, time
+
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable
+
+from utils.api_utils import apply_all_api_calls, forget_imd_state, get_ordered_api_calls
+from utils.breaker_utils import get_circuit_open_reason
+from utils.config_utils import get_credentials_from_imd_config
+from utils.dict_utils import get_value_if_key_exists
+from utils.format_utils import format_blue, format_bold, format_green, format_red
+from utils.metrics_utils import increment_counter
+from utils.prompt_utils import confirm, get_unique_config_items, get_unique_config_items_from_values
+from utils.reconcile_utils import reconcile_api_calls
+from utils.timeout_utils import get_imd_deadline
+from utils.trace_utils import trace_span
+
+default_fleet_concurrency: int = 8
+
+def get_imd_config(config: dict, imd_ip: str) -> dict:
+    return {**config,
+        "current_imd_ip": imd_ip,
+        "imd_base_url": f'https://{imd_ip}',
+        "api_base_url": f'https://{imd_ip}/api/',
+        "unattended": True
+    }
+
+def load_fleet_file(config: dict, fleet_file_path: str) -> list[dict]:
+    with open(fleet_file_path, 'r') as fleet_file:
+        fleet_file_contents: list[dict] = json.load(fleet_file)
+
+    return [ imd for imd in fleet_file_contents if bool(get_value_if_key_exists(imd, 'imd_ip')) ]
+
+def get_fleet(config: dict, args: Namespace) -> list[dict]:
+    fleet_from_file: list[dict] = load_fleet_file(config, args.fleet_file) if bool(args.fleet_file) else []
+    fleet_from_args: list[dict] = [ {'imd_ip': imd_ip} for imd_ip in args.fleet ] if bool(args.fleet) else []
+
+    return fleet_from_file + fleet_from_args
+
+def get_fleet_concurrency(config: dict, args: Namespace) -> int:
+    if bool(args.concurrency): return args.concurrency
+    configured_fleet_concurrency: int | bool = get_value_if_key_exists(config, 'default_fleet_concurrency')
+    return configured_fleet_concurrency if bool(configured_fleet_concurrency) else default_fleet_concurrency #type: ignore[return-value]
+
+def get_fleet_api_calls(config: dict, prompts: dict, fleet: list[dict], quiet: bool = False) -> dict[str, list[dict]]:
+    fleet_api_calls: dict[str, list[dict]] = {}
+    for imd in fleet:
+        imd_ip: str = imd['imd_ip']
+        values: dict | bool = get_value_if_key_exists(imd, 'values')
+        if bool(values):
+            unique_config_items: list[dict] | bool = get_unique_config_items_from_values(config, prompts, values, quiet) #type: ignore[arg-type]
+        else:
+            if not quiet: print(format_bold(f'\nPlease enter the configuration for the IMD at {format_blue(imd_ip)}:'))
+            unique_config_items = get_unique_config_items(config, prompts, quiet)
+        if not bool(unique_config_items):
+            if not quiet: print(format_red(f'Skipping IMD at {imd_ip}.'))
+            continue
+        fleet_api_calls[imd_ip] = get_ordered_api_calls(config, prompts, unique_config_items) #type: ignore[arg-type]
+
+    return fleet_api_calls
+
+def configure_imd(config: dict, imd_ip: str, ordered_api_calls: list[dict]) -> dict:
+    imd_config: dict = get_imd_config(config, imd_ip)
+    imd_config['username'], imd_config['password'] = get_credentials_from_imd_config(imd_config, ordered_api_calls)
+    start_time: float = time.monotonic()
+    deadline: float | None = get_imd_deadline(imd_config)
+    with trace_span(imd_config, 'configure_imd', 'imd') as imd_span:
+        try:
+            api_calls_to_apply: list[dict] = reconcile_api_calls(imd_config, ordered_api_calls, quiet = True) if bool(get_value_if_key_exists(config, 'reconcile')) else ordered_api_calls
+            succeeded: bool = apply_all_api_calls(imd_config, api_calls_to_apply, quiet = True, deadline = deadline)
+            error: str = '' if succeeded else get_circuit_open_reason(imd_config) or 'One or more API calls failed.'
+        except Exception as configuration_error:
+            succeeded, error = False, str(configuration_error)
+        finally:
+            forget_imd_state(imd_config)
+        imd_span.update({'succeeded': succeeded, 'error': error})
+    increment_counter('vg_imd_configurations_total', {'outcome': 'succeeded' if succeeded else 'failed'})
+
+    return {
+        'imd_ip': imd_ip,
+        'succeeded': succeeded,
+        'elapsed_seconds': round(time.monotonic() - start_time, 3),
+        'error': error
+    }
+
+async def run_on_imds(config: dict, imd_arguments: dict[str, Any], run_on_imd: Callable[[dict, str, Any], dict], concurrency: int) -> AsyncIterator[dict]:
+    loop = asyncio.get_running_loop()
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    with ThreadPoolExecutor(max_workers = concurrency) as executor:
+        async def run_on_imd_when_ready(imd_ip: str, imd_argument: Any) -> dict:
+            async with semaphore:
+                return await loop.run_in_executor(executor, run_on_imd, config, imd_ip, imd_argument)
+
+        pending_imds = [ run_on_imd_when_ready(imd_ip, imd_argument) for imd_ip, imd_argument in imd_arguments.items() ]
+        for finished_imd in asyncio.as_completed(pending_imds):
+            yield await finished_imd
+
+async def configure_imds(config: dict, fleet_api_calls: dict[str, list[dict]], concurrency: int) -> AsyncIterator[dict]:
+    async for fleet_result in run_on_imds(config, fleet_api_calls, configure_imd, concurrency):
+        yield fleet_result
+
+def print_fleet_result(fleet_result: dict) -> None:
+    imd_ip, elapsed_seconds = format_blue(fleet_result['imd_ip']), fleet_result['elapsed_seconds']
+    if fleet_result['succeeded']:
+        print(f'{format_green('✔')} IMD at {imd_ip} configured in {elapsed_seconds} s.')
+    else:
+        print(f'{format_red('✖')} IMD at {imd_ip} failed after {elapsed_seconds} s: {fleet_result['error']}')
+
+def run_fleet(config: dict, fleet_api_calls: dict[str, list[dict]], concurrency: int, quiet: bool = False) -> list[dict]:
+    async def collect_fleet_results() -> list[dict]:
+        fleet_results: list[dict] = []
+        async for fleet_result in configure_imds(config, fleet_api_calls, concurrency):
+            if not quiet: print_fleet_result(fleet_result)
+            fleet_results.append(fleet_result)
+        return fleet_results
+
+    return asyncio.run(collect_fleet_results())
+
+def configure_fleet(config: dict, args: Namespace, prompts: dict, quiet: bool = False) -> bool:
+    fleet: list[dict] = get_fleet(config, args)
+    fleet_api_calls: dict[str, list[dict]] = get_fleet_api_calls(config, prompts, fleet, quiet)
+    if not bool(fleet_api_calls):
+        if not quiet: print(format_red('No IMDs to configure.'))
+        return False
+    concurrency: int = get_fleet_concurrency(config, args)
+    if not confirm(config, f'\nConfigure {len(fleet_api_calls)} IMDs, {concurrency} at a time? (y or n): '):
+        return False
+    fleet_results: list[dict] = run_fleet(config, fleet_api_calls, concurrency, quiet)
+    succeeded_imds: int = len([ fleet_result for fleet_result in fleet_results if fleet_result['succeeded'] ])
+    if not quiet: print(f'\n{succeeded_imds} of {len(fleet_results)} IMDs configured successfully.')
+
+    return succeeded_imds == len(fleet_results)
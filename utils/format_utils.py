@@ -1,5 +1,6 @@
 import os, sys
 
+from utils.compile_utils import get_compiled_format_functions
 from utils.dict_utils import get_value_if_key_exists
 
 format_escape_strings: dict = {
@@ -33,70 +34,21 @@ def format_bold(text: str) -> str:
 def clear_line() -> None:
     sys.stdout.write('\x1b[2K')
 
-def apply_formatting_function(config: dict, format_function: list, current_formatting: str = '', config_items: list[dict] = [{}]) -> str:
-    if bool(format_function):
-        match format_function[0]:
-            case 'zfill':
-                return current_formatting.zfill(format_function[1])
-            case 'lower':
-                return current_formatting.lower()
-            case 'upper':
-                return current_formatting.upper()
-            case 'replace':
-                existing_char, target_char = format_function[1], format_function[2]
-                return current_formatting.replace(existing_char, target_char)
-            case 'apply_string_template':
-                if bool(config_items):
-                    config_values: dict = { item['config_item'] : get_value_if_key_exists(item, 'value') for item in config_items }
-                    format_function_template: str = format_function[1]
-                    return format_function_template.format(**config_values)
-    return current_formatting
-
-def apply_formatting_functions(config: dict, format_functions: list[list], next_formatting: str = '', config_items: list[dict] = [{}], iteration = 0) -> str:
-    number_of_format_functions: int = len(format_functions)
-    is_final_formatting_function = bool(iteration + 1 == number_of_format_functions)
-    try:
-        if is_final_formatting_function:
-            return apply_formatting_function(config, format_functions[iteration], next_formatting, config_items)
-        else:
-            next_formatting = apply_formatting_function(config, format_functions[iteration], next_formatting, config_items)
-            return apply_formatting_functions(config, format_functions, next_formatting, config_items, iteration + 1)
-    except IndexError:
-        return next_formatting
-
 def format_user_input(config: dict, input_params: dict, user_input: str) -> str:
     format_functions: list[list] | bool = get_value_if_key_exists(input_params, 'format_functions')
     stripped_user_input = user_input.strip()
     if bool(format_functions):
-        return apply_formatting_functions(config, format_functions, stripped_user_input) #type: ignore[arg-type]
+        return get_compiled_format_functions(format_functions)(stripped_user_input, {}) #type: ignore[arg-type]
     else:
         return stripped_user_input
 
 def get_value_to_display(config: dict, formatter:dict, config_items: list[dict]) -> str | None:
     raw_value_to_display: str | bool = get_value_if_key_exists(formatter, 'value_to_display')
-    if bool(raw_value_to_display):
-        value_to_display: str = apply_formatting_function(config, ['apply_string_template', raw_value_to_display], '', config_items )  
+    if bool(raw_value_to_display) and bool(config_items):
+        config_values: dict = { item['config_item']: get_value_if_key_exists(item, 'value') for item in config_items }
+        value_to_display: str = get_compiled_format_functions([['apply_string_template', raw_value_to_display]])('', config_values)
         return value_to_display if bool(value_to_display) else None
-    return None 
-                
-def get_formatted_config_items(config: dict, prompts: dict, config_items: list[dict]) -> list[dict]:
-    formatters: list[dict] = prompts['formatters']
-    formatted_config_items: list[dict] = [
-        {  
-            'config_item': formatter['config_item'],
-            'config_item_name': formatter['config_item_name'],
-            'display_to_user': bool(get_value_if_key_exists(formatter, 'display_to_user')),
-            'value_to_display': get_value_to_display(config, formatter, config_items),
-            'api_calls': [ {
-                'cmd': api_call['cmd'],
-                'method': api_call['method'],
-                'api_path': api_call['api_path'],
-                'data': apply_formatting_functions(config, formatter['format_functions'], '', config_items)
-            } for api_call in formatter['api_calls'] ]
-        }
-        for formatter in formatters ]
-
-    return formatted_config_items
+    return None
 
 def get_status_messages(config: dict, config_item_name: str, command: str) -> tuple[str, ...]:
     command_adds: bool = bool(command == 'set' or command == 'add')
@@ -0,0 +1,170 @@
+import contextlib, os, threading, time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.parse import urlsplit
+
+from utils.dict_utils import get_value_if_key_exists
+
+latency_buckets: tuple = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+metric_definitions: dict[str, dict] = {
+    'vg_imd_api_calls_total':                   {'type': 'counter',   'help': 'API calls sent to IMDs by api_path and outcome.'},
+    'vg_imd_api_call_attempt_seconds':          {'type': 'histogram', 'help': 'Latency of each API call attempt by api_path.', 'buckets': latency_buckets},
+    'vg_imd_api_call_retries_total':            {'type': 'counter',   'help': 'API call attempts that were retried, by the retCode (or transport) that caused the retry.'},
+    'vg_imd_probe_seconds':                     {'type': 'histogram', 'help': 'Latency of IMD readiness probes by method and result.', 'buckets': latency_buckets},
+    'vg_imd_firmware_upload_seconds':           {'type': 'histogram', 'help': 'Duration of firmware uploads by outcome.', 'buckets': latency_buckets},
+    'vg_imd_firmware_upload_bytes_total':       {'type': 'counter',   'help': 'Firmware bytes uploaded to IMDs.'},
+    'vg_imd_configurations_total':              {'type': 'counter',   'help': 'IMDs whose configuration completed or failed.'}
+}
+
+metric_values: dict[str, dict[tuple, dict]] = {}
+metric_values_lock: threading.Lock = threading.Lock()
+
+active_metrics_export: dict = {}
+active_metrics_export_lock: threading.Lock = threading.Lock()
+
+def get_metric_value(name: str, labels: dict) -> dict:
+    label_key: tuple = tuple(sorted((label, str(value)) for label, value in labels.items()))
+    metric_series: dict[tuple, dict] = metric_values.setdefault(name, {})
+    if label_key not in metric_series:
+        bucket_count: int = len(get_value_if_key_exists(metric_definitions[name], 'buckets') or ())
+        metric_series[label_key] = {'value': 0, 'sum': 0, 'count': 0, 'buckets': [0] * bucket_count}
+    return metric_series[label_key]
+
+def increment_counter(name: str, labels: dict = {}, amount: float = 1) -> None:
+    with metric_values_lock:
+        get_metric_value(name, labels)['value'] += amount
+
+def observe_histogram(name: str, value: float, labels: dict = {}) -> None:
+    buckets: tuple = metric_definitions[name]['buckets']
+    with metric_values_lock:
+        metric_value: dict = get_metric_value(name, labels)
+        metric_value['sum'] += value
+        metric_value['count'] += 1
+        for bucket_index, upper_bound in enumerate(buckets):
+            if value <= upper_bound: metric_value['buckets'][bucket_index] += 1
+
+@contextlib.contextmanager
+def observe_duration(name: str, **labels) -> Iterator[dict]:
+    start_time: float = time.monotonic()
+    try:
+        yield labels
+    except Exception:
+        labels['outcome'] = 'failed'
+        raise
+    finally:
+        observe_histogram(name, time.monotonic() - start_time, labels)
+
+def reset_metrics() -> None:
+    with metric_values_lock:
+        metric_values.clear()
+
+def get_api_path_label(url_or_api_path: str) -> str:
+    return urlsplit(url_or_api_path).path.lstrip('/').removeprefix('api/')
+
+def record_api_call_metrics(url_or_api_path: str, retry_result: dict) -> None:
+    api_path: str = get_api_path_label(url_or_api_path)
+    attempts: list[dict] = retry_result['attempts']
+    for attempt in attempts:
+        observe_histogram('vg_imd_api_call_attempt_seconds', attempt['network_seconds'], {'api_path': api_path})
+    for retried_attempt in attempts[:-1]:
+        retry_reason: str = str(retried_attempt['ret_code']) if retried_attempt['ret_code'] is not None else 'transport'
+        increment_counter('vg_imd_api_call_retries_total', {'api_path': api_path, 'ret_code': retry_reason})
+    increment_counter('vg_imd_api_calls_total', {'api_path': api_path, 'outcome': 'succeeded' if retry_result['succeeded'] else 'failed'})
+
+def format_labels(label_key: tuple, extra_labels: tuple = ()) -> str:
+    labels: tuple = label_key + extra_labels
+    if not bool(labels): return ''
+    escaped_labels: list[str] = [ f'{label}="{value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')}"' for label, value in labels ]
+    return '{' + ','.join(escaped_labels) + '}'
+
+def format_metric_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def render_metric(name: str, metric_series: dict[tuple, dict]) -> list[str]:
+    metric_definition: dict = metric_definitions[name]
+    metric_lines: list[str] = [ f'# HELP {name} {metric_definition['help']}', f'# TYPE {name} {metric_definition['type']}' ]
+    for label_key, metric_value in sorted(metric_series.items()):
+        if metric_definition['type'] == 'counter':
+            metric_lines.append(f'{name}{format_labels(label_key)} {format_metric_number(metric_value['value'])}')
+            continue
+        for upper_bound, bucket_count in zip(metric_definition['buckets'], metric_value['buckets']):
+            metric_lines.append(f'{name}_bucket{format_labels(label_key, (('le', format_metric_number(upper_bound)),))} {bucket_count}')
+        metric_lines.append(f'{name}_bucket{format_labels(label_key, (('le', '+Inf'),))} {metric_value['count']}')
+        metric_lines.append(f'{name}_sum{format_labels(label_key)} {format_metric_number(metric_value['sum'])}')
+        metric_lines.append(f'{name}_count{format_labels(label_key)} {metric_value['count']}')
+
+    return metric_lines
+
+def render_metrics() -> str:
+    with metric_values_lock:
+        metric_lines: list[str] = [
+            metric_line
+            for name in metric_definitions.keys() if name in metric_values.keys()
+            for metric_line in render_metric(name, metric_values[name]) ]
+
+    return '\n'.join(metric_lines) + '\n'
+
+def write_metrics_textfile(metrics_file_path: str) -> None:
+    temporary_file_path: str = f'{metrics_file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary_file_path, 'w') as metrics_file:
+        metrics_file.write(render_metrics())
+    os.replace(temporary_file_path, metrics_file_path)
+
+def start_metrics_textfile_writer(metrics_file_path: str, interval: float) -> threading.Event:
+    stopped: threading.Event = threading.Event()
+
+    def rewrite_metrics_textfile() -> None:
+        while not stopped.is_set():
+            write_metrics_textfile(metrics_file_path)
+            stopped.wait(interval)
+
+    threading.Thread(target = rewrite_metrics_textfile, daemon = True).start()
+    return stopped
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != '/metrics':
+            self.send_error(404)
+            return
+        metrics: bytes = render_metrics().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(metrics)))
+        self.end_headers()
+        self.wfile.write(metrics)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+def start_metrics_server(port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    metrics_server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    metrics_server.daemon_threads = True
+    threading.Thread(target = metrics_server.serve_forever, daemon = True).start()
+    return metrics_server
+
+def metrics_export_is_running() -> bool:
+    with active_metrics_export_lock:
+        return bool(active_metrics_export)
+
+def start_metrics_export(config: dict, metrics_port: int | None = None, metrics_file_path: str | None = None) -> None:
+    stop_metrics_export()
+    metrics_config: dict = get_value_if_key_exists(config, 'metrics') or {}
+    metrics_host: str = get_value_if_key_exists(metrics_config, 'host') or '127.0.0.1'
+    textfile_interval: float = get_value_if_key_exists(metrics_config, 'textfile_interval') or 15
+    with active_metrics_export_lock:
+        if metrics_port is not None: active_metrics_export['server'] = start_metrics_server(metrics_port, metrics_host) #type: ignore[arg-type]
+        if bool(metrics_file_path): active_metrics_export['textfile_writer'] = start_metrics_textfile_writer(metrics_file_path, textfile_interval) #type: ignore[arg-type]
+        if bool(metrics_file_path): active_metrics_export['textfile_path'] = metrics_file_path
+
+def stop_metrics_export() -> None:
+    with active_metrics_export_lock:
+        metrics_server: ThreadingHTTPServer | None = active_metrics_export.pop('server', None)
+        textfile_writer: threading.Event | None = active_metrics_export.pop('textfile_writer', None)
+        textfile_path: str | None = active_metrics_export.pop('textfile_path', None)
+    if metrics_server is not None:
+        metrics_server.shutdown()
+        metrics_server.server_close()
+    if textfile_writer is not None: textfile_writer.set()
+    if textfile_path is not None: write_metrics_textfile(textfile_path)
@@ -1,32 +1,138 @@
-import os, subprocess
+import asyncio, os, requests, socket, subprocess, threading, time
 
+from utils.dict_utils import get_value_if_key_exists
 from utils.format_utils import format_blue
+from utils.metrics_utils import observe_duration
 from utils.prompt_utils import confirm
+from utils.trace_utils import trace_span
 
-def host_pings(config: dict, hostname: str, attempts_remaining: int = 10, quiet: bool = False) -> bool:
-    if attempts_remaining == 0:
+default_readiness_probe: dict = {
+    'method': 'tcp',
+    'port': 443,
+    'timeout': 1,
+    'intervals': [0.2, 0.5, 1],
+    'concurrency': 256
+}
+
+imd_last_seen_alive: dict[str, float] = {}
+imd_last_seen_alive_lock: threading.Lock = threading.Lock()
+
+def get_readiness_probe(config: dict) -> dict:
+    readiness_probe: dict = get_value_if_key_exists(config, 'readiness_probe') or {}
+    return {**default_readiness_probe, **readiness_probe}
+
+def split_imd_address(address: str, default_port: int = 443) -> tuple[str, int]:
+    if address.startswith('['):
+        host, _, port = address[1:].partition(']')
+        return host, int(port[1:]) if port.startswith(':') else default_port
+    if address.count(':') == 1:
+        host, port = address.split(':')
+        return host, int(port)
+    return address, default_port
+
+def host_accepts_connections(host: str, port: int, timeout: float) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout = timeout):
+            return True
+    except OSError:
         return False
 
+def host_answers_https(address: str, timeout: float) -> bool:
+    try:
+        requests.head(f'https://{address}/', timeout = timeout, verify = False, allow_redirects = False)
+        return True
+    except requests.exceptions.RequestException:
+        return False
+
+def host_answers_icmp(hostname: str) -> bool:
     is_windows: bool = os.sys.platform.lower() ==  'win32' #type: ignore[attr-defined]
     count_param: str = '-n' if is_windows else '-c'
-    host_is_pinging: bool = subprocess.run(
+    return subprocess.run(
         ['ping', count_param, '1', hostname],
         stdout = subprocess.DEVNULL,
-        stderr = subprocess.DEVNULL         
+        stderr = subprocess.DEVNULL
     ).returncode == 0
 
-    if host_is_pinging:
+def probe_host(config: dict, address: str) -> bool:
+    readiness_probe: dict = get_readiness_probe(config)
+    host, port = split_imd_address(address, readiness_probe['port'])
+    with trace_span(config, 'probe', 'probe', address = address, method = readiness_probe['method']) as probe_span:
+        match readiness_probe['method']:
+            case 'https':
+                probe_span['reachable'] = host_answers_https(address, readiness_probe['timeout'])
+            case 'icmp':
+                probe_span['reachable'] = host_answers_icmp(host)
+            case _:
+                probe_span['reachable'] = host_accepts_connections(host, port, readiness_probe['timeout'])
+
+    return probe_span['reachable']
+
+def host_pings(config: dict, hostname: str, attempts_remaining: int = 10, quiet: bool = False) -> bool:
+    readiness_probe: dict = get_readiness_probe(config)
+    intervals: list[float] = readiness_probe['intervals']
+    for attempt in range(attempts_remaining):
+        with observe_duration('vg_imd_probe_seconds', method = readiness_probe['method']) as probe_labels:
+            host_is_reachable: bool = probe_host(config, hostname)
+            probe_labels['result'] = 'up' if host_is_reachable else 'down'
+        if host_is_reachable:
+            return True
+        if not quiet and attempt == 0: print(f'Awaiting response from IMD at {format_blue(hostname)}.')
+        if attempt + 1 < attempts_remaining:
+            probe_interval: float = intervals[min(attempt, len(intervals) - 1)]
+            with trace_span(config, 'probe_sleep', 'sleep', address = hostname, seconds = probe_interval):
+                time.sleep(probe_interval)
+
+    return False
+
+async def host_accepts_connections_async(host: str, port: int, timeout: float) -> bool:
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout = timeout)
+        writer.close()
+        await writer.wait_closed()
         return True
-    
-    if not quiet: print(f'Awaiting response from IMD at {format_blue(hostname)}.')  
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+async def probe_hosts_async(config: dict, addresses: list[str]) -> dict[str, bool]:
+    readiness_probe: dict = get_readiness_probe(config)
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(readiness_probe['concurrency'])
+
+    async def probe_address(address: str) -> bool:
+        host, port = split_imd_address(address, readiness_probe['port'])
+        async with semaphore:
+            return await host_accepts_connections_async(host, port, readiness_probe['timeout'])
+
+    probe_results: list[bool] = await asyncio.gather(*[ probe_address(address) for address in addresses ])
+    return dict(zip(addresses, probe_results))
 
-    return host_pings(config, hostname, attempts_remaining -1, True)
+def probe_hosts(config: dict, addresses: list[str]) -> dict[str, bool]:
+    return asyncio.run(probe_hosts_async(config, addresses))
+
+def mark_imd_alive(config: dict) -> None:
+    with imd_last_seen_alive_lock:
+        imd_last_seen_alive[config['current_imd_ip']] = time.monotonic()
+
+def mark_imd_unreachable(config: dict) -> None:
+    with imd_last_seen_alive_lock:
+        imd_last_seen_alive.pop(config['current_imd_ip'], None)
+
+def imd_is_alive(config: dict) -> bool:
+    liveness_ttl: float | bool = get_value_if_key_exists(config, 'liveness_ttl')
+    with imd_last_seen_alive_lock:
+        last_seen_alive: float | None = imd_last_seen_alive.get(config['current_imd_ip'])
+    if last_seen_alive is None or not bool(liveness_ttl):
+        return False
+    return time.monotonic() - last_seen_alive < liveness_ttl #type: ignore[operator]
 
 def wait_for_ping(config: dict, quiet: bool = False) -> bool:
     imd_ip_address: str = config['current_imd_ip']
     if host_pings(config, imd_ip_address, 10, quiet):
+        mark_imd_alive(config)
         return True
     if not quiet and confirm(config, f'Unable to reach IMD at {format_blue(imd_ip_address)}. Try again? (y or n): '):
         return wait_for_ping(config, quiet)
 
-    return False
\ No newline at end of file
+    return False
+
+def wait_for_imd(config: dict, quiet: bool = False) -> bool:
+    return imd_is_alive(config) or wait_for_ping(config, quiet)
@@ -1,8 +1,9 @@
-import re, validators
+import json, re, validators
 
 from re import Match, Pattern
 from typing import Any
 
+from utils.compile_utils import get_compiled_verify_functions
 from utils.dict_utils import get_value_if_key_exists
 
 def is_exactly(value: Any, expected_value: Any) -> bool:
@@ -94,25 +95,8 @@ def parse_firmware_url(config: dict, url: str) -> dict | bool:
     
     return parsed_url
 
-def run_verify_function(config: dict, user_input: str, verify_function: list) -> bool:
-    stripped_user_input = user_input.strip()
-    match verify_function[0]:
-        case 'is_int':
-            try:
-                return bool(type(int(stripped_user_input)) == int)
-            except ValueError:
-                return False
-        case 'is_one_of':
-            return bool(stripped_user_input.lower() in verify_function[1])
-        case 'is_between':
-            return bool(int(verify_function[1]) <= len(user_input) <= int(verify_function[2]))
-        case 'is_hostname':
-            return bool(validators.hostname(stripped_user_input))
-        case 'is_domain_name':
-            return bool(validators.domain(stripped_user_input))
-        case 'is_valid_username':
-            return bool(re.fullmatch(r'[a-zA-Z][a-zA-Z0-9-_]{0,31}', stripped_user_input))
-    return False
+def parse_api_call_data(config: dict, raw_data: dict | str) -> dict:
+    return raw_data if type(raw_data) == dict else json.loads(raw_data.replace('\'', '\"')) #type: ignore[union-attr, return-value]
 
 def verify_input(config: dict, input_params: dict, user_input: str) -> bool:
     verify_functions: list[list] = input_params['verify_functions']
@@ -120,11 +104,10 @@ def verify_input(config: dict, input_params: dict, user_input: str) -> bool:
     if user_input == '':
         return True if empty_allowed else False
     elif bool(verify_functions[0]):
-        verify_function_results: list[bool] = [
-            run_verify_function(config, user_input, verify_function)
-            for verify_function in verify_functions
-        ]
-        return all(verify_function_results)
+        try:
+            return get_compiled_verify_functions(verify_functions)(user_input)
+        except ValueError:
+            return False
     else:
         return True
 
@@ -0,0 +1,124 @@
+import string, threading
+
+from types import MappingProxyType
+from typing import Any
+
+from utils.compile_utils import get_compiled_format_functions, get_prompts_hash
+from utils.dict_utils import get_value_if_key_exists
+from utils.format_utils import get_value_to_display
+from utils.parse_utils import parse_api_call_data
+
+compiled_execution_plans: dict[str, MappingProxyType] = {}
+compiled_execution_plans_lock: threading.Lock = threading.Lock()
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({ key: freeze(item) for key, item in value.items() })
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def thaw(value: Any) -> Any:
+    if isinstance(value, (dict, MappingProxyType)):
+        return { key: thaw(item) for key, item in value.items() }
+    if isinstance(value, (list, tuple)):
+        return [ thaw(item) for item in value ]
+    return value
+
+def compile_string_template(config: dict, string_template: str) -> Any:
+    template_fields: dict[str, str] = {}
+    placeholder_template: str = ''
+    for literal_text, field_name, format_spec, conversion in string.Formatter().parse(string_template):
+        placeholder_template += literal_text.replace('{', '{{').replace('}', '}}')
+        if field_name is None: continue
+        placeholder: str = f'__template_field_{len(template_fields)}__'
+        template_fields[placeholder] = '{' + field_name + (f'!{conversion}' if bool(conversion) else '') + (f':{format_spec}' if bool(format_spec) else '') + '}'
+        placeholder_template += placeholder
+    parsed_template: Any = parse_api_call_data(config, placeholder_template.format())
+
+    def restore_template_fields(value: Any) -> Any:
+        if isinstance(value, dict):
+            return { restore_template_fields(key): restore_template_fields(item) for key, item in value.items() }
+        if isinstance(value, list):
+            return [ restore_template_fields(item) for item in value ]
+        if isinstance(value, str):
+            leaf_template: str = value.replace('{', '{{').replace('}', '}}')
+            for placeholder, template_field in template_fields.items():
+                leaf_template = leaf_template.replace(placeholder, template_field)
+            return leaf_template
+        return value
+
+    return restore_template_fields(parsed_template)
+
+def compile_payload_template(config: dict, format_functions: list[list]) -> Any:
+    is_single_string_template: bool = len(format_functions) == 1 and format_functions[0][0] == 'apply_string_template'
+    if not is_single_string_template:
+        return None
+    try:
+        return freeze(compile_string_template(config, format_functions[0][1]))
+    except (ValueError, KeyError, IndexError):
+        return None
+
+def compile_formatter(config: dict, formatter: dict) -> MappingProxyType:
+    payload_template: Any = compile_payload_template(config, formatter['format_functions'])
+    return freeze({
+        'config_item': formatter['config_item'],
+        'config_item_name': formatter['config_item_name'],
+        'display_to_user': bool(get_value_if_key_exists(formatter, 'display_to_user')),
+        'formatter': formatter,
+        'payload_template': payload_template,
+        'api_calls': [ { key: api_call[key] for key in ['cmd', 'method', 'api_path'] } for api_call in formatter['api_calls'] ],
+        **{ key: formatter[key] for key in ['barrier', 'depends_on'] if key in formatter.keys() }
+    })
+
+def compile_execution_plan(config: dict, prompts: dict) -> MappingProxyType:
+    steps_by_config_item: dict[str, MappingProxyType] = {
+        **{ default['config_item']: freeze({'default': default}) for default in prompts['defaults'] },
+        **{ formatter['config_item']: compile_formatter(config, formatter) for formatter in prompts['formatters'] }
+    }
+    steps: tuple = tuple(steps_by_config_item.get(config_item, freeze({'default': {}})) for config_item in prompts['api_call_sequence'])
+
+    return freeze({'steps': steps})
+
+def get_execution_plan(config: dict, prompts: dict) -> MappingProxyType:
+    prompts_hash: str = get_prompts_hash(prompts)
+    with compiled_execution_plans_lock:
+        if prompts_hash not in compiled_execution_plans:
+            compiled_execution_plans[prompts_hash] = compile_execution_plan(config, prompts)
+        return compiled_execution_plans[prompts_hash]
+
+def bind_payload_template(payload_template: Any, config_values: dict) -> Any:
+    if isinstance(payload_template, MappingProxyType):
+        return { bind_payload_template(key, config_values): bind_payload_template(item, config_values) for key, item in payload_template.items() }
+    if isinstance(payload_template, tuple):
+        return [ bind_payload_template(item, config_values) for item in payload_template ]
+    if isinstance(payload_template, str):
+        return payload_template.format(**config_values)
+    return payload_template
+
+def bind_formatter_payload(config: dict, step: MappingProxyType, config_values: dict) -> Any:
+    if step['payload_template'] is not None:
+        return bind_payload_template(step['payload_template'], config_values)
+    formatted_data: str = get_compiled_format_functions(thaw(step['formatter']['format_functions']))('', config_values)
+    try:
+        return parse_api_call_data(config, formatted_data)
+    except ValueError:
+        return formatted_data
+
+def bind_execution_plan_step(config: dict, step: MappingProxyType, config_items: list[dict], config_values: dict) -> dict:
+    if 'default' in step.keys():
+        return thaw(step['default'])
+    data: Any = bind_formatter_payload(config, step, config_values)
+
+    return {
+        'config_item': step['config_item'],
+        'config_item_name': step['config_item_name'],
+        'display_to_user': step['display_to_user'],
+        'value_to_display': get_value_to_display(config, step['formatter'], config_items), #type: ignore[arg-type]
+        'api_calls': [ {**api_call, 'data': data} for api_call in step['api_calls'] ],
+        **{ key: thaw(step[key]) for key in ['barrier', 'depends_on'] if key in step.keys() }
+    }
+
+def bind_execution_plan(config: dict, execution_plan: MappingProxyType, config_items: list[dict]) -> list[dict]:
+    config_values: dict = { config_item['config_item']: get_value_if_key_exists(config_item, 'value') for config_item in config_items }
+    return [ bind_execution_plan_step(config, step, config_items, config_values) for step in execution_plan['steps'] ]
@@ -0,0 +1,59 @@
+import contextlib, cProfile, io, os, pstats, threading, time
+
+from typing import Iterator
+
+from utils.format_utils import format_blue
+
+profile_top_functions: int = 25
+
+active_profile: dict = {}
+active_profile_lock: threading.Lock = threading.Lock()
+interactive_wait: dict = {'seconds': 0, 'paused_at': None}
+
+def get_profile_time() -> float:
+    paused_at: float | None = interactive_wait['paused_at']
+    return (paused_at if paused_at is not None else time.perf_counter()) - interactive_wait['seconds']
+
+def profiling_is_enabled() -> bool:
+    with active_profile_lock:
+        return bool(active_profile)
+
+@contextlib.contextmanager
+def exclude_from_profile() -> Iterator[None]:
+    if not profiling_is_enabled() or interactive_wait['paused_at'] is not None:
+        yield
+        return
+    interactive_wait['paused_at'] = time.perf_counter()
+    try:
+        yield
+    finally:
+        interactive_wait['seconds'] += time.perf_counter() - interactive_wait['paused_at']
+        interactive_wait['paused_at'] = None
+
+def start_profiling(profile_file_path: str) -> None:
+    profiler: cProfile.Profile = cProfile.Profile(get_profile_time)
+    interactive_wait.update({'seconds': 0, 'paused_at': None})
+    with active_profile_lock:
+        active_profile.update({'path': profile_file_path, 'profiler': profiler, 'started_at': time.perf_counter()})
+    profiler.enable()
+
+def stop_profiling(quiet: bool = False) -> pstats.Stats | None:
+    with active_profile_lock:
+        if not bool(active_profile): return None
+        profile_file_path, profiler, started_at = active_profile['path'], active_profile['profiler'], active_profile['started_at']
+        active_profile.clear()
+    profiler.disable()
+    wall_seconds: float = time.perf_counter() - started_at
+    profile_stats: pstats.Stats = pstats.Stats(profiler, stream = io.StringIO())
+    profile_directory: str = os.path.dirname(os.path.abspath(profile_file_path))
+    os.makedirs(profile_directory, exist_ok = True)
+    profile_stats.dump_stats(profile_file_path)
+    if not quiet:
+        profile_output: io.StringIO = io.StringIO()
+        profile_stats.stream = profile_output #type: ignore[attr-defined]
+        profile_stats.sort_stats('cumulative').print_stats(profile_top_functions)
+        print(profile_output.getvalue())
+        print(f'Profiled {wall_seconds - interactive_wait['seconds']:.3f} s ({interactive_wait['seconds']:.3f} s waiting for user input excluded).')
+        print(f'Profile written to \'{format_blue(profile_file_path)}\'. View it with: python -m pstats {profile_file_path}')
+
+    return profile_stats
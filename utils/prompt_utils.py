@@ -1,13 +1,15 @@
 from utils.dict_utils import get_value_if_key_exists
 from utils.format_utils import format_bold, format_red, format_blue, clear_line, format_user_input
 from utils.parse_utils import verify_input, is_boolean_false
+from utils.profile_utils import exclude_from_profile
 
 from getpass import getpass
 from typing import Callable
 
 def confirm(config: dict = {}, confirm_prompt: str = '', error = False) -> bool:
     prompt = format_red(confirm_prompt) if error else confirm_prompt
-    user_response = input(prompt).lower().strip()
+    with exclude_from_profile():
+        user_response = input(prompt).lower().strip()
     affirmative_responses = ['yes', 'ye', 'y']
     negative_responses = ['no', 'n']
     response_is_positive: bool = bool(user_response in affirmative_responses)
@@ -25,7 +27,8 @@ def get_input(
         confirm_input: bool = True):
     match input_type:
         case 'input':
-            user_input: str = input(formatted_prompt_text)   
+            with exclude_from_profile():
+                user_input: str = input(formatted_prompt_text)
         case 'getpass':
             user_input = get_password(config = config, prompt_text = formatted_prompt_text, confirm_input = confirm_input, quiet = False)
         case 'none':
@@ -43,12 +46,15 @@ def get_input(
         return get_input(config, input_type, formatted_prompt_text, default_value, simulated_user_input, confirm_input)
 
 def get_username(config: dict) -> str:
-    return input('Please enter the username: ').strip()
+    with exclude_from_profile():
+        return input('Please enter the username: ').strip()
 
 def get_password(config: dict, prompt_text: str = 'Please enter the password', confirm_input: bool = True, quiet = False) -> str:
-    password: str = getpass(f'{prompt_text}: ')
+    with exclude_from_profile():
+        password: str = getpass(f'{prompt_text}: ')
     if bool(confirm_input):
-        confirm_password: str = getpass(f'{prompt_text} again: ')
+        with exclude_from_profile():
+            confirm_password: str = getpass(f'{prompt_text} again: ')
         if password != confirm_password: 
             if not quiet: print(format_red('Passwords do not match. Please try again.'))
             return get_password(config, prompt_text, confirm_input, quiet)            
@@ -149,6 +155,23 @@ def get_unique_config_items(config: dict, prompts: dict, quiet = False) -> list[
 
     return unique_config_items
 
+def get_unique_config_items_from_values(config: dict, prompts: dict, values: dict, quiet = False) -> list[dict] | bool:
+    unique_config_items: list[dict] = []
+    for prompt in prompts['prompts']:
+        config_item: str = prompt['config_item']
+        default_value: str | bool = get_value_if_key_exists(prompt, 'default_value')
+        user_input: str = str(values[config_item]) if config_item in values.keys() else default_value if bool(default_value) else '' #type: ignore[assignment]
+        if not verify_input(config = config, input_params = prompt, user_input = user_input):
+            if not quiet: print(format_red(f'Invalid or missing value for \'{config_item}\'.'))
+            return False
+        unique_config_items.append({
+            "config_item": config_item,
+            "value": format_user_input(config = config, input_params = prompt, user_input = user_input),
+            "test": 0
+        })
+
+    return unique_config_items
+
 def confirm_imd_config(config: dict, ordered_api_calls: list[dict]) -> bool:
     confirm_items: list[dict] = [
         {'config_item_name': api_call['config_item_name'], 'value_to_display': api_call['value_to_display']}
@@ -0,0 +1,104 @@
+import ipaddress, threading, time
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from typing import Iterator
+from urllib.parse import urlsplit
+
+from utils.dict_utils import get_value_if_key_exists
+from utils.trace_utils import trace_span
+
+default_rate_limits: dict = {
+    'groups': [],
+    'default': {'prefix_length': 24, 'requests_per_second': None, 'burst': None, 'upload_bytes_per_second': None}
+}
+upload_chunk_size: int = 64 * 1024
+
+rate_limit_buckets: dict[str, dict] = {}
+rate_limit_buckets_lock: threading.Lock = threading.Lock()
+
+def get_rate_limits(config: dict) -> dict:
+    configured_rate_limits: dict = get_value_if_key_exists(config, 'rate_limits') or {}
+    return {**default_rate_limits, **configured_rate_limits}
+
+def get_rate_limit_group(config: dict, host: str) -> tuple[str, dict]:
+    rate_limits: dict = get_rate_limits(config)
+    try:
+        address: ipaddress.IPv4Address | ipaddress.IPv6Address = ipaddress.ip_address(host.strip('[]'))
+    except ValueError:
+        return host, rate_limits['default']
+    for rate_limit_group in rate_limits['groups']:
+        network: ipaddress.IPv4Network | ipaddress.IPv6Network = ipaddress.ip_network(rate_limit_group['cidr'], strict = False)
+        if address in network:
+            return str(network), rate_limit_group
+    prefix_length: int = min(rate_limits['default']['prefix_length'], address.max_prefixlen)
+
+    return str(ipaddress.ip_network(f'{address}/{prefix_length}', strict = False)), rate_limits['default']
+
+def create_token_bucket(rate: float, capacity: float) -> dict:
+    return {
+        'rate': rate,
+        'capacity': capacity,
+        'tokens': capacity,
+        'updated_at': time.monotonic(),
+        'lock': threading.Lock()
+    }
+
+def get_token_bucket(bucket_key: str, rate: float, capacity: float) -> dict:
+    with rate_limit_buckets_lock:
+        if bucket_key not in rate_limit_buckets:
+            rate_limit_buckets[bucket_key] = create_token_bucket(rate, capacity)
+        return rate_limit_buckets[bucket_key]
+
+def acquire_tokens(token_bucket: dict, tokens: float) -> float:
+    waited_seconds: float = 0
+    while True:
+        with token_bucket['lock']:
+            now: float = time.monotonic()
+            token_bucket['tokens'] = min(token_bucket['capacity'], token_bucket['tokens'] + (now - token_bucket['updated_at']) * token_bucket['rate'])
+            token_bucket['updated_at'] = now
+            tokens_needed: float = min(tokens, token_bucket['capacity'])
+            if token_bucket['tokens'] >= tokens_needed:
+                token_bucket['tokens'] -= tokens
+                return waited_seconds
+            wait_seconds: float = (tokens_needed - token_bucket['tokens']) / token_bucket['rate']
+        time.sleep(wait_seconds)
+        waited_seconds += wait_seconds
+
+def acquire_request_slot(config: dict, host: str) -> float:
+    group_key, rate_limit_group = get_rate_limit_group(config, host)
+    requests_per_second: float | bool = get_value_if_key_exists(rate_limit_group, 'requests_per_second')
+    if not bool(requests_per_second):
+        return 0
+    burst: float = get_value_if_key_exists(rate_limit_group, 'burst') or requests_per_second
+
+    return acquire_tokens(get_token_bucket(f'requests:{group_key}:{requests_per_second}:{burst}', requests_per_second, burst), 1) #type: ignore[arg-type]
+
+def throttle_upload(config: dict, host: str, body: bytes) -> Iterator[bytes]:
+    group_key, rate_limit_group = get_rate_limit_group(config, host)
+    upload_bytes_per_second: float | bool = get_value_if_key_exists(rate_limit_group, 'upload_bytes_per_second')
+    upload_bucket: dict = get_token_bucket(f'upload:{group_key}:{upload_bytes_per_second}', upload_bytes_per_second, max(upload_bytes_per_second, upload_chunk_size)) #type: ignore[arg-type]
+    for chunk_start in range(0, len(body), upload_chunk_size):
+        chunk: bytes = body[chunk_start:chunk_start + upload_chunk_size]
+        acquire_tokens(upload_bucket, len(chunk))
+        yield chunk
+
+class RateLimitedAdapter(HTTPAdapter):
+    def __init__(self, config: dict, **kwargs):
+        self.imd_config: dict = config
+        super().__init__(**kwargs)
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response: #type: ignore[override]
+        split_url = urlsplit(request.url)
+        host: str = split_url.hostname or '' #type: ignore[arg-type]
+        bytes_sent: int = len(request.body) if type(request.body) in [bytes, str] else 0 #type: ignore[arg-type]
+        with trace_span(self.imd_config, f'{request.method} {split_url.path}', 'http', bytes_sent = bytes_sent) as http_span:
+            http_span['rate_limit_wait_seconds'] = round(acquire_request_slot(self.imd_config, host), 6)
+            upload_bytes_per_second: float | bool = get_value_if_key_exists(get_rate_limit_group(self.imd_config, host)[1], 'upload_bytes_per_second')
+            body_is_upload: bool = type(request.body) == bytes and len(request.body) > upload_chunk_size #type: ignore[arg-type]
+            if body_is_upload and bool(upload_bytes_per_second):
+                request.body = throttle_upload(self.imd_config, host, request.body) #type: ignore[arg-type, assignment]
+            response: Response = super().send(request, **kwargs)
+            http_span.update({'status_code': response.status_code, 'bytes_received': int(response.headers.get('Content-Length', 0))})
+
+        return response
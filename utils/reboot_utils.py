@@ -0,0 +1,108 @@
+import requests, time
+
+from utils.dict_utils import get_value_if_key_exists
+from utils.network_utils import mark_imd_alive, probe_host
+from utils.session_utils import close_imd_session, get_imd_session
+from utils.timeout_utils import get_request_timeout
+from utils.trace_utils import trace_span
+
+reboot_phases: list[str] = ['uploaded', 'went_down', 'port_up', 'api_up', 'version_confirmed']
+
+default_reboot_wait: dict = {
+    'expected_seconds': 90,
+    'timeout': 600,
+    'went_down_timeout': 30,
+    'version_timeout': 60,
+    'min_interval': 0.5,
+    'max_interval': 10
+}
+
+def get_reboot_wait_settings(config: dict) -> dict:
+    reboot_wait: dict = get_value_if_key_exists(config, 'reboot_wait') or {}
+    return {**default_reboot_wait, **reboot_wait}
+
+def get_probe_interval(reboot_wait: dict, elapsed_seconds: float, expected_seconds: float) -> float:
+    seconds_from_expected: float = abs(expected_seconds - elapsed_seconds)
+    return min(max(seconds_from_expected / 4, reboot_wait['min_interval']), reboot_wait['max_interval'])
+
+def read_firmware_version(config: dict) -> str | None:
+    firmware_version_url: str = f'{config['api_base_url']}sys/version'
+    try:
+        firmware_response: dict = get_imd_session(config).get(firmware_version_url, headers = config['headers'], verify = False, timeout = get_request_timeout(config, firmware_version_url)).json()
+    except (requests.exceptions.RequestException, ValueError):
+        close_imd_session(config)
+        return None
+    firmware_version: str | bool = get_value_if_key_exists(firmware_response, 'data')
+
+    return firmware_version if firmware_response['retCode'] == 0 and type(firmware_version) == str else None #type: ignore[return-value]
+
+def create_reboot_state() -> dict:
+    now: float = time.monotonic()
+    return {
+        'phase': 'uploaded',
+        'started_at': now,
+        'phase_started_at': now,
+        'phase_seconds': {},
+        'firmware_version': None
+    }
+
+def set_reboot_phase(reboot_state: dict, phase: str) -> None:
+    now: float = time.monotonic()
+    skipped_phases: list[str] = reboot_phases[reboot_phases.index(reboot_state['phase']) + 1:reboot_phases.index(phase)]
+    for skipped_phase in skipped_phases: reboot_state['phase_seconds'][skipped_phase] = 0
+    reboot_state['phase_seconds'][phase] = round(now - reboot_state['phase_started_at'], 3)
+    reboot_state.update({'phase': phase, 'phase_started_at': now})
+
+def went_down_timed_out(reboot_state: dict, reboot_wait: dict) -> bool:
+    return reboot_state['phase'] == 'uploaded' and time.monotonic() - reboot_state['phase_started_at'] >= reboot_wait['went_down_timeout']
+
+def get_next_reboot_phase(config: dict, reboot_state: dict, target_firmware_version: str | None, reboot_wait: dict) -> str:
+    phase: str = reboot_state['phase']
+    match phase:
+        case 'uploaded':
+            if not probe_host(config, config['current_imd_ip']): return 'went_down'
+            if target_firmware_version is None or not went_down_timed_out(reboot_state, reboot_wait): return phase
+        case 'went_down':
+            return 'port_up' if probe_host(config, config['current_imd_ip']) else phase
+    reboot_state['firmware_version'] = read_firmware_version(config)
+    if reboot_state['firmware_version'] is None:
+        return phase
+    version_is_confirmed: bool = target_firmware_version is None or reboot_state['firmware_version'] == target_firmware_version
+    if version_is_confirmed: return 'version_confirmed'
+
+    return phase if phase == 'uploaded' else 'api_up'
+
+def get_reboot_result(reboot_state: dict, error: str = '') -> dict:
+    return {
+        'succeeded': reboot_state['phase'] == 'version_confirmed',
+        'phase': reboot_state['phase'],
+        'phase_seconds': reboot_state['phase_seconds'],
+        'elapsed_seconds': round(time.monotonic() - reboot_state['started_at'], 3),
+        'firmware_version': reboot_state['firmware_version'],
+        'error': error
+    }
+
+def wait_for_imd_reboot(config: dict, target_firmware_version: str | None = None, expected_seconds: float | None = None) -> dict:
+    reboot_wait: dict = get_reboot_wait_settings(config)
+    expected_seconds = expected_seconds if expected_seconds is not None else reboot_wait['expected_seconds']
+    reboot_state: dict = create_reboot_state()
+    while True:
+        next_phase: str = get_next_reboot_phase(config, reboot_state, target_firmware_version, reboot_wait)
+        if next_phase != reboot_state['phase']: set_reboot_phase(reboot_state, next_phase)
+        if reboot_state['phase'] == 'version_confirmed':
+            mark_imd_alive(config)
+            return get_reboot_result(reboot_state)
+        elapsed_seconds: float = time.monotonic() - reboot_state['started_at']
+        if elapsed_seconds >= reboot_wait['timeout']:
+            return get_reboot_result(reboot_state, f'IMD was not back within {reboot_wait['timeout']} s (last phase: {reboot_state['phase']})')
+        if target_firmware_version is None and went_down_timed_out(reboot_state, reboot_wait):
+            return get_reboot_result(reboot_state, f'IMD never went down within {reboot_wait['went_down_timeout']} s')
+        if reboot_state['phase'] == 'api_up' and time.monotonic() - reboot_state['phase_started_at'] >= reboot_wait['version_timeout']:
+            return get_reboot_result(reboot_state, f'IMD came back with firmware {reboot_state['firmware_version']} instead of {target_firmware_version}')
+        probe_interval: float = reboot_wait['min_interval'] if reboot_state['phase'] == 'uploaded' and not went_down_timed_out(reboot_state, reboot_wait) else get_probe_interval(reboot_wait, elapsed_seconds, expected_seconds)
+        probe_interval = min(probe_interval, reboot_wait['timeout'] - elapsed_seconds)
+        with trace_span(config, 'reboot_probe_sleep', 'sleep', phase = reboot_state['phase'], seconds = round(probe_interval, 3)):
+            time.sleep(probe_interval)
+
+def format_reboot_phase_seconds(reboot_result: dict) -> str:
+    return ', '.join(f'{phase.replace('_', ' ')} +{seconds} s' for phase, seconds in reboot_result['phase_seconds'].items())
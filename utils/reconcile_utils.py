@@ -0,0 +1,63 @@
+from typing import Any
+
+from utils.api_utils import get_admin_status, get_imd_resources, get_imd_token
+from utils.dict_utils import get_value_if_key_exists
+from utils.format_utils import format_blue
+from utils.parse_utils import parse_api_call_data
+
+missing_resource_code: int = 3001
+reconciled_commands: list[str] = ['set', 'delete']
+
+def values_match(desired_value: Any, current_value: Any) -> bool:
+    if type(desired_value) == dict:
+        return type(current_value) == dict and all(
+            key in current_value.keys() and values_match(value, current_value[key])
+            for key, value in desired_value.items() )
+    if type(desired_value) == list:
+        return type(current_value) == list and len(desired_value) == len(current_value) and all(
+            values_match(value, current_value[index]) for index, value in enumerate(desired_value) )
+
+    return str(desired_value).lower() == str(current_value).lower()
+
+def resource_is_missing(imd_resource: dict | bool) -> bool:
+    return type(imd_resource) == dict and (imd_resource['retCode'] == missing_resource_code or (imd_resource['retCode'] == 0 and not bool(get_value_if_key_exists(imd_resource, 'data')))) #type: ignore[index]
+
+def api_call_is_applied(config: dict, api_call: dict, imd_resource: dict | bool) -> bool:
+    if type(imd_resource) != dict and api_call['cmd'] != 'add':
+        return False
+    match api_call['cmd']:
+        case 'delete':
+            return resource_is_missing(imd_resource)
+        case 'add':
+            return api_call['api_path'] == 'auth' and get_admin_status(config) and bool(get_imd_token(config))
+        case 'set':
+            if imd_resource['retCode'] != 0: return False #type: ignore[index]
+            return values_match(parse_api_call_data(config, api_call['data']), get_value_if_key_exists(imd_resource, 'data')) #type: ignore[arg-type]
+
+    return False
+
+def get_reconciled_api_calls(config: dict, ordered_api_calls: list[dict], imd_resources: dict[str, dict | bool]) -> list[dict]:
+    reconciled_api_calls: list[dict] = []
+    for ordered_api_call in ordered_api_calls:
+        api_calls_to_apply: list[dict] = [
+            api_call for api_call in ordered_api_call['api_calls']
+            if not api_call_is_applied(config, api_call, get_value_if_key_exists(imd_resources, api_call['api_path'])) ]
+        if bool(api_calls_to_apply):
+            reconciled_api_calls.append({ **ordered_api_call, 'api_calls': api_calls_to_apply })
+
+    return reconciled_api_calls
+
+def get_reconciled_api_paths(ordered_api_calls: list[dict]) -> list[str]:
+    return [
+        api_call['api_path']
+        for ordered_api_call in ordered_api_calls
+        for api_call in ordered_api_call['api_calls']
+        if api_call['cmd'] in reconciled_commands ]
+
+def reconcile_api_calls(config: dict, ordered_api_calls: list[dict], quiet: bool = False) -> list[dict]:
+    imd_resources: dict[str, dict | bool] = get_imd_resources(config, get_reconciled_api_paths(ordered_api_calls))
+    reconciled_api_calls: list[dict] = get_reconciled_api_calls(config, ordered_api_calls, imd_resources)
+    skipped_config_items: int = len(ordered_api_calls) - len(reconciled_api_calls)
+    if not quiet: print(f'{format_blue(str(skipped_config_items))} of {len(ordered_api_calls)} configuration items already match the IMD.')
+
+    return reconciled_api_calls
@@ -0,0 +1,148 @@
+import random, requests, threading, time
+
+from collections import deque
+from typing import Callable
+
+from utils.breaker_utils import CircuitOpenError, circuit_allows_request, circuit_is_open, get_circuit_open_reason, record_transport_failure, record_transport_success
+from utils.dict_utils import get_value_if_key_exists
+from utils.timeout_utils import deadline_has_passed, get_remaining_seconds
+from utils.trace_utils import trace_span
+
+transport_errors: tuple = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+default_retry_policies: dict[str, dict] = {
+    'default':      {'retry': True,  'base_delay': 0.25, 'multiplier': 2, 'max_delay': 4, 'jitter': 0.5, 'treat_as_success': []},
+    'transport':    {'retry': True,  'base_delay': 0.5,  'multiplier': 2, 'max_delay': 8, 'jitter': 0.5},
+    '1001':         {'retry': False},
+    '3001':         {'retry': False, 'treat_as_success': ['delete']},
+    '5002':         {'retry': True,  'base_delay': 0.25, 'multiplier': 2, 'max_delay': 4, 'jitter': 0.5}
+}
+
+attempt_history: dict[str, deque] = {}
+attempt_history_lock: threading.Lock = threading.Lock()
+attempt_history_length: int = 1000
+
+def get_retry_policy(config: dict, retry_reason: int | str) -> dict:
+    configured_retry_policies: dict = get_value_if_key_exists(config, 'retry_policies') or {}
+    retry_policies: dict[str, dict] = {**default_retry_policies, **configured_retry_policies}
+    default_retry_policy: dict = {**default_retry_policies['default'], **get_value_if_key_exists(retry_policies, 'default')}
+
+    return {**default_retry_policy, **(get_value_if_key_exists(retry_policies, str(retry_reason)) or {})}
+
+def has_retry_policy(config: dict, retry_reason: int | str) -> bool:
+    configured_retry_policies: dict = get_value_if_key_exists(config, 'retry_policies') or {}
+    return str(retry_reason) in {**default_retry_policies, **configured_retry_policies}.keys()
+
+def get_retry_delay(retry_policy: dict, attempt: int) -> float:
+    exponential_delay: float = retry_policy['base_delay'] * retry_policy['multiplier'] ** (attempt - 1)
+    capped_delay: float = min(exponential_delay, retry_policy['max_delay'])
+    jitter: float = min(max(retry_policy['jitter'], 0), 1)
+
+    return random.uniform(capped_delay * (1 - jitter), capped_delay)
+
+def is_treated_as_success(retry_policy: dict, command: str) -> bool:
+    treat_as_success: list[str] | bool = get_value_if_key_exists(retry_policy, 'treat_as_success')
+    return treat_as_success is True or (type(treat_as_success) == list and command in treat_as_success) #type: ignore[operator]
+
+def record_attempt(config: dict, attempt: dict) -> None:
+    imd_ip: str = get_value_if_key_exists(config, 'current_imd_ip') or ''
+    with attempt_history_lock:
+        attempt_history.setdefault(imd_ip, deque(maxlen = attempt_history_length)).append(attempt)
+
+def get_attempt_history(config: dict) -> list[dict]:
+    imd_ip: str = get_value_if_key_exists(config, 'current_imd_ip') or ''
+    with attempt_history_lock:
+        return list(attempt_history.get(imd_ip, []))
+
+def clear_attempt_history(config: dict) -> None:
+    imd_ip: str = get_value_if_key_exists(config, 'current_imd_ip') or ''
+    with attempt_history_lock:
+        attempt_history.pop(imd_ip, None)
+
+def is_response_code_zero(response: dict) -> bool:
+    return response['retCode'] == 0
+
+def send_with_retries(
+    config: dict,
+    send_request: Callable[[], dict],
+    command: str = '',
+    max_attempts: int = 1,
+    label: str = '',
+    is_success: Callable[[dict], bool] = is_response_code_zero,
+    retry_unlisted_codes: bool = True,
+    on_response_code: Callable | None = None,
+    on_retry: Callable[[dict], None] | None = None,
+    deadline: float | None = None) -> dict:
+
+    attempts: list[dict] = []
+    attempt_number: int = 0
+    if deadline_has_passed(deadline):
+        return {
+            'succeeded': False,
+            'response': None,
+            'error': TimeoutError('IMD deadline exceeded before the request was sent'),
+            'attempts': attempts,
+            'deadline_exceeded': True,
+            'circuit_open': False
+        }
+    while True:
+        if not circuit_allows_request(config):
+            return {
+                'succeeded': False,
+                'response': None,
+                'error': CircuitOpenError(get_circuit_open_reason(config)),
+                'attempts': attempts,
+                'deadline_exceeded': False,
+                'circuit_open': True
+            }
+        attempt_number += 1
+        response: dict | None = None
+        error: Exception | None = None
+        started_at: float = time.time()
+        attempt_start_time: float = time.monotonic()
+        with trace_span(config, label or 'request', 'http_attempt', attempt = attempt_number) as attempt_span:
+            try:
+                response = send_request()
+                record_transport_success(config)
+            except transport_errors as transport_error:
+                error = transport_error
+                record_transport_failure(config, transport_error)
+            attempt_span.update({'ret_code': response['retCode'] if response is not None else None, 'error': str(error) if error is not None else ''})
+        network_seconds: float = time.monotonic() - attempt_start_time
+
+        response_code: int | None = response['retCode'] if response is not None else None
+        if response_code is not None and on_response_code is not None: on_response_code(response_code)
+        retry_reason: int | str = response_code if response_code is not None else 'transport'
+        retry_policy: dict = get_retry_policy(config, retry_reason)
+        succeeded: bool = response is not None and (is_success(response) or is_treated_as_success(retry_policy, command))
+        retry_is_allowed: bool = bool(retry_policy['retry']) and (retry_unlisted_codes or has_retry_policy(config, retry_reason))
+        will_retry: bool = not succeeded and retry_is_allowed and attempt_number < max_attempts and not (error is not None and circuit_is_open(config))
+        sleep_seconds: float = get_retry_delay(retry_policy, attempt_number) if will_retry else 0
+        remaining_seconds: float | None = get_remaining_seconds(deadline)
+        deadline_exceeded: bool = will_retry and remaining_seconds is not None and remaining_seconds <= sleep_seconds
+        if deadline_exceeded: will_retry, sleep_seconds = False, 0
+
+        attempt: dict = {
+            'label': label,
+            'attempt': attempt_number,
+            'ret_code': response_code,
+            'error': str(error) if error is not None else '',
+            'started_at': started_at,
+            'network_seconds': round(network_seconds, 6),
+            'sleep_seconds': round(sleep_seconds, 6),
+            'deadline_exceeded': deadline_exceeded
+        }
+        attempts.append(attempt)
+        record_attempt(config, attempt)
+        if not will_retry:
+            return {
+                'succeeded': succeeded,
+                'response': response,
+                'error': error,
+                'attempts': attempts,
+                'deadline_exceeded': deadline_exceeded,
+                'circuit_open': False
+            }
+        if on_retry is not None: on_retry(attempt)
+        with trace_span(config, 'retry_sleep', 'sleep', label = label, attempt = attempt_number, seconds = round(sleep_seconds, 6)):
+            time.sleep(sleep_seconds)
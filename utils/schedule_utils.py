@@ -0,0 +1,98 @@
+import threading
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+from utils.dict_utils import get_value_if_key_exists
+
+imd_busy_code: int = 5002
+
+def has_declared_dependencies(ordered_api_calls: list[dict]) -> bool:
+    return any(
+        bool(get_value_if_key_exists(ordered_api_call, 'barrier')) or bool(get_value_if_key_exists(ordered_api_call, 'depends_on'))
+        for ordered_api_call in ordered_api_calls )
+
+def get_api_call_dependencies(ordered_api_calls: list[dict]) -> dict[int, set[int]]:
+    dependencies: dict[int, set[int]] = {}
+    index_by_config_item: dict[str, int] = {}
+    last_index_by_api_path: dict[str, int] = {}
+    last_barrier_index: int | None = None
+    indexes_since_barrier: list[int] = []
+
+    for index, ordered_api_call in enumerate(ordered_api_calls):
+        is_barrier: bool = bool(get_value_if_key_exists(ordered_api_call, 'barrier'))
+        depends_on: list[str] = get_value_if_key_exists(ordered_api_call, 'depends_on') or []
+        api_paths: list[str] = [ api_call['api_path'] for api_call in ordered_api_call['api_calls'] ]
+        api_call_dependencies: set[int] = set(indexes_since_barrier) if is_barrier else set()
+        if last_barrier_index is not None: api_call_dependencies.add(last_barrier_index)
+        api_call_dependencies.update(index_by_config_item[config_item] for config_item in depends_on if config_item in index_by_config_item)
+        api_call_dependencies.update(last_index_by_api_path[api_path] for api_path in api_paths if api_path in last_index_by_api_path)
+        dependencies[index] = api_call_dependencies
+
+        index_by_config_item[ordered_api_call['config_item']] = index
+        last_index_by_api_path.update({ api_path: index for api_path in api_paths })
+        if is_barrier:
+            last_barrier_index, indexes_since_barrier = index, []
+        else:
+            indexes_since_barrier.append(index)
+
+    return dependencies
+
+def get_barrier_stages(ordered_api_calls: list[dict]) -> list[list[dict]]:
+    barrier_stages: list[list[dict]] = [[]]
+    for ordered_api_call in ordered_api_calls:
+        if bool(get_value_if_key_exists(ordered_api_call, 'barrier')):
+            barrier_stages += [[ordered_api_call], []]
+        else:
+            barrier_stages[-1].append(ordered_api_call)
+
+    return [ barrier_stage for barrier_stage in barrier_stages if bool(barrier_stage) ]
+
+def create_concurrency_limit(max_limit: int) -> dict:
+    return {
+        'limit': max_limit,
+        'max_limit': max_limit,
+        'active': 0,
+        'successes_since_change': 0,
+        'condition': threading.Condition()
+    }
+
+def acquire_concurrency_slot(concurrency_limit: dict) -> None:
+    with concurrency_limit['condition']:
+        concurrency_limit['condition'].wait_for(lambda: concurrency_limit['active'] < concurrency_limit['limit'])
+        concurrency_limit['active'] += 1
+
+def release_concurrency_slot(concurrency_limit: dict) -> None:
+    with concurrency_limit['condition']:
+        concurrency_limit['active'] -= 1
+        concurrency_limit['condition'].notify_all()
+
+def record_response_code(concurrency_limit: dict, response_code: int) -> None:
+    with concurrency_limit['condition']:
+        if response_code == imd_busy_code:
+            concurrency_limit['limit'] = max(1, concurrency_limit['limit'] // 2)
+            concurrency_limit['successes_since_change'] = 0
+        elif response_code == 0:
+            concurrency_limit['successes_since_change'] += 1
+            if concurrency_limit['successes_since_change'] >= concurrency_limit['limit'] and concurrency_limit['limit'] < concurrency_limit['max_limit']:
+                concurrency_limit['limit'] += 1
+                concurrency_limit['successes_since_change'] = 0
+        concurrency_limit['condition'].notify_all()
+
+def run_with_dependencies(dependencies: dict[int, set[int]], run_task: Callable[[int], bool], max_workers: int) -> dict[int, bool]:
+    results: dict[int, bool] = {}
+    pending_tasks: set[int] = set(dependencies.keys())
+    running_tasks: dict[Future, int] = {}
+
+    with ThreadPoolExecutor(max_workers = max_workers) as executor:
+        while pending_tasks or running_tasks:
+            ready_tasks: list[int] = sorted( task for task in pending_tasks if dependencies[task] <= results.keys() )
+            if not ready_tasks and not running_tasks: break
+            for task in ready_tasks:
+                pending_tasks.remove(task)
+                running_tasks[executor.submit(run_task, task)] = task
+            finished_tasks, _ = wait(running_tasks.keys(), return_when = FIRST_COMPLETED)
+            for finished_task in finished_tasks:
+                results[running_tasks.pop(finished_task)] = finished_task.result()
+
+    return results
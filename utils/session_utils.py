@@ -0,0 +1,40 @@
+import requests, threading
+
+from requests import Session
+
+from utils.dict_utils import get_value_if_key_exists
+from utils.rate_limit_utils import RateLimitedAdapter
+
+imd_sessions: dict[str, Session] = {}
+imd_sessions_lock: threading.Lock = threading.Lock()
+
+def get_session_pool_size(config: dict) -> int:
+    session_pool_size: int | bool = get_value_if_key_exists(config, 'session_pool_size')
+    return session_pool_size if bool(session_pool_size) else 4 #type: ignore[return-value]
+
+def create_imd_session(config: dict) -> Session:
+    session_pool_size: int = get_session_pool_size(config)
+    session: Session = requests.Session()
+    session.verify = False
+    session.mount('https://', RateLimitedAdapter(config, pool_connections = 1, pool_maxsize = session_pool_size))
+
+    return session
+
+def get_imd_session(config: dict) -> Session:
+    imd_ip: str = config['current_imd_ip']
+    with imd_sessions_lock:
+        if imd_ip not in imd_sessions:
+            imd_sessions[imd_ip] = create_imd_session(config)
+        return imd_sessions[imd_ip]
+
+def close_imd_session(config: dict) -> None:
+    imd_ip: str | bool = get_value_if_key_exists(config, 'current_imd_ip')
+    with imd_sessions_lock:
+        session: Session | None = imd_sessions.pop(imd_ip, None) #type: ignore[arg-type]
+    if session is not None: session.close()
+
+def close_all_imd_sessions() -> None:
+    with imd_sessions_lock:
+        sessions: list[Session] = list(imd_sessions.values())
+        imd_sessions.clear()
+    for session in sessions: session.close()
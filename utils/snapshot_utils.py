@@ -0,0 +1,83 @@
+import asyncio, glob, json, os, time
+
+from utils.api_utils import forget_imd_state, get_imd_resources
+from utils.dict_utils import get_value_if_key_exists
+from utils.fleet_utils import get_imd_config, run_on_imds
+from utils.format_utils import format_blue, format_green, format_red
+
+snapshot_time_format: str = '%Y%m%d-%H%M%S'
+
+def get_snapshot_api_paths(prompts: dict) -> list[str]:
+    api_paths: list[str] = [
+        api_call['api_path']
+        for config_item in prompts['formatters'] + prompts['defaults']
+        for api_call in config_item['api_calls']
+        if api_call['api_path'][0] != '/' ]
+
+    return list(dict.fromkeys(['sys/version'] + api_paths))
+
+def get_snapshot_file_prefix(imd_ip: str) -> str:
+    return imd_ip.replace(':', '_').replace('[', '').replace(']', '')
+
+def take_imd_snapshot(config: dict, prompts: dict) -> dict:
+    start_time: float = time.monotonic()
+    imd_resources: dict[str, dict | bool] = get_imd_resources(config, get_snapshot_api_paths(prompts))
+
+    return {
+        'imd_ip': config['current_imd_ip'],
+        'taken_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'read_seconds': round(time.monotonic() - start_time, 3),
+        'resources': {
+            api_path: { 'retCode': imd_resource['retCode'], 'data': get_value_if_key_exists(imd_resource, 'data') } if type(imd_resource) == dict else None #type: ignore[index]
+            for api_path, imd_resource in imd_resources.items() }
+    }
+
+def write_imd_snapshot(config: dict, imd_snapshot: dict) -> str:
+    snapshots_path: str = config['snapshots_path']
+    os.makedirs(snapshots_path, exist_ok = True)
+    snapshot_filename: str = f'{get_snapshot_file_prefix(imd_snapshot['imd_ip'])}_{time.strftime(snapshot_time_format)}.json'
+    snapshot_file_path: str = os.path.join(snapshots_path, snapshot_filename)
+    with open(snapshot_file_path, 'w') as snapshot_file:
+        json.dump(imd_snapshot, snapshot_file, separators = (',', ':'))
+
+    return snapshot_file_path
+
+def load_latest_imd_snapshot(config: dict) -> dict | bool:
+    snapshot_pattern: str = os.path.join(config['snapshots_path'], f'{get_snapshot_file_prefix(config['current_imd_ip'])}_*.json')
+    snapshot_file_paths: list[str] = sorted(glob.glob(snapshot_pattern))
+    if not bool(snapshot_file_paths):
+        return False
+    with open(snapshot_file_paths[-1], 'r') as snapshot_file:
+        return json.load(snapshot_file)
+
+def snapshot_imd(config: dict, imd_ip: str, prompts: dict) -> dict:
+    imd_config: dict = get_imd_config(config, imd_ip)
+    try:
+        imd_snapshot: dict = take_imd_snapshot(imd_config, prompts)
+        readable_resources: int = len([ imd_resource for imd_resource in imd_snapshot['resources'].values() if imd_resource is not None ])
+        snapshot_file_path: str | bool = write_imd_snapshot(imd_config, imd_snapshot) if readable_resources > 0 else False
+        error: str = '' if bool(snapshot_file_path) else 'Unable to read any configuration from the IMD.'
+    except Exception as snapshot_error:
+        snapshot_file_path, error = False, str(snapshot_error)
+    finally:
+        forget_imd_state(imd_config)
+
+    return {
+        'imd_ip': imd_ip,
+        'succeeded': bool(snapshot_file_path),
+        'snapshot_file_path': snapshot_file_path,
+        'error': error
+    }
+
+def snapshot_imds(config: dict, prompts: dict, imd_ips: list[str], concurrency: int, quiet: bool = False) -> list[dict]:
+    async def collect_snapshot_results() -> list[dict]:
+        snapshot_results: list[dict] = []
+        async for snapshot_result in run_on_imds(config, { imd_ip: prompts for imd_ip in imd_ips }, snapshot_imd, concurrency):
+            if not quiet and snapshot_result['succeeded']:
+                print(f'{format_green('✔')} Snapshot of IMD at {format_blue(snapshot_result['imd_ip'])} written to \'{snapshot_result['snapshot_file_path']}\'.')
+            elif not quiet:
+                print(f'{format_red('✖')} Unable to snapshot IMD at {format_blue(snapshot_result['imd_ip'])}: {snapshot_result['error']}')
+            snapshot_results.append(snapshot_result)
+        return snapshot_results
+
+    return asyncio.run(collect_snapshot_results())
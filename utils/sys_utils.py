@@ -1,9 +1,31 @@
-import os, sys
+import atexit, os, sys, threading
 
-from utils.format_utils import format_blue, format_yellow
+from typing import Callable
+
+from utils.format_utils import format_blue, format_red, format_yellow
 from utils.prompt_utils import confirm
 
+exit_handlers: list[Callable[[], None]] = []
+exit_handlers_lock: threading.Lock = threading.Lock()
+
+def register_exit_handler(exit_handler: Callable[[], None]) -> None:
+    with exit_handlers_lock:
+        if exit_handler not in exit_handlers: exit_handlers.append(exit_handler)
+
+def run_exit_handlers() -> None:
+    with exit_handlers_lock:
+        handlers_to_run: list[Callable[[], None]] = list(reversed(exit_handlers))
+        exit_handlers.clear()
+    for exit_handler in handlers_to_run:
+        try:
+            exit_handler()
+        except Exception as exit_handler_error:
+            print(format_red(f'Error while exiting: {exit_handler_error}'))
+
+atexit.register(run_exit_handlers)
+
 def exit_with_code(code: int) -> None:
+    run_exit_handlers()
     try:
         sys.exit(code)
     except SystemExit:
@@ -0,0 +1,44 @@
+import time
+
+from urllib.parse import urlsplit
+
+from utils.dict_utils import get_value_if_key_exists
+
+default_request_timeouts: dict[str, list[float]] = {
+    'config':           [3.05, 15],
+    'auth':             [3.05, 15],
+    'version':          [3.05, 5],
+    'firmware_upload':  [3.05, 300]
+}
+
+def get_endpoint_class(api_path: str) -> str:
+    api_path = urlsplit(api_path).path.lstrip('/').removeprefix('api/')
+    if api_path.startswith('transfer/firmware'):
+        return 'firmware_upload'
+    if api_path.startswith('auth'):
+        return 'auth'
+    if api_path.startswith('sys/version'):
+        return 'version'
+    return 'config'
+
+def get_imd_deadline(config: dict) -> float | None:
+    imd_deadline_seconds: float | bool = get_value_if_key_exists(config, 'imd_deadline')
+    return time.monotonic() + imd_deadline_seconds if bool(imd_deadline_seconds) else None #type: ignore[operator]
+
+def get_remaining_seconds(deadline: float | None) -> float | None:
+    return deadline - time.monotonic() if deadline is not None else None
+
+def deadline_has_passed(deadline: float | None) -> bool:
+    remaining_seconds: float | None = get_remaining_seconds(deadline)
+    return remaining_seconds is not None and remaining_seconds <= 0
+
+def get_request_timeout(config: dict, api_path: str, deadline: float | None = None) -> tuple[float, float]:
+    configured_request_timeouts: dict = get_value_if_key_exists(config, 'request_timeouts') or {}
+    endpoint_class: str = get_endpoint_class(api_path)
+    connect_timeout, read_timeout = {**default_request_timeouts, **configured_request_timeouts}[endpoint_class]
+    remaining_seconds: float | None = get_remaining_seconds(deadline)
+    if remaining_seconds is None:
+        return connect_timeout, read_timeout
+    remaining_seconds = max(remaining_seconds, 0.001)
+
+    return min(connect_timeout, remaining_seconds), min(read_timeout, remaining_seconds)
@@ -0,0 +1,67 @@
+import contextlib, json, os, threading, time
+
+from typing import Iterator, TextIO
+
+from utils.dict_utils import get_value_if_key_exists
+
+active_trace: dict = {}
+active_trace_lock: threading.Lock = threading.Lock()
+
+def tracing_is_enabled() -> bool:
+    return bool(active_trace)
+
+def write_trace_event(trace_event: dict) -> None:
+    with active_trace_lock:
+        trace_file: TextIO | None = get_value_if_key_exists(active_trace, 'file') or None
+        if trace_file is None: return
+        trace_file.write(f'{json.dumps(trace_event)},\n')
+        trace_file.flush()
+
+def start_tracing(trace_file_path: str) -> None:
+    stop_tracing()
+    trace_directory: str = os.path.dirname(os.path.abspath(trace_file_path))
+    os.makedirs(trace_directory, exist_ok = True)
+    trace_file: TextIO = open(trace_file_path, 'w')
+    trace_file.write('[\n')
+    with active_trace_lock:
+        active_trace.update({'file': trace_file, 'path': trace_file_path, 'started_at': time.perf_counter(), 'pid': os.getpid()})
+    write_trace_event({'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'tid': 0, 'args': {'name': 'vg_imd_config'}})
+
+def stop_tracing() -> None:
+    with active_trace_lock:
+        trace_file: TextIO | None = get_value_if_key_exists(active_trace, 'file') or None
+        active_trace.clear()
+    if trace_file is not None: trace_file.close()
+
+def record_span(config: dict, name: str, category: str, start_time: float, end_time: float, span_args: dict) -> None:
+    with active_trace_lock:
+        if not bool(active_trace): return
+        trace_started_at, pid = active_trace['started_at'], active_trace['pid']
+    imd_ip: str | bool = get_value_if_key_exists(config, 'current_imd_ip')
+    write_trace_event({
+        'name': name,
+        'cat': category,
+        'ph': 'X',
+        'ts': round((start_time - trace_started_at) * 1000000, 3),
+        'dur': round((end_time - start_time) * 1000000, 3),
+        'pid': pid,
+        'tid': threading.get_native_id(),
+        'args': {**({'imd_ip': imd_ip} if bool(imd_ip) else {}), **span_args}
+    })
+
+@contextlib.contextmanager
+def trace_span(config: dict, name: str, category: str, **span_args) -> Iterator[dict]:
+    if not tracing_is_enabled():
+        yield span_args
+        return
+    start_time: float = time.perf_counter()
+    try:
+        yield span_args
+    finally:
+        record_span(config, name, category, start_time, time.perf_counter(), span_args)
+
+def load_trace_events(trace_file_path: str) -> list[dict]:
+    with open(trace_file_path, 'r') as trace_file:
+        trace_lines: list[str] = [ trace_line.strip().rstrip(',') for trace_line in trace_file ]
+
+    return [ json.loads(trace_line) for trace_line in trace_lines if trace_line not in ['', '[', ']'] ]